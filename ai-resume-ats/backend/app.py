@@ -1,32 +1,45 @@
 import os
 import re
-import requests
 import numpy as np
+import scipy.sparse as sp
 import time
 import random
-import csv
-import json
-from io import BytesIO
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-import PyPDF2
-from docx import Document
+from tfidf_model import (DEFAULT_MODEL_DIR, SIMILARITY_BACKENDS, TfidfModelRegistry, append_corpus_dump, fit_corpus_model,
+                         iter_corpus_jobs, job_text)
+from job_cache import JobSearchCache, Uncached, backend_from_url, make_cache_key
+from search_fanout import run_concurrent, run_sequential
+from providers import (CircuitBreaker, ProviderClient, ProviderUnavailable, RetryScheduler, Singleflight,
+                       parse_retry_after)
+from keywords import KEYWORD_BACKENDS, KeywordExtractor, load_keyword_pipeline
+from skill_gazetteer import build_gazetteer, exclusion_terms, load_phrase_file
+from resume_cache import ResumeCache, resume_cache_key
+from document_parser import DocumentParseAbandoned, DocumentParseError, DocumentParser
+from job_stream import ATSScoreAccumulator, TopK, chunked, iter_uploaded_jobs
+from ranking import TokenMatcher, top_k
+from job_features import JobFeatureStore, dedupe_key, job_id, merge_provider_jobs, stacked_counts, stacked_embeddings
+from job_index import JobIndex, JobIndexRefresher, parse_refresh_queries
+from ann_index import IVFIndex
+from job_snapshot import DEFAULT_SNAPSHOT_DIR, JobSnapshotRegistry
+from deadline import Deadline, parse_budget_ms
+from profile_store import DEFAULT_PROFILE_DB, ProfileStore
+from profile_features import SECTIONS, counts_from_json, counts_to_json, profile_sections, section_digest, skills_text
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Location tokens that mean the query (or job) is in India
+INDIA_LOCATION_TOKENS = ['india','bangalore','bengaluru','mumbai','delhi','pune','hyderabad','chennai','kolkata','ahmedabad','gurgaon','noida']
+
 # Load spaCy model (download with: python -m spacy download en_core_web_sm)
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-    print("✅ spaCy model loaded successfully")
-except Exception as e:
-    print(f"Warning: spaCy issue ({e}). Using fallback NLP processing.")
-    nlp = None
+# Only the components keyword extraction needs are loaded (no parser)
+nlp = load_keyword_pipeline("en_core_web_sm")
 
 class ResumeATSEngine:
     def __init__(self):
@@ -50,31 +63,233 @@ class ResumeATSEngine:
             'design': ['design', 'ux', 'ui', 'product design'],
             'engineering': ['engineering', 'software', 'developer', 'backend', 'frontend']
         }
+        # Corpus-level TF-IDF model built offline by tfidf_model.py; when present,
+        # scoring only transforms text instead of fitting on two documents
+        self.tfidf_models = TfidfModelRegistry(
+            os.getenv('TFIDF_MODEL_DIR', DEFAULT_MODEL_DIR),
+            check_interval=float(os.getenv('TFIDF_MODEL_CHECK_SECONDS', '30'))
+        )
+        # Batched, cached keyword extraction over the trimmed spaCy pipeline
+        keyword_cache_size = int(os.getenv('KEYWORD_CACHE_SIZE', '4096'))
+        self.keyword_extractor = KeywordExtractor(
+            nlp,
+            batch_size=int(os.getenv('KEYWORD_BATCH_SIZE', '64')),
+            n_process=int(os.getenv('KEYWORD_N_PROCESS', '1')),
+            cache_size=keyword_cache_size
+        )
+        # Skill gazetteer backend (no model inference); KEYWORD_BACKEND picks the default
+        self.keyword_extractors = {
+            'spacy': self.keyword_extractor,
+            'gazetteer': KeywordExtractor(gazetteer=self._build_skill_gazetteer(), cache_size=keyword_cache_size)
+        }
+        self.default_keyword_backend = os.getenv('KEYWORD_BACKEND', 'spacy')
+        if self.default_keyword_backend not in KEYWORD_BACKENDS:
+            self.default_keyword_backend = 'spacy'
+        # Content-addressed cache of extracted/cleaned resume text and keywords
+        self.resume_cache = ResumeCache(
+            max_bytes=int(float(os.getenv('RESUME_CACHE_MAX_MB', '64')) * 1024 * 1024),
+            disk_dir=os.getenv('RESUME_CACHE_DIR') or None,
+            disk_max_entries=int(os.getenv('RESUME_CACHE_DISK_MAX_ENTRIES', '10000'))
+        )
+        # PDF/DOCX parsing runs in a small process pool so it cannot block the worker
+        self.document_parser = DocumentParser(
+            workers=int(os.getenv('PARSER_WORKERS', '2')),
+            timeout=float(os.getenv('PARSER_TIMEOUT', '15')),
+            max_pages=int(os.getenv('PARSER_MAX_PAGES', '50'))
+        )
+        # Provider clients with circuit breakers; retries run on a background scheduler
+        failure_threshold = int(os.getenv('PROVIDER_FAILURE_THRESHOLD', '5'))
+        reset_timeout = float(os.getenv('PROVIDER_RESET_SECONDS', '30'))
+        connect_timeout = float(os.getenv('PROVIDER_CONNECT_TIMEOUT', '3.05'))
+        # Identical concurrent provider calls are coalesced; set PROVIDER_SINGLEFLIGHT_DIR to share across workers
+        singleflight = str(os.getenv('PROVIDER_SINGLEFLIGHT', 'true')).lower() in ('1', 'true', 'yes')
+        self.providers = {}
+        for name, default_read_timeout in (('adzuna', '15'), ('rapidapi', '20')):
+            read_timeout = float(os.getenv(f'{name.upper()}_READ_TIMEOUT', default_read_timeout))
+            self.providers[name] = ProviderClient(
+                name, CircuitBreaker(name, failure_threshold, reset_timeout),
+                pool_size=int(os.getenv('PROVIDER_POOL_SIZE', '10')),
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                transport_retries=int(os.getenv('PROVIDER_TRANSPORT_RETRIES', '2')),
+                singleflight=Singleflight(
+                    shared_dir=os.getenv('PROVIDER_SINGLEFLIGHT_DIR') or None,
+                    result_ttl=float(os.getenv('PROVIDER_SINGLEFLIGHT_TTL', '5')),
+                    wait_timeout=connect_timeout + read_timeout
+                ) if singleflight else None
+            )
+        self.retry_scheduler = RetryScheduler()
+        self.provider_max_retries = int(os.getenv('PROVIDER_MAX_RETRIES', '4'))
+        # Providers are queried in parallel; a live fetch returns at the deadline or once enough jobs arrived
+        self.provider_deadline = float(os.getenv('PROVIDER_DEADLINE_SECONDS', '10'))
+        self.provider_enough_jobs = int(os.getenv('PROVIDER_ENOUGH_JOBS', '15'))
+        self.provider_executor = ThreadPoolExecutor(max_workers=int(os.getenv('PROVIDER_FANOUT_WORKERS', '16')),
+                                                    thread_name_prefix='provider-fanout')
+        # Request budgets (see deadline.py): time held back for scoring, the least worth a provider call
+        # or a document parse, and how many jobs are scored when the budget is nearly spent
+        self.deadline_scoring_reserve = float(os.getenv('DEADLINE_SCORING_RESERVE_SECONDS', '0.5'))
+        self.deadline_provider_min = float(os.getenv('DEADLINE_PROVIDER_MIN_SECONDS', '1.0'))
+        self.deadline_parse_min = float(os.getenv('DEADLINE_PARSE_MIN_SECONDS', '0.5'))
+        self.deadline_degraded_max_jobs = int(os.getenv('DEADLINE_DEGRADED_MAX_JOBS', '15'))
+        # Response cache in front of the provider calls (disable with JOB_CACHE_ENABLED=false)
+        self.job_cache = None
+        if str(os.getenv('JOB_CACHE_ENABLED', 'true')).lower() in ('1', 'true', 'yes'):
+            max_entries = int(os.getenv('JOB_CACHE_MAX_ENTRIES', '512'))
+            self.job_cache = JobSearchCache(
+                max_entries=max_entries,
+                ttls={
+                    '24h': int(os.getenv('JOB_CACHE_TTL_24H', '900')),
+                    'week': int(os.getenv('JOB_CACHE_TTL_WEEK', '3600')),
+                    'month': int(os.getenv('JOB_CACHE_TTL_MONTH', '21600')),
+                },
+                stale_ttl=int(os.getenv('JOB_CACHE_STALE_SECONDS', '3600')),
+                negative_ttl=int(os.getenv('JOB_CACHE_NEGATIVE_TTL', '60')),
+                backend=backend_from_url(os.getenv('JOB_CACHE_BACKEND', ''), max_entries=max_entries * 10),
+                is_negative=self._is_fallback_result
+            )
+        # Cleaned text, keywords and term counts per job, reused across requests
+        self.job_feature_store = JobFeatureStore(
+            max_entries=int(os.getenv('JOB_FEATURE_MAX_ENTRIES', '20000')),
+            default_ttl=int(os.getenv('JOB_FEATURE_TTL', '3600'))
+        )
+        # Local search index behind /search_jobs, fed by provider pulls, uploads and the snapshot
+        self.job_index = JobIndex(
+            max_docs=int(os.getenv('JOB_INDEX_MAX_DOCS', '100000')),
+            location_aliases={tok: ('india',) for tok in INDIA_LOCATION_TOKENS}
+        )
+        self._job_index_seeded = False
+        self.job_index_refresher = JobIndexRefresher(
+            self.fetch_internships,
+            parse_refresh_queries(os.getenv('JOB_INDEX_REFRESH_QUERIES', '')),
+            float(os.getenv('JOB_INDEX_REFRESH_SECONDS', '0'))
+        )
+        self.job_index_refresher.start()
+        # Semantic similarity backend: tfidf, or lsa when the corpus model has an LSA projection
+        self.default_similarity = os.getenv('SIMILARITY_BACKEND', 'tfidf')
+        # Job sets this large are scored through an IVF candidate index instead of exhaustively
+        self.ann_min_jobs = int(os.getenv('ANN_MIN_JOBS', '50000'))
+        self.ann_nprobe = int(os.getenv('ANN_NPROBE', '16'))
+        self.ann_candidates = int(os.getenv('ANN_CANDIDATES', '300'))
+        # Memory-mapped job corpus shared by all workers (see job_snapshot.py)
+        self.job_snapshots = JobSnapshotRegistry(
+            os.getenv('JOB_SNAPSHOT_DIR', DEFAULT_SNAPSHOT_DIR),
+            model_dir=os.getenv('TFIDF_MODEL_DIR', DEFAULT_MODEL_DIR),
+            check_interval=float(os.getenv('JOB_SNAPSHOT_CHECK_SECONDS', '30'))
+        )
         
-    def extract_text_from_pdf(self, file_content):
-        """Extract text from PDF file"""
-        try:
-            pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error extracting PDF text: {e}")
-            return ""
+    def extract_text_from_pdf(self, file_content, timeout=None):
+        """Extract text from PDF file (first PARSER_MAX_PAGES pages, in the parser pool)"""
+        return self.document_parser.parse(file_content, 'pdf', timeout=timeout)
     
-    def extract_text_from_docx(self, file_content):
-        """Extract text from DOCX file"""
-        try:
-            doc = Document(BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error extracting DOCX text: {e}")
-            return ""
+    def extract_text_from_docx(self, file_content, timeout=None):
+        """Extract text from DOCX file (in the parser pool)"""
+        return self.document_parser.parse(file_content, 'docx', timeout=timeout)
     
+    def extract_resume_text(self, content, filename, timeout=None):
+        """Extract raw text from an uploaded resume based on its file type"""
+        filename = (filename or '').lower()
+        if filename.endswith('.pdf'):
+            return self.extract_text_from_pdf(content, timeout)
+        if filename.endswith('.docx'):
+            return self.extract_text_from_docx(content, timeout)
+        # Try to decode as text
+        try:
+            return content.decode('utf-8', errors='ignore')
+        except Exception:
+            return ''
+
+    def process_resume(self, content, filename, keyword_backend=None, deadline=None):
+        """Extracted text, cleaned text and keywords for an upload, cached by content hash.
+
+        Returns a dict with 'text', 'cleaned' and 'keywords' (for keyword_backend).
+        Repeat uploads of the same file skip parsing and NLP entirely. With a
+        deadline, the request waits for the parse at most its remaining budget,
+        and a PDF/DOCX is not submitted at all when less than
+        DEADLINE_PARSE_MIN_SECONDS is left (DocumentParseAbandoned).
+        """
+        backend = self.resolve_keyword_backend(keyword_backend)
+        key = resume_cache_key(content, filename)
+        entry = self.resume_cache.get(key)
+        if entry is None:
+            timeout = None
+            if deadline is not None:
+                if not key.endswith(':text') and not deadline.allows(self.deadline_parse_min):
+                    raise DocumentParseAbandoned(f"{deadline.remaining() * 1000:.0f}ms left; too little to parse the document")
+                timeout = deadline.remaining()
+            text = self.extract_resume_text(content, filename, timeout)
+            entry = {'text': text, 'cleaned': self.clean_text(text), 'keywords': {}}
+        if backend not in entry['keywords']:
+            keywords = dict(entry['keywords'])
+            keywords[backend] = self.extract_keywords(entry['cleaned'], backend) if entry['cleaned'] else []
+            entry = dict(entry, keywords=keywords)
+            self.resume_cache.put(key, entry)
+        return {'text': entry['text'], 'cleaned': entry['cleaned'], 'keywords': list(entry['keywords'][backend])}
+
+    def prepare_resume(self, content, filename, skills='', education='', keyword_backend=None, deadline=None):
+        """Resume text used for scoring (upload + form skills/education) and its keyword set.
+
+        If parsing runs out of the deadline's budget, the resume is scored on
+        the skills and education fields alone (when given).
+        """
+        extra = self.clean_text(skills + ' ' + education)
+        try:
+            resume = self.process_resume(content, filename, keyword_backend, deadline)
+        except DocumentParseAbandoned:
+            # Only a parse cut short by the request budget (not the parser's own timeout) degrades
+            if deadline is None or not extra:
+                raise
+            deadline.degrade('parse', 'resume parsing ran out of budget; scored on the skills and education fields')
+            resume = {'cleaned': '', 'keywords': []}
+        resume_text = f"{resume['cleaned']} {extra}".strip()
+        resume_keywords = set(resume['keywords'])
+        if extra:
+            resume_keywords.update(self.extract_keywords(extra, keyword_backend))
+        return resume_text, resume_keywords
+
+    def profile_resume(self, profile_id, profile, keyword_backend=None, upload=None):
+        """Resume text, keyword set and term counts (or None) of a saved profile.
+
+        Read from the profile's stored representation (see profile_features.py);
+        only sections whose source changed are cleaned and run through keyword
+        extraction again, and the representation is saved back when anything
+        changed. upload: optional process_resume result plus its 'digest'
+        (resume_cache_key), kept as the profile's 'resume' section.
+        """
+        backend = self.resolve_keyword_backend(keyword_backend)
+        model = self.tfidf_models.current()
+        stored = profile_store.get_representation(profile_id) or {'sections': {}}
+        sections = dict(stored['sections'])
+        sources = profile_sections(profile)
+        for name in [n for n in sections if n != 'resume' and n not in sources]:
+            del sections[name]
+        for name, source in sources.items():
+            digest = section_digest(source)
+            if sections.get(name, {}).get('digest') != digest:
+                sections[name] = {'digest': digest, 'text': self.clean_text(source), 'keywords': {}}
+        if upload is not None and sections.get('resume', {}).get('digest') != upload['digest']:
+            sections['resume'] = {'digest': upload['digest'], 'text': upload['cleaned'],
+                                  'keywords': {backend: list(upload['keywords'])}}
+        pending = [n for n, entry in sections.items() if backend not in entry['keywords']]
+        if pending:
+            for name, keywords in zip(pending, self.extract_keywords_batch([sections[n]['text'] for n in pending], backend)):
+                sections[name] = dict(sections[name], keywords=dict(sections[name]['keywords'], **{backend: keywords}))
+
+        text = ' '.join(sections[n]['text'] for n in SECTIONS if n in sections and sections[n]['text'])
+        representation = dict(stored, sections=sections, text=text)
+        if text != stored.get('text'):
+            representation.update(counts=None, model_version=None)
+        if model is not None and representation.get('model_version') != model.version:
+            representation['counts'] = counts_to_json(model.count([text]))
+            representation['model_version'] = model.version
+        if representation != stored:
+            profile_store.put_representation(profile_id, representation)
+
+        keywords = set().union(*(entry['keywords'][backend] for entry in sections.values()))
+        counts = None
+        if model is not None and representation.get('model_version') == model.version:
+            counts = counts_from_json(representation['counts'])
+        return text, keywords, counts
+
     def clean_text(self, text):
         """Clean and normalize text"""
         # Remove extra whitespace and special characters
@@ -82,33 +297,43 @@ class ResumeATSEngine:
         text = re.sub(r'[^\w\s]', ' ', text)
         return text.lower().strip()
     
-    def extract_keywords(self, text):
-        """Extract keywords using spaCy NLP"""
-        if not nlp:
-            # Fallback to simple keyword extraction
-            words = text.lower().split()
-            # Filter out common stop words
-            stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
-            keywords = [word for word in words if len(word) > 2 and word not in stop_words]
-            return list(set(keywords))
-        
-        doc = nlp(text)
-        keywords = []
-        
-        # Extract nouns, proper nouns, and adjectives
-        for token in doc:
-            if (token.pos_ in ['NOUN', 'PROPN', 'ADJ'] and 
-                not token.is_stop and 
-                not token.is_punct and 
-                len(token.text) > 2):
-                keywords.append(token.lemma_.lower())
-        
-        # Extract named entities (skills, technologies, etc.)
-        for ent in doc.ents:
-            if ent.label_ in ['ORG', 'PRODUCT', 'GPE']:
-                keywords.append(ent.text.lower())
-        
-        return list(set(keywords))
+    def _build_skill_gazetteer(self):
+        """Gazetteer seeded from domain_synonyms, the job corpus snapshot and SKILL_GAZETTEER_FILE"""
+        default_corpus = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'public', 'internships.json')
+        corpus_path = os.getenv('SKILL_CORPUS_PATH', default_corpus)
+        corpus_texts, exclude_terms = [], set()
+        if corpus_path and os.path.exists(corpus_path):
+            try:
+                jobs = list(iter_corpus_jobs(corpus_path))
+                # Skills are mined from titles and descriptions; company and location words are never skills
+                corpus_texts = [job_text(job, fields=('title', 'description')) for job in jobs]
+                exclude_terms = exclusion_terms(job_text(job, fields=(field,))
+                                                for job in jobs for field in ('company', 'location'))
+            except Exception as e:
+                print(f"Warning: could not read skill corpus {corpus_path}: {e}")
+        extra = []
+        phrase_file = os.getenv('SKILL_GAZETTEER_FILE')
+        if phrase_file:
+            try:
+                extra = load_phrase_file(phrase_file)
+            except Exception as e:
+                print(f"Warning: could not read {phrase_file}: {e}")
+        return build_gazetteer(self.domain_synonyms, corpus_texts, extra, exclude_terms=exclude_terms)
+
+    def resolve_keyword_backend(self, backend=None):
+        """Known keyword backend name, defaulting to KEYWORD_BACKEND"""
+        return backend if backend in self.keyword_extractors else self.default_keyword_backend
+
+    def _keyword_extractor_for(self, backend=None):
+        return self.keyword_extractors[self.resolve_keyword_backend(backend)]
+
+    def extract_keywords(self, text, backend=None):
+        """Extract keywords using spaCy NLP (or the skill gazetteer backend)"""
+        return self._keyword_extractor_for(backend).extract(text)
+
+    def extract_keywords_batch(self, texts, backend=None):
+        """Extract keywords for many texts in one nlp.pipe pass (cached per text)"""
+        return self._keyword_extractor_for(backend).extract_many(texts)
     # Adzuna integration removed. RapidAPI-based fetch_internships implementation exists later in this class.
     
     def get_dummy_jobs(self):
@@ -172,11 +397,14 @@ class ResumeATSEngine:
             }
         ]
     
-    def calculate_ats_score(self, resume_text, job_descriptions, required_skills=None, skill_weights=None):
+    def calculate_ats_score(self, resume_text, job_descriptions, required_skills=None, skill_weights=None,
+                            keyword_backend=None, resume_keywords=None, similarity=None):
         """Hybrid ATS score: 50% keyword overlap, 50% semantic similarity.
 
         - keyword overlap: matched required skills / total required skills
-        - semantic similarity: cosine similarity between resume and combined job descriptions (TF-IDF)
+        - semantic similarity: cosine similarity between resume and combined job descriptions
+          (TF-IDF, or LSA vectors with similarity='lsa')
+        resume_keywords may be passed in (e.g. from the resume cache) to skip extracting them.
         Returns (score_percent, missing_keywords_list)
         """
         if not job_descriptions:
@@ -184,15 +412,50 @@ class ResumeATSEngine:
 
         combined_job_text = " ".join(job_descriptions)
 
-        # Extract required skills from job descriptions if not provided
-        if required_skills is None:
-            # use simple keyword extractor from combined job text
-            required_skills = self.extract_keywords(combined_job_text)
-
-        # Normalize skill lists
-        resume_skills = set(self.extract_keywords(resume_text))
+        # Extract required skills from job descriptions if not provided;
+        # jobs and resume go through the pipeline together, one doc per job
+        if resume_keywords is not None:
+            resume_skills = set(resume_keywords)
+            if required_skills is None:
+                required_skills = set().union(*self.extract_keywords_batch(list(job_descriptions), keyword_backend))
+        elif required_skills is None:
+            extracted = self.extract_keywords_batch(list(job_descriptions) + [resume_text], keyword_backend)
+            required_skills = set().union(*extracted[:-1])
+            resume_skills = set(extracted[-1])
+        else:
+            resume_skills = set(self.extract_keywords(resume_text, keyword_backend))
         required_skills_set = set(required_skills)
 
+        semantic_sim = self._semantic_similarity(resume_text, combined_job_text, similarity)
+        return self.combine_ats_score(resume_skills, required_skills_set, semantic_sim, skill_weights)
+
+    def resolve_similarity(self, similarity=None, model=None):
+        """Similarity backend to use: 'lsa' only when requested (or the SIMILARITY_BACKEND
+        default) and the corpus model (or model) has an LSA projection, else 'tfidf'
+        """
+        similarity = similarity if similarity in SIMILARITY_BACKENDS else self.default_similarity
+        model = model or self.tfidf_models.current()
+        return 'lsa' if similarity == 'lsa' and model is not None and model.has_lsa else 'tfidf'
+
+    def _semantic_similarity(self, resume_text, combined_job_text, similarity=None):
+        """TF-IDF (or LSA) cosine (0-100) between the resume and the combined job text"""
+        try:
+            model = self.tfidf_models.current()
+            if self.resolve_similarity(similarity, model) == 'lsa':
+                vectors = model.embed([resume_text, combined_job_text])
+                return float(vectors[0] @ vectors[1]) * 100
+            corpus_sims = self._corpus_similarities(resume_text, [combined_job_text])
+            if corpus_sims is not None:
+                return corpus_sims[0] * 100
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+            tfidf_matrix = vectorizer.fit_transform([resume_text, combined_job_text])
+            return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100
+        except Exception as e:
+            print(f"Error computing semantic similarity: {e}")
+            return 0
+
+    def combine_ats_score(self, resume_skills, required_skills_set, semantic_sim, skill_weights=None):
+        """Hybrid score from keyword sets and a semantic similarity (0-100); returns (score, missing)"""
         # Keyword overlap score (0-100)
         if required_skills_set:
             # support optional weights
@@ -205,15 +468,6 @@ class ResumeATSEngine:
         else:
             keyword_score = 0
 
-        # Semantic similarity via TF-IDF cosine
-        try:
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-            tfidf_matrix = vectorizer.fit_transform([resume_text, combined_job_text])
-            semantic_sim = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100
-        except Exception as e:
-            print(f"Error computing semantic similarity: {e}")
-            semantic_sim = 0
-
         # Hybrid score (50/50)
         ats_score = 0.5 * keyword_score + 0.5 * semantic_sim
 
@@ -222,106 +476,646 @@ class ResumeATSEngine:
 
         return round(min(100, max(0, ats_score)), 1), missing_keywords
     
+    def _corpus_similarities(self, resume_text, texts):
+        """Cosine similarities of texts against the resume using the corpus model.
+
+        Transform-only; returns None when no corpus model is loaded.
+        """
+        model = self.tfidf_models.current()
+        if model is None:
+            return None
+        matrix = model.transform([resume_text] + list(texts))
+        return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
     def calculate_job_match(self, resume_text, job_description):
         """Calculate match percentage for individual job"""
         try:
+            corpus_sims = self._corpus_similarities(resume_text, [job_description])
+            if corpus_sims is not None:
+                return min(100, max(0, corpus_sims[0] * 100))
             vectorizer = TfidfVectorizer(stop_words='english', max_features=500)
             tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             return min(100, max(0, similarity * 100))
         except:
             return 50  # Default match percentage
-    
-    def fetch_internships(self, location="india", keyword="", time_filter="week"):
-        """Fetch internships from RapidAPI with time filter.
-
-        This function implements retries with exponential backoff + jitter and
-        handles 429 rate-limit responses (using Retry-After when provided).
-        It also attempts fallback, broader searches when the initial query
-        returns no normalized results to increase chances of returning real
-        internship recommendations.
+
+    def calculate_job_matches(self, resume_text, job_texts):
+        """Calculate match percentages for many jobs at once.
+
+        Fits a single TF-IDF vectorizer on the resume plus all job texts and
+        scores every job with one sparse matrix product, instead of fitting a
+        new vectorizer per resume/job pair like calculate_job_match does.
+        Returns a list of match percentages aligned with job_texts.
+        """
+        if not job_texts:
+            return []
+        try:
+            similarities = self._corpus_similarities(resume_text, job_texts)
+            if similarities is not None:
+                return [min(100, max(0, s * 100)) for s in similarities]
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=500)
+            tfidf_matrix = vectorizer.fit_transform([resume_text] + list(job_texts))
+            # Rows are L2-normalized, so the dot product is the cosine similarity
+            similarities = (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+            return [min(100, max(0, s * 100)) for s in similarities]
+        except Exception as e:
+            print(f"Error computing batch job match: {e}")
+            return [50] * len(job_texts)  # Default match percentage
+
+    def job_feature_ttl(self, time_filter):
+        """Feature lifetime for jobs fetched with time_filter: the provider cache TTL"""
+        if self.job_cache is None:
+            return self.job_feature_store.default_ttl
+        return self.job_cache.ttl_for(time_filter)
+
+    def job_features(self, recs, ttl=None, keyword_backend=None):
+        """Feature entries (see job_features.py) aligned with flattened job records.
+
+        recs need 'title', 'company', 'location' and 'description'. Missing
+        entries, keywords for keyword_backend and term counts for the current
+        corpus model are computed in one batch and stored for ttl seconds.
+        """
+        backend = self.resolve_keyword_backend(keyword_backend)
+        model = self.tfidf_models.current()
+        features, created = [], {}
+        for rec in recs:
+            fid = job_id(rec['title'], rec['company'], rec['location'], rec['description'])
+            entry = created.get(fid) or self.job_feature_store.get(fid)
+            if entry is None:
+                combined = f"{rec['title']} {rec['company']} {rec['location']} {rec['description']}"
+                entry = {'text': self.clean_text(combined), 'lower_text': combined.lower(), 'keywords': {},
+                         'counts': None, 'embedding': None, 'model_version': None}
+                created[fid] = entry
+            features.append(entry)
+
+        unique = list({id(f): f for f in features}.values())
+        pending = [f for f in unique if backend not in f['keywords']]
+        if pending:
+            for entry, keywords in zip(pending, self.extract_keywords_batch([f['text'] for f in pending], backend)):
+                entry['keywords'] = dict(entry['keywords'], **{backend: keywords})
+        if model is not None:
+            pending = [f for f in unique if f['model_version'] != model.version]
+            if pending:
+                counts = model.count([f['text'] for f in pending])
+                embeddings = model.embed_counts(counts) if model.has_lsa else None
+                for i, entry in enumerate(pending):
+                    entry['counts'] = counts[i]
+                    entry['embedding'] = embeddings[i] if embeddings is not None else None
+                    entry['model_version'] = model.version
+        for fid, entry in created.items():
+            self.job_feature_store.put(fid, entry, ttl)
+        return features
+
+    def score_job_features(self, resume_text, features, keyword_backend=None, resume_keywords=None,
+                           similarity=None, resume_counts=None):
+        """calculate_ats_score + calculate_job_matches from stored job features.
+
+        Returns (ats_score, missing_keywords, match_percentages). With a corpus
+        model the stored term counts are used directly (with similarity='lsa',
+        the stored LSA vectors: one matrix-vector product); otherwise the
+        texts are vectorized as calculate_job_matches / calculate_ats_score do.
+        resume_counts: the resume's term counts under the current corpus model,
+        if already known (e.g. from a stored profile representation).
+        """
+        if not features:
+            return 0, [], []
+        backend = self.resolve_keyword_backend(keyword_backend)
+        required_skills = set().union(*(f['keywords'][backend] for f in features))
+        if resume_keywords is not None:
+            resume_skills = set(resume_keywords)
+        else:
+            resume_skills = set(self.extract_keywords(resume_text, backend))
+
+        model = self.tfidf_models.current()
+        counts = stacked_counts(features, model)
+        embeddings = stacked_embeddings(features, model) if self.resolve_similarity(similarity, model) == 'lsa' else None
+        if counts is not None and resume_counts is None:
+            resume_counts = model.count([resume_text])
+        if embeddings is not None:
+            resume_vector = model.embed_counts(resume_counts)[0]
+            matches = [min(100, max(0, s * 100)) for s in embeddings @ resume_vector]
+            combined = model.embed_counts(sp.csr_matrix(counts.sum(axis=0)))[0]
+            semantic_sim = float(combined @ resume_vector) * 100
+        elif counts is not None:
+            resume_vector = model.transform_counts(resume_counts)
+            similarities = (model.transform_counts(counts) @ resume_vector.T).toarray().ravel()
+            matches = [min(100, max(0, s * 100)) for s in similarities]
+            combined = model.transform_counts(sp.csr_matrix(counts.sum(axis=0)))
+            semantic_sim = (combined @ resume_vector.T).toarray()[0][0] * 100
+        else:
+            job_texts = [f['text'] for f in features]
+            matches = self.calculate_job_matches(resume_text, job_texts)
+            semantic_sim = self._semantic_similarity(resume_text, " ".join(job_texts), 'tfidf')
+        ats_score, missing_keywords = self.combine_ats_score(resume_skills, required_skills, semantic_sim)
+        return ats_score, missing_keywords, matches
+
+    def _ingest_jobs(self, jobs, time_filter, keyword='', location=''):
+        """Precompute features for freshly fetched provider jobs and add them to the job index"""
+        if self._is_fallback_result(jobs):
+            return jobs
+        recs = [format_provider_job(job) for job in jobs]
+        try:
+            self.job_features(recs, ttl=self.job_feature_ttl(time_filter))
+        except Exception as e:
+            print(f"[JobFeatures] failed to precompute job features: {e}")
+        self.job_index.add([dict(rec, posted_at=job.get('created')) for rec, job in zip(recs, jobs)],
+                           query=keyword, location=location, time_filter=time_filter)
+        return jobs
+
+    def _seed_job_index(self):
+        """Load the job snapshot (JOB_INDEX_SEED_PATH, default internships.json) into the job index, once"""
+        if self._job_index_seeded:
+            return
+        self._job_index_seeded = True
+        default_seed = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'public', 'internships.json')
+        seed_path = os.getenv('JOB_INDEX_SEED_PATH', default_seed)
+        if not seed_path or not os.path.exists(seed_path):
+            return
+        try:
+            jobs = list(iter_corpus_jobs(seed_path))
+            self.job_index.add([dict(format_provider_job(job), posted_at=job.get('created')) for job in jobs],
+                               source='snapshot')
+        except Exception as e:
+            print(f"Warning: could not seed the job index from {seed_path}: {e}")
+
+    def search_jobs(self, keyword, location, time_filter, page=1, page_size=10):
+        """(hits, total, source) for /search_jobs: from the job index, live providers on a miss.
+
+        Hits that all come from the static snapshot do not count as an index
+        answer; the snapshot is only the last resort when providers have nothing.
+        """
+        self._seed_job_index()
+        hits, total = self.job_index.search(keyword, location, time_filter, page, page_size)
+        if total and any(hit['source'] != 'snapshot' for hit in hits):
+            return hits, total, 'index'
+        jobs = self.fetch_internships(location=location, keyword=keyword, time_filter=time_filter)
+        hits, total = self.job_index.search(keyword, location, time_filter, page, page_size)
+        if total:
+            return hits, total, 'live'
+        if jobs:
+            # Provider results the index does not match (e.g. demo jobs): rank them on their own
+            scratch = JobIndex(location_aliases=self.job_index.location_aliases)
+            scratch.add([format_provider_job(job) for job in jobs], source='live', query=keyword)
+            hits, total = scratch.search(keyword, page=page, page_size=page_size)
+            if total:
+                return hits, total, 'live'
+        # Nothing live: undated snapshot jobs, whatever their age
+        hits, total = self.job_index.search(keyword, location, None, page, page_size)
+        return hits, total, 'snapshot' if total else 'live'
+
+    def job_matcher(self, resume_text, reference_texts, model=None, similarity=None):
+        """Match-percentage function for job texts that arrive in chunks.
+
+        Uses the corpus model when one is loaded (or model, to pin a version
+        the caller already holds term counts for), with its LSA vectors for
+        similarity='lsa'. Otherwise the vectorizer of calculate_job_matches is
+        fitted once on the resume plus reference_texts (the first chunk) and
+        reused, so scores from every chunk are comparable.
+        """
+        model = model or self.tfidf_models.current()
+        if model is not None and self.resolve_similarity(similarity, model) == 'lsa':
+            resume_embedding = model.embed([resume_text])[0]
+
+            def match_embedded(job_texts, job_counts=None):
+                if not job_texts:
+                    return []
+                embeddings = model.embed_counts(job_counts if job_counts is not None else model.count(job_texts))
+                return [min(100, max(0, s * 100)) for s in embeddings @ resume_embedding]
+
+            return match_embedded
+        if model is not None:
+            transform = model.transform
+        else:
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=500)
+            vectorizer.fit([resume_text] + list(reference_texts))
+            transform = vectorizer.transform
+        resume_vector = transform([resume_text])
+
+        def match(job_texts, job_counts=None):
+            """job_counts: optional term counts of job_texts under the same corpus model"""
+            if not job_texts:
+                return []
+            try:
+                if model is not None and job_counts is not None:
+                    job_matrix = model.transform_counts(job_counts)
+                else:
+                    job_matrix = transform(job_texts)
+                similarities = (job_matrix @ resume_vector.T).toarray().ravel()
+                return [min(100, max(0, s * 100)) for s in similarities]
+            except Exception as e:
+                print(f"Error computing batch job match: {e}")
+                return [50] * len(job_texts)
+        return match
+
+    def prepare_job_set(self, job_texts, keyword_backend=None, model=None, similarity=None):
+        """Vectorize a job set once, for one or many score_resumes calls.
+
+        Uses model, else the corpus model, else a TF-IDF space fitted on the
+        jobs. With similarity='lsa' (and a model that has an LSA projection)
+        the jobs are also embedded into one contiguous float32 matrix. TF-IDF
+        sets of at least ANN_MIN_JOBS jobs get an IVF index (see ann_index.py),
+        so a resume is only scored exactly against the jobs of its ANN_NPROBE
+        closest clusters.
         """
+        job_texts = list(job_texts)
+        backend = self.resolve_keyword_backend(keyword_backend)
+        model = model or self.tfidf_models.current()
+        if model is None:
+            model = fit_corpus_model(job_texts, ngram_range=(1, 1), sublinear_tf=False, version='batch')
+        job_counts = model.count(job_texts)
+        similarity = self.resolve_similarity(similarity, model)
+        job_set = {
+            'size': len(job_texts),
+            'texts': job_texts,
+            'model': model,
+            'similarity': similarity,
+            'keyword_backend': backend,
+            'required_skills': set().union(*self.extract_keywords_batch(job_texts, backend)),
+            'matrix': model.transform_counts(job_counts),
+            # Combined job text, as calculate_ats_score compares against
+            'combined': model.transform_counts(sp.csr_matrix(job_counts.sum(axis=0))),
+            'embeddings': None,
+            'ann': None
+        }
+        if similarity == 'lsa':
+            job_set['embeddings'] = model.embed_counts(job_counts)
+            job_set['combined_embedding'] = model.embed_counts(sp.csr_matrix(job_counts.sum(axis=0)))[0]
+        elif len(job_texts) >= self.ann_min_jobs:
+            job_set['ann'] = IVFIndex(nprobe=self.ann_nprobe).build(job_set['matrix'])
+        return job_set
+
+    def snapshot_job_set(self, snapshot, keyword_backend=None, similarity=None):
+        """prepare_job_set's result for a mapped job snapshot, without copying its arrays"""
+        backend = self.resolve_keyword_backend(keyword_backend)
+        model = snapshot.model
+        similarity = self.resolve_similarity(similarity, model)
+        if similarity == 'lsa' and snapshot.embeddings is None:
+            similarity = 'tfidf'
+        required_skills = snapshot.required_skills(backend)
+        if required_skills is None:
+            print(f"[JobSnapshot] snapshot {snapshot.version} has no skills for keyword backend {backend}")
+            required_skills = set()
+        totals = sp.csr_matrix(np.asarray(snapshot.term_totals).reshape(1, -1))
+        job_set = {
+            'size': len(snapshot),
+            'texts': None,
+            'model': model,
+            'similarity': similarity,
+            'keyword_backend': backend,
+            'required_skills': required_skills,
+            'matrix': snapshot.matrix,
+            'combined': model.transform_counts(totals),
+            'embeddings': None,
+            'ann': snapshot.ivf if similarity == 'tfidf' else None
+        }
+        if similarity == 'lsa':
+            job_set['embeddings'] = snapshot.embeddings
+            job_set['combined_embedding'] = model.embed_counts(totals)[0]
+        return job_set
+
+    def score_resumes(self, resume_texts, job_texts, top_k=10, keyword_backend=None, resume_keywords=None,
+                      block_size=512, model=None, job_set=None, similarity=None):
+        """Score many (cleaned) resumes against one job set.
+
+        Jobs and resumes are vectorized once, in the corpus model's space when
+        one is loaded (then every score equals the single-resume path) or else
+        in one TF-IDF space fitted on this batch, so all resumes are scored
+        against the same weights (pass model to pin the space across calls,
+        or job_set from prepare_job_set to reuse the vectorized jobs).
+        The resume x job similarity matrix is a sparse product (a dense
+        float32 one for similarity='lsa'), evaluated block_size resumes at a
+        time; job sets with an IVF index only score the candidates it retrieves.
+
+        Returns (results, stats). results[i] has 'ats_score', 'missing_keywords'
+        and 'top_jobs' = [(job_index, match_percent), ...] best first; stats has
+        counts, elapsed seconds and resumes/second.
+        """
+        start = time.perf_counter()
+        resume_texts = list(resume_texts)
+        job_texts = job_set['texts'] if job_set is not None else list(job_texts)
+        n_jobs = job_set['size'] if job_set is not None else len(job_texts)
+        backend = self.resolve_keyword_backend(keyword_backend)
+        results = []
+        if resume_texts and not n_jobs:
+            results = [{'ats_score': 0, 'missing_keywords': [], 'top_jobs': []} for _ in resume_texts]
+        elif resume_texts:
+            if resume_keywords is None:
+                resume_keywords = self.extract_keywords_batch(resume_texts, backend)
+            if job_set is None:
+                model = model or self.tfidf_models.current()
+                if model is None:
+                    model = fit_corpus_model(job_texts + resume_texts, ngram_range=(1, 1), sublinear_tf=False,
+                                             version='batch')
+                job_set = self.prepare_job_set(job_texts, backend, model, similarity)
+            required_skills = job_set['required_skills']
+            ann = job_set['ann']
+            if job_set['similarity'] == 'lsa':
+                resume_matrix = job_set['model'].embed(resume_texts)
+                semantic = resume_matrix @ job_set['combined_embedding']
+            else:
+                resume_matrix = job_set['model'].transform(resume_texts)
+                semantic = (resume_matrix @ job_set['combined'].T).toarray().ravel()
+
+            k = min(top_k, n_jobs)
+            for block_start in range(0, len(resume_texts), block_size):
+                block = resume_matrix[block_start:block_start + block_size]
+                if ann is not None:
+                    ranked = [(ids[:k], sims[:k]) for ids, sims in ann.search(block, max(k, self.ann_candidates))]
+                else:
+                    if job_set['similarity'] == 'lsa':
+                        sims = block @ job_set['embeddings'].T
+                    else:
+                        sims = (block @ job_set['matrix'].T).toarray()
+                    if k < n_jobs:
+                        candidates = np.sort(np.argpartition(-sims, k - 1, axis=1)[:, :k], axis=1)
+                    else:
+                        candidates = np.tile(np.arange(n_jobs), (len(sims), 1))
+                    ranked = []
+                    for row, idx in enumerate(candidates):
+                        # Stable sort keeps the lower job index first on ties
+                        order = np.argsort(-sims[row, idx], kind='stable')
+                        ranked.append((idx[order], sims[row, idx[order]]))
+                for row, (best, values) in enumerate(ranked):
+                    i = block_start + row
+                    ats_score, missing = self.combine_ats_score(
+                        set(resume_keywords[i]), required_skills, semantic[i] * 100
+                    )
+                    results.append({
+                        'ats_score': ats_score,
+                        'missing_keywords': missing,
+                        'top_jobs': [(int(j), min(100, max(0, v * 100))) for j, v in zip(best, values)]
+                    })
+        elapsed = time.perf_counter() - start
+        stats = {
+            'resume_count': len(resume_texts),
+            'job_count': n_jobs,
+            'ann': job_set is not None and job_set['ann'] is not None,
+            'similarity': job_set['similarity'] if job_set is not None else self.resolve_similarity(similarity),
+            'elapsed_seconds': round(elapsed, 4),
+            'resumes_per_second': round(len(resume_texts) / elapsed, 1) if elapsed > 0 else None
+        }
+        return results, stats
+
+    def _is_fallback_result(self, jobs):
+        """True for empty results or the built-in dummy jobs (cached only briefly)"""
+        return not jobs or jobs == self.get_dummy_jobs()
+
+    def fetch_internships(self, location="india", keyword="", time_filter="week", timings=None, deadline=None):
+        """Fetch internships, served from the response cache when possible.
+
+        A live fetch appends its per-provider timing to the timings list, if
+        given. With a deadline that has too little budget left for a provider
+        call, cached results of any age or the local job index are used instead.
+        """
+        if deadline is not None and not deadline.allows(self.deadline_provider_min + self.deadline_scoring_reserve):
+            return self._fetch_without_providers(location, keyword, time_filter, deadline)
+        if self.job_cache is None:
+            return self._ingest_jobs(
+                self._fetch_internships_live(location, keyword, time_filter, timings=timings, deadline=deadline),
+                time_filter, keyword, location
+            )
+        fetch = lambda: self._fetch_for_cache(location, keyword, time_filter, timings=timings, deadline=deadline)
+        # A background refresh outlives the request: it gets neither its budget nor its timings list
+        refresh = lambda: self._fetch_for_cache(location, keyword, time_filter, timings=[])
+        key = make_cache_key(location, keyword, time_filter)
+        return self.job_cache.get_or_fetch(key, fetch, time_filter, refresh_fn=refresh)
+
+    def _fetch_for_cache(self, location, keyword, time_filter, timings=None, deadline=None):
+        """Live fetch for the response cache; Uncached when a provider cutoff or the deadline cut it short"""
+        outcome = {}
+        jobs = self._ingest_jobs(
+            self._fetch_internships_live(location, keyword, time_filter, timings=timings, deadline=deadline,
+                                         outcome=outcome),
+            time_filter, keyword, location
+        )
+        # Another request for the same query, with its full budget, must not be served the partial result
+        return Uncached(jobs) if outcome.get('truncated') else jobs
+
+    def _fetch_without_providers(self, location, keyword, time_filter, deadline):
+        """Cached (even expired) or locally indexed jobs for a request out of budget for provider calls"""
+        if self.job_cache is not None:
+            cached = self.job_cache.peek(make_cache_key(location, keyword, time_filter))
+            if cached:
+                deadline.degrade('providers', f"no budget for a provider call; served cached results for '{keyword}'")
+                return cached
+        self._seed_job_index()
+        hits, _ = self.job_index.search(keyword, location, time_filter, page_size=self.provider_enough_jobs)
+        if not hits:
+            # Last resort: undated snapshot jobs, which match no time filter
+            hits, _ = self.job_index.search(keyword, location, None, page_size=self.provider_enough_jobs)
+        deadline.degrade('providers', f"no budget for a provider call; served {len(hits)} indexed jobs for '{keyword}'")
+        return [{
+            'title': hit['title'],
+            'company': {'display_name': hit['company']},
+            'location': {'display_name': hit['location']},
+            'description': hit['description'],
+            'redirect_url': hit['apply_link'],
+        } for hit in hits]
+
+    def _schedule_provider_retry(self, location, keyword, time_filter, attempt, wait=None):
+        """Retry a failed provider query in the background to warm the response cache.
+
+        Uses Retry-After when given, else exponential backoff with jitter. The
+        serving thread never sleeps; the next request for the same query is
+        served from the cache once the retry succeeds.
+        """
+        if self.job_cache is None or attempt >= self.provider_max_retries:
+            return
+        delay = (wait if wait is not None else 2 ** (attempt - 1)) + random.uniform(0, 0.5)
+        # Don't retry before the breaker would let the call through
+        delay = max(delay, self.providers['rapidapi'].stats()['open_for_seconds'])
+        key = make_cache_key(location, keyword, time_filter)
+
+        def retry():
+            outcome = {}
+            jobs = self._fetch_internships_live(location, keyword, time_filter, attempt=attempt + 1, outcome=outcome)
+            if not self._is_fallback_result(jobs) and not outcome.get('truncated'):
+                self.job_cache.put(key, self._ingest_jobs(jobs, time_filter, keyword, location), time_filter)
+
+        if self.retry_scheduler.schedule(delay, retry, key=key):
+            print(f"Scheduled background retry {attempt + 1}/{self.provider_max_retries} for '{keyword}' in {delay:.1f}s")
+
+    def _fetch_internships_live(self, location="india", keyword="", time_filter="week", attempt=1, timings=None,
+                                deadline=None, outcome=None):
+        """Fetch internships from every configured provider in parallel.
+
+        Adzuna and RapidAPI run on the provider executor at the same time, so
+        their latencies overlap instead of adding up. The call returns once
+        provider_enough_jobs unique jobs arrived or provider_deadline seconds
+        passed, with whatever finished by then merged in provider order
+        (Adzuna first) and de-duplicated by dedupe_key; providers still
+        running are left to finish in the background and their results are
+        dropped. Per-provider status, seconds and job counts are appended to
+        timings when given. A request deadline shortens the wait to its
+        remaining budget (less the scoring reserve). outcome, when given, gets
+        'truncated': True if the result was cut short: a provider still running
+        at the cutoff, or provider calls skipped to fit the request deadline.
+        """
+        start = time.perf_counter()
+        budget = self.provider_deadline
+        degraded_before = 0
+        if deadline is not None:
+            budget = max(0.0, min(budget, deadline.remaining() - self.deadline_scoring_reserve))
+            degraded_before = len(deadline.degraded)
+        cutoff = start + budget
         # Read Adzuna credentials at call-time (in case env vars are set after engine construction)
+        fetchers = {
+            'adzuna': self._fetch_adzuna if os.getenv('ADZUNA_APP_ID') and os.getenv('ADZUNA_APP_KEY') else None,
+            'rapidapi': self._fetch_rapidapi if self.rapidapi_key else None,
+        }
+        if not self.rapidapi_key:
+            print("Error: RAPIDAPI_KEY not set in environment")
+
+        def timed(name, fetch):
+            call_start = time.perf_counter()
+            try:
+                jobs, error = fetch(location, keyword, time_filter, attempt, deadline) or [], None
+            except Exception as e:
+                print(f"[{name}] request failed: {e}")
+                jobs, error = [], str(e)
+            return jobs, error, time.perf_counter() - call_start
+
+        futures = {self.provider_executor.submit(timed, name, fetch): name
+                   for name, fetch in fetchers.items() if fetch is not None}
+        results, providers = {}, {name: {'status': 'skipped'} for name, fetch in fetchers.items() if fetch is None}
+        pending = set(futures)
+        while pending:
+            remaining = cutoff - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                jobs, error, seconds = future.result()
+                results[name] = jobs
+                providers[name] = {'status': 'error' if error else ('ok' if jobs else 'empty'),
+                                   'seconds': round(seconds, 3), 'job_count': len(jobs)}
+                if error:
+                    providers[name]['error'] = error[:200]
+            if len(merge_provider_jobs(results.values())) >= self.provider_enough_jobs:
+                break
+        elapsed = time.perf_counter() - start
+        for future in pending:
+            future.cancel()
+            providers[futures[future]] = {'status': 'timeout' if elapsed >= budget else 'not_needed',
+                                          'seconds': round(elapsed, 3)}
+            if deadline is not None and elapsed >= budget and budget < self.provider_deadline:
+                deadline.degrade('providers', f"{futures[future]} cut off after {budget:.1f}s to fit the request budget")
+
+        if outcome is not None:
+            outcome['truncated'] = (any(p['status'] == 'timeout' for p in providers.values())
+                                    or (deadline is not None and len(deadline.degraded) > degraded_before))
+        merged = merge_provider_jobs(results.get(name) for name in fetchers)
+        summary = ', '.join(f"{name}={p['status']}" for name, p in providers.items())
+        print(f"[Providers] '{keyword}' @ '{location}': {len(merged)} jobs in {elapsed:.2f}s ({summary})")
+        if timings is not None:
+            timings.append({'keyword': keyword, 'location': location, 'time_filter': time_filter,
+                            'seconds': round(elapsed, 3), 'job_count': len(merged), 'providers': providers})
+        if merged:
+            return merged
+        # If nothing worked, return dummy jobs only in demo mode; otherwise return empty list
+        return self.get_dummy_jobs() if self.demo_mode else []
+
+    def _fetch_adzuna(self, location="india", keyword="", time_filter="week", attempt=1, deadline=None):
+        """Search the Adzuna Jobs API (realtime results); up to 15 raw jobs"""
         adzuna_app_id = os.getenv('ADZUNA_APP_ID')
         adzuna_app_key = os.getenv('ADZUNA_APP_KEY')
+        # Map location to country code. Prefer India endpoint for common Indian cities/locations.
+        loc_lower = (location or '').lower()
+        if any(tok in loc_lower for tok in INDIA_LOCATION_TOKENS):
+            country = 'in'
+        else:
+            # If a location was provided and it doesn't look like an Indian city, default to GB;
+            # otherwise default to IN
+            country = 'gb' if location else 'in'
 
-        # If Adzuna credentials are present, prefer calling Adzuna Jobs API for realtime results
-        if adzuna_app_id and adzuna_app_key:
-            try:
-                # Map location to country code. Prefer India endpoint for common Indian cities/locations.
-                loc_lower = (location or '').lower()
-                india_tokens = ['india','bangalore','bengaluru','mumbai','delhi','pune','hyderabad','chennai','kolkata','ahmedabad','gurgaon','noida']
-                if any(tok in loc_lower for tok in india_tokens):
-                    country = 'in'
-                else:
-                    # If a location was provided and it doesn't look like an Indian city, default to GB;
-                    # otherwise default to IN
-                    country = 'gb' if location else 'in'
+        adzuna_url = f'https://api.adzuna.com/v1/api/jobs/{country}/search/1'
+        # Clean keyword: Adzuna performs better when 'intern' is not included in 'what'
+        clean_kw = (keyword or 'intern')
+        try:
+            import re as _re
+            clean_kw = _re.sub(r'\bintern\b', '', clean_kw, flags=_re.I).strip()
+            if not clean_kw:
+                clean_kw = 'intern'
+        except Exception:
+            pass
 
-                adzuna_url = f'https://api.adzuna.com/v1/api/jobs/{country}/search/1'
-                # Clean keyword: Adzuna performs better when 'intern' is not included in 'what'
-                clean_kw = (keyword or 'intern')
-                try:
-                    import re as _re
-                    clean_kw = _re.sub(r'\bintern\b', '', clean_kw, flags=_re.I).strip()
-                    if not clean_kw:
-                        clean_kw = 'intern'
-                except Exception:
-                    pass
-
-                params = {
-                    'app_id': adzuna_app_id,
-                    'app_key': adzuna_app_key,
-                    'results_per_page': 50,
-                    'what': clean_kw,
-                    'where': location or self.default_location,
-                    'content-type': 'application/json'
-                }
-                print(f"[Adzuna] request -> url: {adzuna_url}, params: {{'what': params.get('what'), 'where': params.get('where'), 'results_per_page': params.get('results_per_page')}}")
-                # Optionally respect time_filter by filtering with max_days_old if available
-                if time_filter == 'day':
-                    params['max_days_old'] = 1
-                elif time_filter == 'week':
-                    params['max_days_old'] = 7
-                elif time_filter == 'month':
-                    params['max_days_old'] = 30
-
-                resp = requests.get(adzuna_url, params=params, timeout=15)
-                # Debug logging for Adzuna response
-                try:
-                    body_snippet = resp.text[:1000]
-                except Exception:
-                    body_snippet = '<unable to read body>'
+        params = {
+            'app_id': adzuna_app_id,
+            'app_key': adzuna_app_key,
+            'results_per_page': 50,
+            'what': clean_kw,
+            'where': location or self.default_location,
+            'content-type': 'application/json'
+        }
+        print(f"[Adzuna] request -> url: {adzuna_url}, params: {{'what': params.get('what'), 'where': params.get('where'), 'results_per_page': params.get('results_per_page')}}")
+        # Optionally respect time_filter by filtering with max_days_old if available
+        if time_filter == 'day':
+            params['max_days_old'] = 1
+        elif time_filter == 'week':
+            params['max_days_old'] = 7
+        elif time_filter == 'month':
+            params['max_days_old'] = 30
+
+        resp = self.providers['adzuna'].get(adzuna_url, params=params, timeout=self._provider_timeout('adzuna', deadline))
+        # Debug logging for Adzuna response
+        try:
+            body_snippet = resp.text[:1000]
+        except Exception:
+            body_snippet = '<unable to read body>'
 
-                if resp.status_code != 200:
-                    print(f"[Adzuna] API returned status {resp.status_code}. Body snippet: {body_snippet}")
-                else:
-                    try:
-                        data = resp.json()
-                    except Exception as e:
-                        print(f"Adzuna returned non-JSON response: {e}. Body snippet: {body_snippet}")
-                        data = {}
-
-                    results = data.get('results', []) if isinstance(data, dict) else []
-                    if not results:
-                        # Log the keys and a small sample so we can adjust normalization
-                        keys = list(data.keys()) if isinstance(data, dict) else []
-                        print(f"[Adzuna] returned no 'results' key. Response keys: {keys}. Body snippet: {body_snippet}")
-
-                    normalized = []
-                    for r in results:
-                        normalized.append({
-                            'title': r.get('title'),
-                            'company': {'display_name': r.get('company', {}).get('display_name') if isinstance(r.get('company'), dict) else r.get('company')},
-                            'location': {'display_name': r.get('location', {}).get('display_name') if isinstance(r.get('location'), dict) else r.get('location') or r.get('location_area')},
-                            'description': r.get('description') or r.get('redirect_url') or r.get('salary_is_predicted',''),
-                            'redirect_url': r.get('redirect_url') or r.get('lister_url') or r.get('url')
-                        })
-                    print(f"[Adzuna] normalized {len(normalized)} items. Sample: {normalized[:1]}")
-                    if normalized:
-                        return normalized[:15]
+        if resp.status_code != 200:
+            print(f"[Adzuna] API returned status {resp.status_code}. Body snippet: {body_snippet}")
+        else:
+            try:
+                data = resp.json()
             except Exception as e:
-                print(f"[Adzuna] request failed: {e}")
+                print(f"Adzuna returned non-JSON response: {e}. Body snippet: {body_snippet}")
+                data = {}
+
+            results = data.get('results', []) if isinstance(data, dict) else []
+            if not results:
+                # Log the keys and a small sample so we can adjust normalization
+                keys = list(data.keys()) if isinstance(data, dict) else []
+                print(f"[Adzuna] returned no 'results' key. Response keys: {keys}. Body snippet: {body_snippet}")
+
+            normalized = []
+            for r in results:
+                normalized.append({
+                    'title': r.get('title'),
+                    'company': {'display_name': r.get('company', {}).get('display_name') if isinstance(r.get('company'), dict) else r.get('company')},
+                    'location': {'display_name': r.get('location', {}).get('display_name') if isinstance(r.get('location'), dict) else r.get('location') or r.get('location_area')},
+                    'description': r.get('description') or r.get('redirect_url') or r.get('salary_is_predicted',''),
+                    'redirect_url': r.get('redirect_url') or r.get('lister_url') or r.get('url'),
+                    'created': r.get('created')
+                })
+            print(f"[Adzuna] normalized {len(normalized)} items. Sample: {normalized[:1]}")
+            if normalized:
+                return normalized[:15]
+        return []
+
+    def _provider_timeout(self, name, deadline=None):
+        """Read timeout for one provider call: the client default, or less if the request budget is shorter"""
+        if deadline is None:
+            return None
+        return max(0.1, deadline.cap(self.providers[name].read_timeout))
+
+    def _fetch_rapidapi(self, location="india", keyword="", time_filter="week", attempt=1, deadline=None):
+        """Search the RapidAPI internships API with its alternative-parameter and keyword fallbacks.
+
+        A failed primary query (429, error status or transport error) is
+        retried on the background retry scheduler (respecting Retry-After)
+        instead of sleeping here, and this call moves straight on to fallback,
+        broader searches to increase the chance of returning real internship
+        recommendations. Fallback calls stop once the request deadline has
+        too little budget left for another provider call.
+        """
+        def out_of_budget(step):
+            if deadline is None or deadline.allows(self.deadline_provider_min + self.deadline_scoring_reserve):
+                return False
+            deadline.degrade('rapidapi', f"skipped {step} for '{keyword}'")
+            return True
 
         # Select endpoint based on time_filter (RapidAPI internships fallback)
         url = "https://internships-api.p.rapidapi.com/active-jb-7d"
@@ -341,15 +1135,6 @@ class ResumeATSEngine:
         if location:
             params["location"] = location
 
-        if not self.rapidapi_key:
-            print("Error: RAPIDAPI_KEY not set in environment")
-            # Only return dummy jobs when demo mode is explicitly enabled; otherwise return an empty list
-            return self.get_dummy_jobs() if self.demo_mode else []
-
-        # Retry/backoff parameters
-        max_retries = 4
-        backoff = 1.0
-
         def normalize_jobs(data):
             raw_jobs = []
             if isinstance(data, list):
@@ -375,91 +1160,88 @@ class ResumeATSEngine:
                     location_str = job.get('location') or job.get('city') or ''
                 description = job.get('description') or job.get('job_description') or job.get('summary') or ''
                 apply_link = job.get('redirect_url') or job.get('url') or job.get('apply_url') or job.get('link') or ''
+                created = job.get('date_posted') or job.get('created') or job.get('posted_at')
 
-                dedupe_key = (title.strip().lower(), company.strip().lower(), location_str.strip().lower())
-                if dedupe_key in seen:
+                key = dedupe_key(title, company, location_str)
+                if key in seen:
                     continue
-                seen.add(dedupe_key)
+                seen.add(key)
 
                 normalized.append({
                     'title': title,
                     'company': {'display_name': company},
                     'location': {'display_name': location_str},
                     'description': description,
-                    'redirect_url': apply_link
+                    'redirect_url': apply_link,
+                    'created': created
                 })
 
             return normalized
 
-        # Primary retry loop
-        for attempt in range(1, max_retries + 1):
+        rapidapi = self.providers['rapidapi']
+
+        # Primary query (single attempt; retries are scheduled in the background)
+        try:
+            response = rapidapi.get(url, headers=headers, params=params, timeout=self._provider_timeout('rapidapi', deadline))
+        except ProviderUnavailable:
+            # Breaker open: fail fast, reported as this provider's error
+            raise
+        except Exception as e:
+            print(f"Request exception (attempt {attempt}/{self.provider_max_retries}): {e}")
+            self._schedule_provider_retry(location, keyword, time_filter, attempt)
+            response = None
+
+        if response is not None and response.status_code == 200:
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=20)
+                data = response.json()
             except Exception as e:
-                wait = backoff + random.uniform(0, 0.5)
-                print(f"Request exception (attempt {attempt}/{max_retries}): {e}. Retrying in {wait:.1f}s")
-                time.sleep(wait)
-                backoff *= 2
-                continue
-
-            if response.status_code == 200:
+                print(f"Failed to decode JSON response: {e}")
+                return []
+
+            normalized = normalize_jobs(data)
+            if normalized:
+                return normalized[:15]
+            # If no normalized results, try alternative parameter names
+            print("No normalized jobs returned for primary query; will attempt alternative param keys and fallbacks")
+            # Try different parameter names that some RapidAPI providers may accept
+            alt_param_keys = ['query', 'search', 'title', 'position']
+            for alt_key in alt_param_keys:
+                if out_of_budget('alternative-parameter probes'):
+                    break
                 try:
-                    data = response.json()
+                    alt_params = {'location': location}
+                    alt_params[alt_key] = keyword
+                    resp = rapidapi.get(url, headers=headers, params=alt_params,
+                                        timeout=self._provider_timeout('rapidapi', deadline))
+                except ProviderUnavailable as e:
+                    print(f"Alt request skipped for key '{alt_key}': {e}")
+                    break
                 except Exception as e:
-                    print(f"Failed to decode JSON response: {e}")
-                    # If JSON parsing fails, only return dummy data in demo mode
-                    return self.get_dummy_jobs() if self.demo_mode else []
-
-                normalized = normalize_jobs(data)
-                if normalized:
-                    return normalized[:15]
-                # If no normalized results, try alternative parameter names
-                print("No normalized jobs returned for primary query; will attempt alternative param keys and fallbacks")
-                # Try different parameter names that some RapidAPI providers may accept
-                alt_param_keys = ['query', 'search', 'title', 'position']
-                for alt_key in alt_param_keys:
-                    try:
-                        alt_params = {'location': location}
-                        alt_params[alt_key] = keyword
-                        resp = requests.get(url, headers=headers, params=alt_params, timeout=15)
-                    except Exception as e:
-                        print(f"Alt request exception for key '{alt_key}': {e}")
-                        continue
-
-                    if resp.status_code != 200:
-                        print(f"Alt RapidAPI status {resp.status_code} for param '{alt_key}'")
-                        continue
-
-                    try:
-                        alt_data = resp.json()
-                    except Exception as e:
-                        print(f"Failed to parse alt JSON for '{alt_key}': {e}")
-                        continue
-
-                    alt_norm = normalize_jobs(alt_data)
-                    if alt_norm:
-                        return alt_norm[:15]
-                # If alternate keys didn't help, break to fallbacks
-                break
+                    print(f"Alt request exception for key '{alt_key}': {e}")
+                    continue
+
+                if resp.status_code != 200:
+                    print(f"Alt RapidAPI status {resp.status_code} for param '{alt_key}'")
+                    continue
 
-            if response.status_code == 429:
-                # Rate limited — respect Retry-After if present
-                ra = response.headers.get('Retry-After')
                 try:
-                    wait = int(ra) if ra and ra.isdigit() else backoff
-                except:
-                    wait = backoff
-                jitter = random.uniform(0, 1)
-                print(f"RapidAPI 429 rate limit. Waiting {wait + jitter:.1f}s before retry (attempt {attempt})")
-                time.sleep(wait + jitter)
-                backoff *= 2
-                continue
+                    alt_data = resp.json()
+                except Exception as e:
+                    print(f"Failed to parse alt JSON for '{alt_key}': {e}")
+                    continue
 
-            # Other non-200 responses: log and retry with backoff
+                alt_norm = normalize_jobs(alt_data)
+                if alt_norm:
+                    return alt_norm[:15]
+        elif response is not None and response.status_code == 429:
+            # Rate limited — the breaker is now open; retry after Retry-After in the background
+            wait = parse_retry_after(response.headers.get('Retry-After'))
+            print(f"RapidAPI 429 rate limit (attempt {attempt}). Scheduling background retry.")
+            self._schedule_provider_retry(location, keyword, time_filter, attempt, wait)
+        elif response is not None:
+            # Other non-200 responses: log and retry with backoff in the background
             print(f"RapidAPI error: {response.status_code}. Response: {response.text[:200]}")
-            wait = backoff + random.uniform(0, 0.5)
-            time.sleep(wait)
-            backoff *= 2
+            self._schedule_provider_retry(location, keyword, time_filter, attempt)
 
         # Fallback strategies: try broader or alternative keywords to increase chance of real results
         fallback_keywords = []
@@ -484,10 +1266,15 @@ class ResumeATSEngine:
         normalized_all = []
         seen = set()
         for fk in fallback_keywords:
+            if out_of_budget('fallback keyword searches'):
+                break
             print(f"Fallback search with keyword: '{fk}'")
             params['keyword'] = fk
             try:
-                resp = requests.get(url, headers=headers, params=params, timeout=20)
+                resp = rapidapi.get(url, headers=headers, params=params, timeout=self._provider_timeout('rapidapi', deadline))
+            except ProviderUnavailable as e:
+                print(f"Fallback search stopped: {e}")
+                break
             except Exception as e:
                 print(f"Fallback request error for '{fk}': {e}")
                 continue
@@ -519,47 +1306,63 @@ class ResumeATSEngine:
                 return filtered[:15]
             return normalized_all[:15]
 
-        # If nothing worked, return dummy jobs only in demo mode; otherwise return empty list
-        return self.get_dummy_jobs() if self.demo_mode else []
+        return []
 
 
 @app.route('/recommend', methods=['POST'])
 def recommend():
-    """Main endpoint: accepts resume file + optional fields and returns ATS score + recommendations"""
+    """Main endpoint: accepts resume file (or a saved profile_id) + optional fields and returns ATS score + recommendations"""
     try:
-        # Read form fields
-        if 'resume' not in request.files:
+        # Read form fields: a resume upload, a saved profile, or both (the upload is attached to the profile)
+        profile_id = request.form.get('profile_id', '').strip()
+        profile = profile_store.get(profile_id) if profile_id else None
+        if profile_id and profile is None:
+            return jsonify({'error': 'Profile not found'}), 404
+        if profile is None and 'resume' not in request.files:
             return jsonify({'error': 'Resume file is required'}), 400
 
-        resume_file = request.files['resume']
-        skills = request.form.get('skills', '')
+        # Latency budget for the whole request: every stage below checks it and degrades instead of overrunning
+        deadline = Deadline(parse_budget_ms(
+            request.form.get('budget_ms'),
+            int(os.getenv('RECOMMEND_BUDGET_MS', '12000')),
+            int(os.getenv('RECOMMEND_MAX_BUDGET_MS', '30000'))
+        ) / 1000.0)
+
+        resume_file = request.files.get('resume')
+        # A profile's skills and location are the defaults for the job search
+        skills = request.form.get('skills', skills_text(profile) if profile else '')
         education = request.form.get('education', '')
-        location = request.form.get('location', 'india')
+        location = request.form.get('location', (profile or {}).get('location') or 'india')
         time_filter = request.form.get('time_filter', 'week')
         # Optional domain parameter (e.g., product, marketing, data)
         domain = request.form.get('domain', '').strip()
 
-        # Read file bytes
-        content = resume_file.read()
+        keyword_backend = ats_engine.resolve_keyword_backend(request.form.get('keyword_backend'))
+        similarity = ats_engine.resolve_similarity(request.form.get('similarity'))
 
-        # Extract text based on file type
-        filename = resume_file.filename.lower()
-        if filename.endswith('.pdf'):
-            resume_text = ats_engine.extract_text_from_pdf(content)
-        elif filename.endswith('.docx'):
-            resume_text = ats_engine.extract_text_from_docx(content)
+        resume_counts = None
+        if profile is not None:
+            # Scored from the profile's stored representation: no parsing or NLP unless something changed
+            upload = None
+            if resume_file is not None:
+                content = resume_file.read()
+                try:
+                    upload = dict(ats_engine.process_resume(content, resume_file.filename, keyword_backend, deadline),
+                                  digest=resume_cache_key(content, resume_file.filename))
+                except DocumentParseAbandoned:
+                    deadline.degrade('parse', 'resume parsing ran out of budget; scored on the stored profile')
+            resume_text, resume_keywords, resume_counts = ats_engine.profile_resume(
+                profile_id, profile, keyword_backend, upload
+            )
         else:
-            # Try to decode as text
-            try:
-                resume_text = content.decode('utf-8', errors='ignore')
-            except:
-                resume_text = ''
-
-        resume_text = ats_engine.clean_text(resume_text + ' ' + skills + ' ' + education)
+            # Read file bytes; text extraction and resume keywords are cached by content hash
+            content = resume_file.read()
+            resume_text, resume_keywords = ats_engine.prepare_resume(
+                content, resume_file.filename, skills, education, keyword_backend, deadline
+            )
 
         # Build a search keyword: prefer domain (if provided) then include skills
         search_trace = []
-        effective_search_keyword = ''
 
         if domain:
             dkey = domain.lower()
@@ -582,16 +1385,17 @@ def recommend():
         search_trace.append(skills.strip())
         search_trace.append('intern')
 
-        # Try successive search_trace items until we get results
-        jobs = []
-        for q in search_trace:
-            if not q:
-                continue
-            effective_search_keyword = q
-            print(f"Attempting RapidAPI search with: '{q}' and location '{location}'")
-            jobs = ats_engine.fetch_internships(location=location, keyword=q, time_filter=time_filter)
-            if jobs and len(jobs) > 0:
-                break
+        # Run the search_trace queries (in priority order, or concurrently with a cap)
+        search_mode = request.form.get('search_mode', os.getenv('SEARCH_MODE', 'sequential')).lower()
+        provider_timings = []
+        fetch_query = lambda q: ats_engine.fetch_internships(location=location, keyword=q, time_filter=time_filter,
+                                                             timings=provider_timings, deadline=deadline)
+        if search_mode == 'concurrent':
+            max_concurrency = int(os.getenv('SEARCH_MAX_CONCURRENCY', '4'))
+            jobs, effective_search_keyword, search_trace = run_concurrent(search_trace, fetch_query, max_concurrency,
+                                                                          deadline)
+        else:
+            jobs, effective_search_keyword, search_trace = run_sequential(search_trace, fetch_query, deadline)
 
         # If still empty, final fallback to generic interns: use dummy jobs so
         # we can still compute an ATS score for the user even when provider
@@ -599,12 +1403,14 @@ def recommend():
         # live search results, but ensure scoring can continue by using
         # built-in dummy jobs as a fallback for scoring only.
         used_dummy_for_scoring = False
+        if jobs:
+            append_corpus_dump(jobs, 'provider')
         if not jobs:
             print("No jobs found from providers; using built-in dummy jobs for ATS scoring fallback.")
             jobs = ats_engine.get_dummy_jobs()
             used_dummy_for_scoring = True
 
-        # Filter and prioritize jobs by domain tokens and location to improve relevance
+        # Flatten every job once; filtering and all ranking features use these fields
         domain_tokens = []
         if domain:
             dkey = domain.lower()
@@ -614,140 +1420,79 @@ def recommend():
             domain_tokens = [t.lower() for t in re.split(r'[,\s]+', skills) if t]
 
         loc_tokens = [t.lower() for t in re.split(r'[,\s]+', (location or '').strip()) if t]
-
-        def job_contains_tokens(job, tokens):
-            txt = ' '.join([str(job.get('title','')), str(job.get('company',{}).get('display_name','') if isinstance(job.get('company',{}), dict) else job.get('company','')), str(job.get('location',{}).get('display_name','') if isinstance(job.get('location',{}), dict) else job.get('location','')), str(job.get('description',''))]).lower()
-            return any(tok in txt for tok in tokens if tok)
+        formatted_recs = [format_provider_job(job) for job in jobs]
+        max_jobs = ats_engine.deadline_degraded_max_jobs
+        if len(formatted_recs) > max_jobs and not deadline.allows(ats_engine.deadline_scoring_reserve):
+            deadline.degrade('scoring', f"scored the first {max_jobs} of {len(formatted_recs)} jobs")
+            formatted_recs = formatted_recs[:max_jobs]
+        # Cleaned text, keywords and term counts come from the job feature store
+        features = ats_engine.job_features(formatted_recs, ttl=ats_engine.job_feature_ttl(time_filter),
+                                           keyword_backend=keyword_backend)
+
+        # All token boosts in one pass over each job's (lowercased raw, cleaned) text:
+        # - domain synonyms and location tokens in the lowercased job fields (filter, primary order)
+        # - domain words, location tokens and listed skills in the cleaned job text (final score)
+        skill_tokens = [s.strip().lower() for s in skills.split(',')] if skills else []
+        boosts = TokenMatcher({
+            'domain_synonyms': (0, domain_tokens),
+            'location_hits': (0, loc_tokens),
+            'domain': (1, [t.lower() for t in (domain or '').split()]),
+            'location': (1, loc_tokens),
+            'skills': (1, skill_tokens),
+        }).count([(f['lower_text'], f['text']) for f in features])
 
         # apply domain filter if it yields reasonable matches
-        filtered_jobs = jobs
+        order = list(range(len(formatted_recs)))
         if domain_tokens:
-            domain_matched = [j for j in jobs if job_contains_tokens(j, domain_tokens)]
+            domain_matched = [i for i in order if boosts['domain_synonyms'][i]]
             if len(domain_matched) >= 3:
-                filtered_jobs = domain_matched
+                order = domain_matched
             elif len(domain_matched) > 0:
                 # if some matches, use them but still keep others for fallback
-                filtered_jobs = domain_matched + [j for j in jobs if j not in domain_matched]
-
-        # Prioritize location matches by sorting
-        def loc_score_job(job):
-            txt = ' '.join([str(job.get('title','')), str(job.get('company',{}).get('display_name','') if isinstance(job.get('company',{}), dict) else job.get('company','')), str(job.get('location',{}).get('display_name','') if isinstance(job.get('location',{}), dict) else job.get('location','')), str(job.get('description',''))]).lower()
-            score = 0
-            for tok in loc_tokens:
-                if tok and tok in txt:
-                    score += 1
-            return score
-
-        filtered_jobs.sort(key=loc_score_job, reverse=True)
-
-        # Prepare job descriptions for ATS scoring
-        job_texts = []
-        formatted_recs = []
-        for job in filtered_jobs:
-            title = job.get('title') or job.get('job_title') or job.get('name') or 'Internship'
-            company = (job.get('company', {}) if isinstance(job.get('company', {}), dict) else {}).get('display_name') if isinstance(job.get('company', {}), dict) else job.get('company') if isinstance(job.get('company', str)) else job.get('company_name') if job.get('company_name') else 'Company'
-            location_str = (job.get('location', {}) .get('display_name') ) if isinstance(job.get('location', {}), dict) else job.get('location') or job.get('city') or 'Location'
-            description = job.get('description') or job.get('job_description') or job.get('summary') or ''
-            apply_link = job.get('redirect_url') or job.get('url') or job.get('apply_url') or job.get('link') or '#'
-            # mark domain/location match flags for later boosting
-            domain_match = False
-            location_match = False
-            txt_fields = f"{title} {company} {location_str} {description}".lower()
-            if domain_tokens and any(tok in txt_fields for tok in domain_tokens):
-                domain_match = True
-            if loc_tokens and any(tok in txt_fields for tok in loc_tokens):
-                location_match = True
-
-            combined = f"{title} {company} {location_str} {description}"
-            job_texts.append(ats_engine.clean_text(combined))
-
-            formatted_recs.append({
-                'title': title,
-                'company': company,
-                'location': location_str,
-                'description': description,
-                'apply_link': apply_link,
-                'domain_match': domain_match,
-                'location_match': location_match
-            })
-
-        # Compute ATS score using hybrid approach across the returned internships
-        ats_score, missing_keywords = ats_engine.calculate_ats_score(resume_text, job_texts)
-
-        # Compute match percent per recommendation
+                matched = set(domain_matched)
+                order = domain_matched + [i for i in order if i not in matched]
+        formatted_recs = [formatted_recs[i] for i in order]
+        features = [features[i] for i in order]
+        boosts = {name: counts[order] for name, counts in boosts.items()}
+        job_texts = [f['text'] for f in features]
+
+        # ATS score across the returned internships and match percent per job
+        ats_score, missing_keywords, matches = ats_engine.score_job_features(
+            resume_text, features, keyword_backend=keyword_backend, resume_keywords=resume_keywords,
+            similarity=similarity, resume_counts=resume_counts
+        )
+        matches = np.rint(matches).astype(np.int64)
+
+        # Ranking features, computed once per job:
+        # - location hits in the job fields (primary order: location matches first)
+        # - final score = match + 25 per domain token + 20 per location token + 5 for a listed skill
+        #   (on the cleaned job text); jobs with a final score below 5 are dropped
+        final_scores = matches + 25 * boosts['domain'] + 20 * boosts['location'] + 5 * (boosts['skills'] > 0)
+        features = np.column_stack([boosts['location_hits'], matches, final_scores]) if job_texts else np.zeros((0, 3), dtype=np.int64)
+
+        # Rank by (location hits, match, final score) and format only the requested page
+        default_page_size = int(os.getenv('RECOMMEND_PAGE_SIZE', '50'))
+        try:
+            page = max(1, int(request.form.get('page') or 1))
+            page_size = max(1, int(request.form.get('page_size') or default_page_size))
+        except ValueError:
+            page, page_size = 1, default_page_size
+        eligible = features[:, 2] >= 5
+        ranked = top_k(features.T, page * page_size, mask=eligible)[(page - 1) * page_size:]
         recs_with_score = []
-        for rec, job_text in zip(formatted_recs, job_texts):
-            match = ats_engine.calculate_job_match(resume_text, job_text)
+        for i in ranked:
+            rec = formatted_recs[i]
             recs_with_score.append({
                 'title': rec['title'],
                 'company': rec['company'],
                 'location': rec['location'],
                 'description': rec['description'],
                 'apply_link': rec['apply_link'],
-                'match_percent': int(round(match)),
-                'raw_job_text': job_text
+                'match_percent': f"{int(features[i, 1])}%"
             })
 
-        # Compute a final score combining semantic match, domain and location boosts
-        domain_tokens = [t.lower() for t in (domain or '').split() if t]
-        loc_tokens = [t.lower() for t in re.split(r'[,\s]+', (location or '').strip()) if t]
-
-        def compute_final_score(entry):
-            base = entry.get('match_percent', 0)
-            boost = 0
-            text = (entry.get('raw_job_text','') or '').lower()
-            # domain boost
-            for tok in domain_tokens:
-                if tok and tok in text:
-                    boost += 25
-            # location boost
-            for tok in loc_tokens:
-                if tok and tok in text:
-                    boost += 20
-            # keyword overlap boost (small)
-            boost += 5 if any(k in text for k in ([s.strip().lower() for s in skills.split(',')] if skills else [])) else 0
-            return base + boost
-
-        # Calculate final_score for each entry and filter out very low-quality items
-        for e in recs_with_score:
-            e['final_score'] = int(round(compute_final_score(e)))
-
-        # Remove items with extremely low final score (e.g., <5)
-        recs_with_score = [e for e in recs_with_score if e.get('final_score', 0) >= 5]
-
-        # Sort by final_score desc, then by match_percent desc
-        recs_with_score.sort(key=lambda x: (x.get('final_score', 0), int(str(x.get('match_percent','0')).replace('%','') if isinstance(x.get('match_percent'), str) else x.get('match_percent',0))), reverse=True)
-
-        # Format match_percent as percent string and drop raw_job_text and final_score before returning
-        for e in recs_with_score:
-            e['match_percent'] = f"{int(e.get('match_percent',0))}%"
-            e.pop('raw_job_text', None)
-            e.pop('final_score', None)
-
         # Determine status
-        status = 'Unknown'
-        if ats_score >= 80:
-            status = 'Excellent'
-        elif ats_score >= 60:
-            status = 'Good'
-        elif ats_score >= 40:
-            status = 'Fair'
-        else:
-            status = 'Needs Improvement'
-
-        # Location relevance boosting: prefer job entries containing location tokens
-        loc_tokens = [t.lower() for t in re.split(r'[,\s]+', (location or '').strip()) if t]
-        def location_score(entry):
-            txt = ' '.join([str(entry.get('title','')), str(entry.get('company','')), str(entry.get('location','')), str(entry.get('description',''))]).lower()
-            score = 0
-            for tok in loc_tokens:
-                if tok and tok in txt:
-                    score += 30
-            return score
-
-        # Final sort: already sorted by domain-boosted match; now boost by location
-        recs_with_score.sort(key=lambda e: (int(e['match_percent'].replace('%','')), ) , reverse=True)
-        recs_with_score.sort(key=lambda e: location_score(e), reverse=True)
+        status = ats_status(ats_score)
 
         # Include effective search keyword and trace for debugging/tuning
         response_payload = {
@@ -755,47 +1500,93 @@ def recommend():
             'status': status,
             'missing_keywords': missing_keywords,
             'recommendations': recs_with_score,
+            'total_recommendations': int(eligible.sum()),
+            'page': page,
+            'page_size': page_size,
             'effective_search_keyword': effective_search_keyword,
             'search_trace': search_trace,
-            'used_dummy_jobs_for_scoring': used_dummy_for_scoring
+            'provider_timings': provider_timings,
+            'search_mode': search_mode,
+            'keyword_backend': keyword_backend,
+            'similarity': similarity,
+            'used_dummy_jobs_for_scoring': used_dummy_for_scoring,
+            'profile_id': profile_id or None,
+            'deadline': deadline.to_dict()
         }
 
         return jsonify(response_payload)
 
+    except DocumentParseError as e:
+        print(f"Resume parsing failed in /recommend: {e}")
+        return jsonify({'error': f'Could not read the resume file: {e}'}), 422
     except Exception as e:
         print(f"Error in /recommend: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 # Create a single engine instance for route handlers
 ats_engine = ResumeATSEngine()
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Health check with the active scoring model version"""
+    return jsonify({
+        'status': 'healthy',
+        'tfidf_model': ats_engine.tfidf_models.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Operational counters for caches and provider clients"""
+    return jsonify({
+        'job_cache': ats_engine.job_cache.stats() if ats_engine.job_cache else None,
+        'providers': {name: client.stats() for name, client in ats_engine.providers.items()},
+        'retry_scheduler': ats_engine.retry_scheduler.stats(),
+        'keywords': {name: extractor.stats() for name, extractor in ats_engine.keyword_extractors.items()},
+        'resume_cache': ats_engine.resume_cache.stats(),
+        'document_parser': ats_engine.document_parser.stats(),
+        'job_features': ats_engine.job_feature_store.stats(),
+        'job_index': ats_engine.job_index.stats(),
+        'job_snapshot': ats_engine.job_snapshots.stats(),
+        'profile_store': profile_store.stats()
+    })
+
 @app.route('/search_jobs', methods=['GET'])
 def search_jobs():
-    """Search jobs by keyword and location"""
+    """Search jobs by keyword and location (served from the local job index)"""
     try:
         keyword = request.args.get('keyword', 'intern')
         location = request.args.get('location', 'india')
         time_filter = request.args.get('time_filter', 'week')
+        default_page_size = int(os.getenv('SEARCH_PAGE_SIZE', '10'))
+        try:
+            page = max(1, int(request.args.get('page') or 1))
+            page_size = min(100, max(1, int(request.args.get('page_size') or default_page_size)))
+        except ValueError:
+            page, page_size = 1, default_page_size
 
-        # Use the improved internship fetching method
-        jobs = ats_engine.fetch_internships(location=location, keyword=keyword, time_filter=time_filter)
+        hits, total, source = ats_engine.search_jobs(keyword, location, time_filter, page, page_size)
 
         # Format jobs for response
         formatted_jobs = []
-        for job in jobs[:10]:  # Limit to 10 results
+        for job in hits:
             formatted_job = {
-                "title": job.get('title', 'N/A'),
-                "company": job.get('company', {}).get('display_name', 'N/A'),
-                "location": job.get('location', {}).get('display_name', 'N/A'),
-                "description": job.get('description', '')[:200] + '...' if len(job.get('description', '')) > 200 else job.get('description', ''),
-                "apply_link": job.get('redirect_url', '#'),
-                "match_percent": "85%"  # Default match percentage for search results
+                "title": job['title'] or 'N/A',
+                "company": job['company'] or 'N/A',
+                "location": job['location'] or 'N/A',
+                "description": job['description'][:200] + '...' if len(job['description']) > 200 else job['description'],
+                "apply_link": job['apply_link'] or '#',
+                "match_percent": f"{int(round(job['relevance']))}%",
+                "relevance_score": job['score']
             }
             formatted_jobs.append(formatted_job)
 
-        api_status = 'success' if len(formatted_jobs) > 0 else ('demo_mode' if ats_engine.demo_mode else 'no_results')
+        api_status = 'success' if total > 0 else ('demo_mode' if ats_engine.demo_mode else 'no_results')
         return jsonify({
             "jobs": formatted_jobs,
-            "total_results": len(formatted_jobs),
+            "total_results": total,
+            "page": page,
+            "page_size": page_size,
+            "source": source,
             "search_query": f"{keyword} internships in {location}",
             "api_status": api_status
         })
@@ -804,8 +1595,11 @@ def search_jobs():
         print(f"Error in search_jobs: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
-# In-memory profile storage (in production, use a database)
-profiles = {}
+# Profiles persist in SQLite, shared by every worker (see profile_store.py)
+profile_store = ProfileStore(
+    os.getenv('PROFILE_DB_PATH', DEFAULT_PROFILE_DB),
+    cache_size=int(os.getenv('PROFILE_CACHE_SIZE', '10000'))
+)
 
 @app.route('/profile', methods=['POST'])
 def save_profile():
@@ -823,7 +1617,7 @@ def save_profile():
         profile_id = profile_data.get('email', 'default')
         
         # Save profile
-        profiles[profile_id] = {
+        profile = {
             "name": profile_data.get('name', ''),
             "email": profile_data.get('email', ''),
             "phone": profile_data.get('phone', ''),
@@ -837,6 +1631,13 @@ def save_profile():
             "created_at": profile_data.get('created_at', ''),
             "updated_at": profile_data.get('updated_at', '')
         }
+        profile_store.put(profile_id, profile)
+
+        # Bring the stored resume representation up to date (only changed sections are reprocessed)
+        try:
+            ats_engine.profile_resume(profile_id, profile)
+        except Exception as e:
+            print(f"[Profiles] could not refresh the representation of {profile_id}: {e}")
         
         return jsonify({
             "message": "Profile saved successfully",
@@ -852,9 +1653,10 @@ def get_profile():
     """Get user profile"""
     try:
         email = request.args.get('email', 'default')
+        profile = profile_store.get_by_email(email)
         
-        if email in profiles:
-            return jsonify(profiles[email])
+        if profile is not None:
+            return jsonify(profile)
         else:
             return jsonify({"error": "Profile not found"}), 404
             
@@ -866,60 +1668,61 @@ def get_profile():
 def parse_jobs_file(file_storage):
     """Parse uploaded CSV or JSON file containing job listings.
     Expected CSV columns: title,company,location,description,apply_link
-    Expected JSON: list of objects with the same keys.
-    Returns list of job dicts.
+    Expected JSON: list of objects with the same keys (or NDJSON).
+    Returns list of job dicts; /recommend_from_jobs streams with iter_uploaded_jobs instead.
     """
     try:
-        filename = (file_storage.filename or '').lower()
-        content = file_storage.read()
-        # Reset pointer for potential re-read by caller
-        try:
-            file_storage.stream.seek(0)
-        except Exception:
-            pass
-
-        # Try JSON first
-        if filename.endswith('.json') or (content.strip().startswith(b'[') or content.strip().startswith(b'{')):
-            try:
-                data = json.loads(content.decode('utf-8', errors='ignore'))
-                if isinstance(data, dict):
-                    # If single object, wrap into list
-                    data = [data]
-                jobs = []
-                for it in data:
-                    jobs.append({
-                        'title': it.get('title') or it.get('job_title') or it.get('name') or 'Internship',
-                        'company': {'display_name': it.get('company') or it.get('company_name') or ''},
-                        'location': {'display_name': it.get('location') or it.get('city') or ''},
-                        'description': it.get('description') or it.get('job_description') or it.get('summary') or '',
-                        'redirect_url': it.get('apply_link') or it.get('apply_url') or it.get('link') or ''
-                    })
-                return jobs
-            except Exception as e:
-                print(f"Failed to parse JSON jobs file: {e}")
-
-        # Fallback: parse as CSV
-        try:
-            text = content.decode('utf-8', errors='ignore')
-            reader = csv.DictReader(text.splitlines())
-            jobs = []
-            for row in reader:
-                jobs.append({
-                    'title': row.get('title') or row.get('job_title') or row.get('name') or 'Internship',
-                    'company': {'display_name': row.get('company') or row.get('company_name') or ''},
-                    'location': {'display_name': row.get('location') or row.get('city') or ''},
-                    'description': row.get('description') or row.get('job_description') or row.get('summary') or '',
-                    'redirect_url': row.get('apply_link') or row.get('apply_url') or row.get('link') or ''
-                })
-            return jobs
-        except Exception as e:
-            print(f"Failed to parse CSV jobs file: {e}")
-            return []
+        return list(iter_uploaded_jobs(file_storage))
     except Exception as e:
         print(f"Error reading jobs file: {e}")
         return []
 
 
+def ats_status(ats_score):
+    """Human-readable band for an ATS score"""
+    if ats_score >= 80:
+        return 'Excellent'
+    elif ats_score >= 60:
+        return 'Good'
+    elif ats_score >= 40:
+        return 'Fair'
+    return 'Needs Improvement'
+
+
+def format_provider_job(job):
+    """Flatten a provider (Adzuna/RapidAPI/dummy) job into the recommendation shape"""
+    company = job.get('company')
+    location = job.get('location')
+    if isinstance(company, dict):
+        company = company.get('display_name') or ''
+    elif not isinstance(company, str):
+        company = job.get('company_name') or 'Company'
+    if isinstance(location, dict):
+        location = location.get('display_name') or ''
+    else:
+        location = location or job.get('city') or 'Location'
+    return {
+        'title': job.get('title') or job.get('job_title') or job.get('name') or 'Internship',
+        'company': company,
+        'location': location,
+        'description': job.get('description') or job.get('job_description') or job.get('summary') or '',
+        'apply_link': job.get('redirect_url') or job.get('url') or job.get('apply_url') or job.get('link') or '#'
+    }
+
+
+def format_uploaded_job(job):
+    """Flatten a normalized uploaded job into the recommendation shape"""
+    company = job.get('company')
+    location = job.get('location')
+    return {
+        'title': job.get('title') or 'Internship',
+        'company': company.get('display_name') if isinstance(company, dict) else company or 'Company',
+        'location': location.get('display_name') if isinstance(location, dict) else location or 'Location',
+        'description': job.get('description') or '',
+        'apply_link': job.get('redirect_url') or job.get('apply_link') or '#'
+    }
+
+
 @app.route('/recommend_from_jobs', methods=['POST'])
 def recommend_from_jobs():
     """Accepts a resume file and a jobs CSV/JSON file, returns ATS recommendations."""
@@ -932,116 +1735,170 @@ def recommend_from_jobs():
         resume_file = request.files['resume']
         jobs_file = request.files['jobs_file']
 
-        # Read resume text
-        content = resume_file.read()
-        filename = resume_file.filename.lower()
-        if filename.endswith('.pdf'):
-            resume_text = ats_engine.extract_text_from_pdf(content)
-        elif filename.endswith('.docx'):
-            resume_text = ats_engine.extract_text_from_docx(content)
-        else:
-            try:
-                resume_text = content.decode('utf-8', errors='ignore')
-            except:
-                resume_text = ''
-
         # Clean resume text and include education if provided in form
         education = request.form.get('education', '')
         skills = request.form.get('skills', '')
         location = request.form.get('location', '')
         domain = request.form.get('domain', '')
+        keyword_backend = ats_engine.resolve_keyword_backend(request.form.get('keyword_backend'))
+        similarity = ats_engine.resolve_similarity(request.form.get('similarity'))
 
-        resume_text = ats_engine.clean_text(resume_text + ' ' + skills + ' ' + education)
+        # Read resume text (cached by content hash)
+        content = resume_file.read()
+        resume_text, resume_keywords = ats_engine.prepare_resume(
+            content, resume_file.filename, skills, education, keyword_backend
+        )
+
+        # Stream jobs from the upload and score them chunk by chunk; only the
+        # best top_k recommendations and the ATS aggregates stay in memory
+        default_top_k = int(os.getenv('JOBS_FILE_TOP_K', '500'))
+        chunk_size = int(os.getenv('JOBS_FILE_CHUNK_SIZE', '2000'))
+        try:
+            top_k = max(1, int(request.form.get('top_k') or default_top_k))
+        except ValueError:
+            top_k = default_top_k
+        # Domain and location boosts, compiled once and counted in one pass per job
+        boost_matcher = TokenMatcher({
+            'domain': (0, [t.lower() for t in (domain or '').split() if t]),
+            'location': (0, [t.lower() for t in re.split(r'[,\s]+', (location or '').strip()) if t]),
+        })
 
-        # Parse jobs
-        jobs = parse_jobs_file(jobs_file)
-        if not jobs:
+        ats_accumulator = ATSScoreAccumulator(ats_engine, resume_text, keyword_backend, resume_keywords, similarity)
+        top = TopK(top_k)
+        match_jobs = None
+        parsed_count = 0
+        for jobs in chunked(iter_uploaded_jobs(jobs_file), chunk_size):
+            parsed_count += len(jobs)
+            append_corpus_dump(jobs, 'uploads')
+            recs = [format_uploaded_job(job) for job in jobs]
+            ats_engine.job_index.add([dict(rec, posted_at=job.get('created')) for rec, job in zip(recs, jobs)],
+                                     source='upload')
+            features = ats_engine.job_features(recs, keyword_backend=keyword_backend)
+            job_texts = [f['text'] for f in features]
+            job_counts = stacked_counts(features, ats_accumulator.model)
+            ats_accumulator.add(job_texts, [f['keywords'][keyword_backend] for f in features], job_counts)
+            if match_jobs is None:
+                match_jobs = ats_engine.job_matcher(resume_text, job_texts, model=ats_accumulator.model,
+                                                    similarity=ats_accumulator.similarity)
+            boosts = boost_matcher.count([(f['lower_text'],) for f in features])
+            boosts = 25 * boosts['domain'] + 20 * boosts['location']
+            for rec, boost, match in zip(recs, boosts, match_jobs(job_texts, job_counts)):
+                rec['match_percent'] = int(round(match))
+                final_score = rec['match_percent'] + int(boost)
+                if final_score >= 5:
+                    top.push((final_score, rec['match_percent']), rec)
+
+        if not parsed_count:
             return jsonify({'error': 'No jobs parsed from the provided file', 'parsed_count': 0}), 400
 
-        # Reuse existing recommend logic but operate on provided jobs
-        # We'll replicate the core scoring parts here to avoid duplicating HTTP calls
-        # Prepare job_texts and formatted_recs
-        job_texts = []
-        formatted_recs = []
-        for job in jobs:
-            title = job.get('title') or 'Internship'
-            company = (job.get('company', {}) if isinstance(job.get('company', {}), dict) else {}).get('display_name') if isinstance(job.get('company', {}), dict) else job.get('company') if isinstance(job.get('company', str)) else job.get('company_name') if job.get('company_name') else 'Company'
-            location_str = (job.get('location', {}) .get('display_name') ) if isinstance(job.get('location', {}), dict) else job.get('location') or job.get('city') or 'Location'
-            description = job.get('description') or job.get('job_description') or job.get('summary') or ''
-            apply_link = job.get('redirect_url') or job.get('url') or job.get('apply_url') or job.get('link') or job.get('apply_link') or '#'
-            combined = f"{title} {company} {location_str} {description}"
-            job_texts.append(ats_engine.clean_text(combined))
-            formatted_recs.append({
-                'title': title,
-                'company': company,
-                'location': location_str,
-                'description': description,
-                'apply_link': apply_link
-            })
-
-        ats_score, missing_keywords = ats_engine.calculate_ats_score(resume_text, job_texts)
-
-        recs_with_score = []
-        for rec, job_text in zip(formatted_recs, job_texts):
-            match = ats_engine.calculate_job_match(resume_text, job_text)
-            recs_with_score.append({
-                'title': rec['title'],
-                'company': rec['company'],
-                'location': rec['location'],
-                'description': rec['description'],
-                'apply_link': rec['apply_link'],
-                'match_percent': int(round(match))
-            })
-
-        # Simple final scoring: prioritize by match_percent and optionally by location/domain
-        # Apply location/domain boosts if provided
-        domain_tokens = [t.lower() for t in (domain or '').split() if t]
-        loc_tokens = [t.lower() for t in re.split(r'[,\s]+', (location or '').strip()) if t]
-
-        def compute_final_score_local(entry):
-            base = entry.get('match_percent', 0)
-            boost = 0
-            text = (entry.get('title','') + ' ' + entry.get('company','') + ' ' + entry.get('location','') + ' ' + entry.get('description','')).lower()
-            for tok in domain_tokens:
-                if tok and tok in text:
-                    boost += 25
-            for tok in loc_tokens:
-                if tok and tok in text:
-                    boost += 20
-            return base + boost
-
-        for e in recs_with_score:
-            e['final_score'] = int(round(compute_final_score_local(e)))
-
-        recs_with_score = [e for e in recs_with_score if e.get('final_score',0) >= 5]
-        recs_with_score.sort(key=lambda x: (x.get('final_score',0), x.get('match_percent',0)), reverse=True)
-
+        ats_score, missing_keywords = ats_accumulator.result()
+        recs_with_score = top.items()
         for e in recs_with_score:
             e['match_percent'] = f"{int(e.get('match_percent',0))}%"
-            e.pop('final_score', None)
-
-        status = 'Unknown'
-        if ats_score >= 80:
-            status = 'Excellent'
-        elif ats_score >= 60:
-            status = 'Good'
-        elif ats_score >= 40:
-            status = 'Fair'
-        else:
-            status = 'Needs Improvement'
+
+        status = ats_status(ats_score)
 
         return jsonify({
             'ats_score': ats_score,
             'status': status,
             'missing_keywords': missing_keywords,
             'recommendations': recs_with_score,
-            'parsed_count': len(jobs)
+            'keyword_backend': keyword_backend,
+            'similarity': similarity,
+            'parsed_count': parsed_count,
+            'top_k': top_k
         })
 
+    except DocumentParseError as e:
+        print(f"Resume parsing failed in /recommend_from_jobs: {e}")
+        return jsonify({'error': f'Could not read the resume file: {e}'}), 422
     except Exception as e:
         print(f"Error in /recommend_from_jobs: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/score_batch', methods=['POST'])
+def score_batch():
+    """Scores many resumes (repeated 'resumes' files) against one jobs CSV/JSON file,
+    or against the mapped job snapshot when no jobs_file is sent and one is loaded.
+
+    Returns per-resume ATS score, missing keywords and top_k matching jobs,
+    plus throughput in resumes/second.
+    """
+    try:
+        start = time.perf_counter()
+        resume_files = request.files.getlist('resumes')
+        if not resume_files:
+            return jsonify({'error': 'At least one file in resumes is required'}), 400
+        snapshot = None
+        if 'jobs_file' not in request.files:
+            snapshot = ats_engine.job_snapshots.current()
+            if snapshot is None:
+                return jsonify({'error': 'jobs_file (CSV or JSON) is required'}), 400
+        max_resumes = int(os.getenv('BATCH_MAX_RESUMES', '5000'))
+        if len(resume_files) > max_resumes:
+            return jsonify({'error': f'At most {max_resumes} resumes per batch'}), 413
+
+        keyword_backend = ats_engine.resolve_keyword_backend(request.form.get('keyword_backend'))
+        similarity = ats_engine.resolve_similarity(request.form.get('similarity'))
+        try:
+            top_k = max(1, int(request.form.get('top_k') or 10))
+        except ValueError:
+            top_k = 10
+
+        if snapshot is not None:
+            jobs, job_texts = snapshot, None
+            job_set = ats_engine.snapshot_job_set(snapshot, keyword_backend, similarity)
+        else:
+            jobs = [format_uploaded_job(job) for job in iter_uploaded_jobs(request.files['jobs_file'])]
+            if not jobs:
+                return jsonify({'error': 'No jobs parsed from the provided file', 'parsed_count': 0}), 400
+            job_texts = [ats_engine.clean_text(f"{j['title']} {j['company']} {j['location']} {j['description']}") for j in jobs]
+            job_set = None
+
+        # Extract every resume (cached by content hash); unreadable ones are reported, not fatal
+        results = [None] * len(resume_files)
+        positions, resume_texts, resume_keywords = [], [], []
+        for i, resume_file in enumerate(resume_files):
+            try:
+                resume = ats_engine.process_resume(resume_file.read(), resume_file.filename, keyword_backend)
+            except DocumentParseError as e:
+                results[i] = {'filename': resume_file.filename, 'error': f'Could not read the resume file: {e}'}
+                continue
+            positions.append(i)
+            resume_texts.append(resume['cleaned'])
+            resume_keywords.append(resume['keywords'])
+
+        scored, stats = ats_engine.score_resumes(
+            resume_texts, job_texts, top_k=top_k, keyword_backend=keyword_backend, resume_keywords=resume_keywords,
+            similarity=similarity, job_set=job_set
+        )
+        for i, result in zip(positions, scored):
+            results[i] = {
+                'filename': resume_files[i].filename,
+                'ats_score': result['ats_score'],
+                'status': ats_status(result['ats_score']),
+                'missing_keywords': result['missing_keywords'],
+                'top_jobs': [dict(jobs[j], match_percent=f"{int(round(match))}%") for j, match in result['top_jobs']]
+            }
+
+        elapsed = time.perf_counter() - start
+        return jsonify({
+            'results': results,
+            'resume_count': len(resume_files),
+            'job_count': len(jobs),
+            'job_source': f'snapshot:{snapshot.version}' if snapshot is not None else 'upload',
+            'keyword_backend': keyword_backend,
+            'similarity': similarity,
+            'top_k': top_k,
+            'scoring': stats,
+            'elapsed_seconds': round(elapsed, 3),
+            'resumes_per_second': round(len(resume_files) / elapsed, 1) if elapsed > 0 else None
+        })
+
+    except Exception as e:
+        print(f"Error in /score_batch: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 if __name__ == '__main__':
     try:
         print("Starting Flask API server...")
@@ -0,0 +1,265 @@
+"""Offline bulk resume scoring, without the Flask server.
+
+Scores every resume (PDF / DOCX / TXT) under a directory against one jobs
+file (CSV / JSON / NDJSON, the same formats /recommend_from_jobs accepts)
+with ResumeATSEngine.score_resumes, fanned out over a process pool.
+Without --jobs, every worker maps the current job snapshot (job_snapshot.py)
+instead, so the vectorized corpus is held once in the page cache.
+Results are streamed to a CSV or NDJSON file as chunks finish.
+
+Each finished resume is appended to a checkpoint file (<output>.checkpoint)
+after its result row has been flushed, so an interrupted run continues where
+it stopped when started again with the same arguments. A crash between the
+two writes can repeat a row for the chunk that was in flight.
+
+Usage:
+    python bulk_score.py resumes/ --jobs jobs.csv --output scores.csv [--workers 8] [--top-k 5]
+    python bulk_score.py resumes/ --output scores.csv   # against the current job snapshot
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from werkzeug.datastructures import FileStorage
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+CSV_FIELDS = ['file', 'ats_score', 'status', 'missing_keywords', 'top_jobs', 'error']
+
+# Per-process state, set up once by init_worker
+_worker = {}
+
+
+def find_resumes(resume_dir):
+    """Resume paths under resume_dir, relative to it, in a stable order"""
+    found = []
+    for root, dirs, names in os.walk(resume_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(root, name), resume_dir))
+    return found
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def init_worker(jobs_path, top_k, keyword_backend, parse_timeout, similarity=None):
+    """Build the engine and the vectorized job set (fixed TF-IDF space, IVF index for large sets) once per worker;
+    jobs_path None maps the current job snapshot instead
+    """
+    # Importing app already builds its module-level engine; reuse it rather than building a second one
+    from app import ats_engine as engine, format_uploaded_job
+    from document_parser import DocumentParser
+    from job_stream import iter_uploaded_jobs
+    from tfidf_model import fit_corpus_model
+
+    # Parse inline: this process is already a pool worker, and the timeout
+    # still applies because tasks run in its main thread
+    engine.document_parser.close()
+    engine.document_parser = DocumentParser(workers=0, timeout=parse_timeout,
+                                            max_pages=engine.document_parser.max_pages)
+    keyword_backend = engine.resolve_keyword_backend(keyword_backend)
+    if jobs_path is None:
+        snapshot = engine.job_snapshots.current()
+        if snapshot is None:
+            raise RuntimeError(f"No job snapshot in {engine.job_snapshots.snapshot_dir}")
+        job_set = engine.snapshot_job_set(snapshot, keyword_backend, similarity)
+        _worker.update(engine=engine, jobs=snapshot, job_texts=None, job_set=job_set, top_k=top_k,
+                       keyword_backend=keyword_backend)
+        return
+    with open(jobs_path, 'rb') as f:
+        jobs = [format_uploaded_job(job) for job in iter_uploaded_jobs(FileStorage(stream=f, filename=jobs_path))]
+    job_texts = [engine.clean_text(f"{j['title']} {j['company']} {j['location']} {j['description']}") for j in jobs]
+    # Every chunk must be scored in the same space; fitted on the jobs only, so
+    # all workers derive the same one when no corpus model is installed
+    model = engine.tfidf_models.current()
+    if model is None and job_texts:
+        model = fit_corpus_model(job_texts, ngram_range=(1, 1), sublinear_tf=False, version='bulk')
+    job_set = engine.prepare_job_set(job_texts, keyword_backend, model, similarity) if job_texts else None
+    _worker.update(engine=engine, jobs=jobs, job_texts=job_texts, job_set=job_set, top_k=top_k,
+                   keyword_backend=keyword_backend)
+
+
+def score_chunk(resume_dir, names):
+    """Score one chunk of resumes; returns result dicts in the order of names"""
+    from app import ats_status
+    from document_parser import DocumentParseError
+
+    engine = _worker['engine']
+    results, positions, texts, keywords = [None] * len(names), [], [], []
+    for i, name in enumerate(names):
+        try:
+            with open(os.path.join(resume_dir, name), 'rb') as f:
+                resume = engine.process_resume(f.read(), name, _worker['keyword_backend'])
+        except (OSError, DocumentParseError) as e:
+            results[i] = {'file': name, 'error': str(e)}
+            continue
+        if not resume['cleaned']:
+            results[i] = {'file': name, 'error': 'no text could be extracted'}
+            continue
+        positions.append(i)
+        texts.append(resume['cleaned'])
+        keywords.append(resume['keywords'])
+    scored, _ = engine.score_resumes(texts, _worker['job_texts'], top_k=_worker['top_k'],
+                                     keyword_backend=_worker['keyword_backend'], resume_keywords=keywords,
+                                     job_set=_worker['job_set'])
+    jobs = _worker['jobs']
+    for i, result in zip(positions, scored):
+        results[i] = {
+            'file': names[i],
+            'ats_score': result['ats_score'],
+            'status': ats_status(result['ats_score']),
+            'missing_keywords': result['missing_keywords'],
+            'top_jobs': [dict(jobs[j], match_percent=f"{int(round(m))}%") for j, m in result['top_jobs']],
+        }
+    return results
+
+
+class ResultWriter:
+    """Appends result rows to a CSV or NDJSON file"""
+
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if new_file:
+                self._csv.writeheader()
+
+    def write(self, result):
+        if self.fmt == 'ndjson':
+            self._file.write(json.dumps(result) + '\n')
+            return
+        self._csv.writerow({
+            'file': result['file'],
+            'ats_score': result.get('ats_score', ''),
+            'status': result.get('status', ''),
+            'missing_keywords': '; '.join(result.get('missing_keywords', [])),
+            'top_jobs': ' | '.join(f"{j['title']} @ {j['company']} ({j['match_percent']})"
+                                   for j in result.get('top_jobs', [])),
+            'error': result.get('error', ''),
+        })
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class Progress:
+    """Periodic progress line on stderr: done/total, rate and ETA"""
+
+    def __init__(self, total, already_done=0, interval=5.0):
+        self.total = total
+        self.done = already_done
+        self.errors = 0
+        self.interval = interval
+        self._start_done = already_done
+        self._start = self._last = time.monotonic()
+
+    def update(self, count, errors=0, force=False):
+        self.done += count
+        self.errors += errors
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        rate = (self.done - self._start_done) / max(now - self._start, 1e-9)
+        eta = (self.total - self.done) / rate if rate else float('inf')
+        eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta != float('inf') else '?'
+        pct = 100.0 * self.done / self.total if self.total else 100.0
+        print(f"[BulkScore] {self.done}/{self.total} ({pct:.1f}%) {rate:.1f} resumes/s "
+              f"errors={self.errors} ETA {eta_text}", file=sys.stderr, flush=True)
+
+
+def run(resume_dir, jobs_path, output, fmt=None, workers=None, chunk_size=32, top_k=5,
+        keyword_backend=None, checkpoint=None, parse_timeout=15.0, progress_interval=5.0, similarity=None):
+    """Score every resume under resume_dir not yet in the checkpoint; returns the number scored now"""
+    fmt = fmt or ('ndjson' if output.lower().endswith(('.ndjson', '.jsonl')) else 'csv')
+    checkpoint = checkpoint or output + '.checkpoint'
+    names = find_resumes(resume_dir)
+    done = load_checkpoint(checkpoint)
+    pending = [n for n in names if n not in done]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    if done:
+        print(f"[BulkScore] resuming: {len(names) - len(pending)} of {len(names)} already scored", file=sys.stderr)
+
+    progress = Progress(len(names), len(names) - len(pending), progress_interval)
+    writer = ResultWriter(output, fmt)
+    init_args = (jobs_path, top_k, keyword_backend, parse_timeout, similarity)
+
+    def record(results, checkpoint_file):
+        for result in results:
+            writer.write(result)
+        writer.flush()
+        checkpoint_file.write(''.join(r['file'] + '\n' for r in results))
+        checkpoint_file.flush()
+        progress.update(len(results), errors=sum(1 for r in results if 'error' in r))
+
+    try:
+        with open(checkpoint, 'a', encoding='utf-8') as checkpoint_file:
+            if workers == 0:
+                init_worker(*init_args)
+                for chunk in chunks:
+                    record(score_chunk(resume_dir, chunk), checkpoint_file)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=init_args) as pool:
+                    # Bounded number of chunks in flight; results are written as they complete
+                    queue = iter(chunks)
+                    in_flight = set()
+                    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+                    while True:
+                        for chunk in queue:
+                            in_flight.add(pool.submit(score_chunk, resume_dir, chunk))
+                            if len(in_flight) >= max_in_flight:
+                                break
+                        if not in_flight:
+                            break
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record(future.result(), checkpoint_file)
+    finally:
+        writer.close()
+        progress.update(0, force=True)
+    return len(pending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a directory of resumes against a jobs file or job snapshot')
+    parser.add_argument('resume_dir')
+    parser.add_argument('--jobs', default=None, help='jobs CSV / JSON / NDJSON file (default: current job snapshot)')
+    parser.add_argument('--output', required=True, help='results file (.csv or .ndjson)')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='0 scores in this process')
+    parser.add_argument('--chunk-size', type=int, default=32, help='resumes per task')
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--keyword-backend', default=None)
+    parser.add_argument('--similarity', choices=['tfidf', 'lsa'], default=None,
+                        help='lsa needs a corpus model built with --lsa-components')
+    parser.add_argument('--checkpoint', default=None, help='default: <output>.checkpoint')
+    parser.add_argument('--parse-timeout', type=float, default=float(os.getenv('PARSER_TIMEOUT', '15')))
+    parser.add_argument('--progress-interval', type=float, default=5.0, help='seconds between progress lines')
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    scored = run(args.resume_dir, args.jobs, args.output, fmt=args.format, workers=args.workers,
+                 chunk_size=args.chunk_size, top_k=args.top_k, keyword_backend=args.keyword_backend,
+                 checkpoint=args.checkpoint, parse_timeout=args.parse_timeout,
+                 progress_interval=args.progress_interval, similarity=args.similarity)
+    print(f"Scored {scored} resumes in {time.monotonic() - start:.1f}s -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
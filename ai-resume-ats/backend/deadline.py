@@ -0,0 +1,70 @@
+"""Per-request latency budget for /recommend.
+
+A Deadline is created when a request arrives, from the client's budget_ms
+(capped by RECOMMEND_MAX_BUDGET_MS) or the server default
+RECOMMEND_BUDGET_MS, and is handed to every stage of the request: resume
+parsing, the search_trace loop, provider fetches and scoring. Before
+expensive work a stage checks remaining() and, when the budget is short,
+takes a cheaper path (a shorter timeout, cached or locally indexed jobs,
+fewer provider probes, fewer jobs scored) and records it with degrade().
+The degraded stages are returned in the response.
+
+Provider threads may outlive the request, so degrade() is thread-safe.
+"""
+
+import threading
+import time
+
+
+def parse_budget_ms(value, default_ms, max_ms):
+    """Budget in milliseconds from a request field: default_ms when missing or invalid, at most max_ms"""
+    try:
+        budget = int(float(value)) if value not in (None, '') else default_ms
+    except (TypeError, ValueError):
+        budget = default_ms
+    return max(1, min(budget, max_ms))
+
+
+class Deadline:
+    """Wall-clock budget of one request"""
+
+    def __init__(self, budget_seconds, clock=time.monotonic):
+        self.budget = budget_seconds
+        self._clock = clock
+        self._start = clock()
+        self.expires_at = self._start + budget_seconds
+        self._lock = threading.Lock()
+        self.degraded = []
+
+    def elapsed(self):
+        return self._clock() - self._start
+
+    def remaining(self):
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def allows(self, seconds):
+        """True if at least seconds of the budget are left"""
+        return self.remaining() >= seconds
+
+    def cap(self, seconds):
+        """seconds, shortened to what is left of the budget"""
+        return min(seconds, self.remaining())
+
+    def degrade(self, stage, reason):
+        """Record that stage took a cheaper path to stay within the budget"""
+        print(f"[Deadline] {stage} degraded after {self.elapsed() * 1000:.0f}ms: {reason}")
+        with self._lock:
+            self.degraded.append({'stage': stage, 'reason': reason, 'at_ms': round(self.elapsed() * 1000, 1)})
+
+    def to_dict(self):
+        with self._lock:
+            degraded = list(self.degraded)
+        return {
+            'budget_ms': round(self.budget * 1000),
+            'elapsed_ms': round(self.elapsed() * 1000, 1),
+            'remaining_ms': round(self.remaining() * 1000, 1),
+            'degraded': degraded,
+        }
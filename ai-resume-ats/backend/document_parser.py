@@ -0,0 +1,246 @@
+"""Out-of-process PDF/DOCX text extraction.
+
+PyPDF2 and python-docx are pure Python: parsing a large or malformed upload
+holds the GIL and stalls every other thread of the worker. DocumentParser
+runs extraction in a small process pool instead, with a wall-clock timeout
+per document and a cap on the number of PDF pages read. A document that
+overruns its timeout has its worker processes killed and the pool is
+rebuilt, so one pathological file cannot hang the request or the pool.
+Parses that were queued on the killed pool are resubmitted to the new one.
+
+The timeout counts execution only, not time queued behind other parses:
+workers report when they pick a task up, and a watchdog thread per pool
+resets it only when a running task overruns. A burst of uploads therefore
+waits its turn instead of timing out and killing the parses ahead of it.
+
+A caller may wait for less than the timeout (what is left of its request
+budget). When that shorter wait runs out, the caller gives up on the result
+(DocumentParseAbandoned) but the pool is left alone: the parse did not
+overrun, and resetting would kill other users' parses.
+
+With workers=0 extraction runs inline. The timeout then only applies in
+the main thread of a process (via SIGALRM), which is how the offline bulk
+scorer's pool workers parse.
+"""
+
+import itertools
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import PyPDF2
+from docx import Document
+
+
+class DocumentParseError(ValueError):
+    """The document could not be parsed"""
+
+
+class DocumentParseTimeout(DocumentParseError):
+    """Parsing took longer than the configured timeout"""
+
+
+class DocumentParseAbandoned(DocumentParseTimeout):
+    """The caller's own (shorter) budget ran out before the parse finished"""
+
+
+def extract_pdf_text(content, max_pages=None):
+    """Text of the first max_pages pages of a PDF ('' when unreadable)"""
+    try:
+        reader = PyPDF2.PdfReader(BytesIO(content))
+        parts = []
+        for i, page in enumerate(reader.pages):
+            if max_pages and i >= max_pages:
+                print(f"[DocumentParser] PDF has more than {max_pages} pages; ignoring the rest")
+                break
+            parts.append(page.extract_text() or '')
+        return '\n'.join(parts).strip()
+    except DocumentParseError:
+        raise  # an inline timeout (SIGALRM) is not an unreadable document
+    except Exception as e:
+        print(f"Error extracting PDF text: {e}")
+        return ""
+
+
+def extract_docx_text(content, max_pages=None):
+    """Paragraph text of a DOCX ('' when unreadable); DOCX has no page count to cap"""
+    try:
+        doc = Document(BytesIO(content))
+        return '\n'.join(p.text for p in doc.paragraphs).strip()
+    except DocumentParseError:
+        raise
+    except Exception as e:
+        print(f"Error extracting DOCX text: {e}")
+        return ""
+
+
+EXTRACTORS = {'pdf': extract_pdf_text, 'docx': extract_docx_text}
+
+# In pool workers: queue on which each task's start is reported to the parent's watchdog
+_started_queue = None
+
+
+def _init_worker(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _run_task(task_id, func, *args):
+    _started_queue.put(task_id)
+    return func(*args)
+
+
+class DocumentParser:
+    """Bounded process pool for document text extraction"""
+
+    def __init__(self, workers=2, timeout=15.0, max_pages=50):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self._executor = None
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._tasks = {}  # task id -> {'executor', 'started' (monotonic, once running), 'overrun'}
+        self.counters = {'parsed': 0, 'timeouts': 0, 'abandoned': 0, 'pool_restarts': 0, 'errors': 0}
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                started_queue = multiprocessing.Queue()
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                     initargs=(started_queue,))
+                threading.Thread(target=self._watch, args=(self._executor, started_queue),
+                                 name='document-parser-watchdog', daemon=True).start()
+            return self._executor
+
+    def _watch(self, executor, started_queue):
+        """Record task start times and reset the pool when a running task overruns self.timeout"""
+        poll = min(0.05, self.timeout / 10) if self.timeout else 0.05
+        while True:
+            try:
+                task_id = started_queue.get(timeout=poll)
+                with self._lock:
+                    if task_id in self._tasks:
+                        self._tasks[task_id]['started'] = time.monotonic()
+            except queue.Empty:
+                pass
+            except (EOFError, OSError):
+                return
+            now = time.monotonic()
+            with self._lock:
+                if self._executor is not executor:
+                    return
+                overrun = [task for task in self._tasks.values() if task['executor'] is executor
+                           and task['started'] is not None and self.timeout and now - task['started'] > self.timeout]
+                for task in overrun:
+                    task['overrun'] = True
+                self.counters['timeouts'] += len(overrun)
+            if overrun:
+                self._reset_pool(executor)
+                return
+
+    def _reset_pool(self, executor):
+        """Kill the pool's workers (a timed-out parse cannot be cancelled otherwise)"""
+        with self._lock:
+            if self._executor is not executor:
+                return  # another thread already replaced it
+            self._executor = None
+            self.counters['pool_restarts'] += 1
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _forget(self, task_id):
+        with self._lock:
+            self._tasks.pop(task_id, None)
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _run_inline(self, func, *args, timeout=None, budget_bound=False):
+        if not (timeout and hasattr(signal, 'setitimer')
+                and threading.current_thread() is threading.main_thread()):
+            return func(*args)
+
+        def on_alarm(signum, frame):
+            if budget_bound:
+                raise DocumentParseAbandoned(f"document parsing ran out of the caller's {timeout:g}s budget")
+            raise DocumentParseTimeout(f"document parsing exceeded {timeout:g}s")
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return func(*args)
+        except DocumentParseTimeout:
+            self._count('timeouts')
+            raise
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def run(self, func, *args, timeout=None):
+        """func(*args) in the pool, bounded by self.timeout; timeout: the caller's (shorter) wait budget"""
+        budget_bound = timeout is not None and (not self.timeout or timeout < self.timeout)
+        if not budget_bound:
+            timeout = self.timeout
+        if not self.workers:
+            return self._run_inline(func, *args, timeout=timeout, budget_bound=budget_bound)
+        for attempt in range(2):
+            executor = self._pool()
+            task_id = next(self._task_ids)
+            task = {'executor': executor, 'started': None, 'overrun': False}
+            with self._lock:
+                self._tasks[task_id] = task
+            try:
+                future = executor.submit(_run_task, task_id, func, *args)
+            except (BrokenProcessPool, RuntimeError):
+                future = None  # the pool was reset (or shut down) since _pool() returned it
+            if future is not None:
+                future.add_done_callback(lambda _, task_id=task_id: self._forget(task_id))
+                try:
+                    # Without a caller budget, wait for the watchdog to stop an overrunning parse
+                    return future.result(timeout=timeout if budget_bound else None)
+                except FutureTimeout:
+                    # The caller ran out of time, not the parse: leave the shared pool alone
+                    future.cancel()
+                    self._count('abandoned')
+                    raise DocumentParseAbandoned(f"document parsing ran out of the caller's {timeout:g}s budget")
+                except (BrokenProcessPool, CancelledError):
+                    # Cancelled: still queued when another document's overrun reset the pool
+                    if task['overrun']:
+                        raise DocumentParseTimeout(f"document parsing exceeded {self.timeout:g}s")
+            else:
+                self._forget(task_id)
+            # Killed under us by another document's timeout (or a crashed worker): retry once
+            self._reset_pool(executor)
+            if attempt:
+                self._count('errors')
+                raise DocumentParseError("document parser worker crashed")
+
+    def parse(self, content, kind, timeout=None):
+        """Text of a 'pdf' or 'docx' document; raises DocumentParseTimeout on overrun"""
+        text = self.run(EXTRACTORS[kind], content, self.max_pages, timeout=timeout)
+        self._count('parsed')
+        return text
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats.update(workers=self.workers, timeout=self.timeout, max_pages=self.max_pages)
+        return stats
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
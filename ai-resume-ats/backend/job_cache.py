@@ -0,0 +1,320 @@
+"""TTL + LRU response cache for provider job searches.
+
+Sits in front of ResumeATSEngine.fetch_internships. Entries are keyed by
+(location, keyword, time_filter), bounded by an in-process LRU, and expire
+after a per-time_filter TTL. Expired entries are still served for a stale
+window while a background thread refreshes them. An optional shared backend
+(SQLite or a directory of JSON files) lets every gunicorn worker reuse the
+same provider responses.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Fresh lifetime per time_filter, in seconds. Shorter windows change faster.
+DEFAULT_TTLS = {
+    '24h': 15 * 60,
+    'day': 15 * 60,
+    'week': 60 * 60,
+    'month': 6 * 60 * 60,
+}
+
+
+def make_cache_key(location, keyword, time_filter):
+    """Normalized (location, keyword, time_filter) cache key string"""
+    norm = lambda v: ' '.join(str(v or '').lower().split())
+    return f"{norm(location)}|{norm(keyword)}|{norm(time_filter)}"
+
+
+class Uncached:
+    """A fetch_fn result to hand to the caller but not cache (e.g. a fetch cut short by a deadline)"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class SQLiteCacheBackend:
+    """Shared cache tier stored in a SQLite database (WAL mode).
+
+    Each thread gets its own connection; SQLite handles cross-process locking.
+    """
+
+    def __init__(self, path, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL, ttl REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_cache_fetched ON job_cache(fetched_at)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value, fetched_at, ttl FROM job_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, key, value, fetched_at, ttl):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO job_cache (key, value, fetched_at, ttl) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), fetched_at, ttl)
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            # Keep only the newest max_entries rows
+            conn.execute(
+                "DELETE FROM job_cache WHERE key NOT IN "
+                "(SELECT key FROM job_cache ORDER BY fetched_at DESC LIMIT ?)", (self.max_entries,)
+            )
+        conn.commit()
+
+    def delete(self, key):
+        conn = self._conn()
+        conn.execute("DELETE FROM job_cache WHERE key = ?", (key,))
+        conn.commit()
+
+
+class FileCacheBackend:
+    """Shared cache tier stored as one JSON file per key in a directory"""
+
+    def __init__(self, directory, max_entries=5000):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if data.get('key') != key:
+            return None
+        return data['value'], data['fetched_at'], data['ttl']
+
+    def set(self, key, value, fetched_at, ttl):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'value': value, 'fetched_at': fetched_at, 'ttl': ttl}, f)
+        os.replace(tmp, path)
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._prune()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _prune(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def backend_from_url(url, max_entries=5000):
+    """Build a shared backend from 'sqlite:<path>' or 'file:<dir>'; None when empty"""
+    if not url:
+        return None
+    scheme, _, location = url.partition(':')
+    if scheme == 'sqlite' and location:
+        return SQLiteCacheBackend(location, max_entries=max_entries)
+    if scheme == 'file' and location:
+        return FileCacheBackend(location, max_entries=max_entries)
+    raise ValueError(f"Unsupported job cache backend: {url!r} (use sqlite:<path> or file:<dir>)")
+
+
+class JobSearchCache:
+    """Bounded LRU with per-time_filter TTL and stale-while-revalidate.
+
+    get_or_fetch(key, fetch_fn, time_filter) returns a cached value when fresh,
+    returns a stale value and refreshes it in the background when it expired
+    less than stale_ttl seconds ago (an empty refresh leaves it in place), and
+    otherwise calls fetch_fn inline.
+    Values for which is_negative(value) is true (e.g. empty results) are kept
+    only for negative_ttl seconds. A fetch_fn that returns Uncached(value) has
+    value returned but not stored, and a refresh that does so keeps the entry.
+    """
+
+    def __init__(self, max_entries=512, ttls=None, stale_ttl=3600, negative_ttl=60,
+                 backend=None, is_negative=None):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.backend = backend
+        self.is_negative = is_negative or (lambda value: not value)
+        self._entries = OrderedDict()  # key -> (value, fetched_at, ttl)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._counters = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'shared_hits': 0,
+            'refreshes': 0, 'refresh_errors': 0, 'refresh_empty': 0, 'evictions': 0, 'backend_errors': 0, 'peek_hits': 0,
+            'uncached': 0,
+        }
+
+    def ttl_for(self, time_filter):
+        return self.ttls.get(time_filter, self.ttls['week'])
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _lookup(self, key):
+        with self._lock:
+            local = self._entries.get(key)
+            if local is not None:
+                self._entries.move_to_end(key)
+        # Expired local entries may already have been refreshed by another worker
+        if self.backend is None or (local is not None and time.time() - local[1] < local[2]):
+            return local, False
+        try:
+            shared = self.backend.get(key)
+        except Exception as e:
+            print(f"[JobCache] shared backend read failed: {e}")
+            self._count('backend_errors')
+            return local, False
+        if shared is None or (local is not None and shared[1] <= local[1]):
+            return local, False
+        self._store_local(key, shared)
+        return shared, True
+
+    def _store_local(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def put(self, key, value, time_filter):
+        ttl = self.negative_ttl if self.is_negative(value) else self.ttl_for(time_filter)
+        entry = (value, time.time(), ttl)
+        self._store_local(key, entry)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, *entry)
+            except Exception as e:
+                print(f"[JobCache] shared backend write failed: {e}")
+                self._count('backend_errors')
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            try:
+                self.backend.delete(key)
+            except Exception as e:
+                print(f"[JobCache] shared backend delete failed: {e}")
+                self._count('backend_errors')
+
+    def _refresh_in_background(self, key, fetch_fn, time_filter):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                value = fetch_fn()
+                if isinstance(value, Uncached):
+                    self._count('uncached')
+                elif self.is_negative(value):
+                    # A failed or empty refresh keeps serving the stale (good) entry
+                    self._count('refresh_empty')
+                else:
+                    self.put(key, value, time_filter)
+                    self._count('refreshes')
+            except Exception as e:
+                print(f"[JobCache] background refresh failed for '{key}': {e}")
+                self._count('refresh_errors')
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="job-cache-refresh", daemon=True).start()
+
+    def peek(self, key):
+        """Cached value of any age (never fetches), or None; for callers out of time for a provider call"""
+        entry, _ = self._lookup(key)
+        if entry is None or self.is_negative(entry[0]):
+            return None
+        self._count('peek_hits')
+        return entry[0]
+
+    def get_or_fetch(self, key, fetch_fn, time_filter='week', refresh_fn=None):
+        """Cached value for key, else fetch_fn(); refresh_fn (default fetch_fn) refreshes stale entries
+        in the background, after the caller has returned
+        """
+        entry, from_shared = self._lookup(key)
+        if entry is not None:
+            value, fetched_at, ttl = entry
+            age = time.time() - fetched_at
+            if age < ttl:
+                self._count('shared_hits' if from_shared else 'hits')
+                return value
+            if age < ttl + self.stale_ttl and not self.is_negative(value):
+                self._count('stale_hits')
+                self._refresh_in_background(key, refresh_fn or fetch_fn, time_filter)
+                return value
+        self._count('misses')
+        value = fetch_fn()
+        if isinstance(value, Uncached):
+            self._count('uncached')
+            return value.value
+        self.put(key, value, time_filter)
+        return value
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['refreshing'] = len(self._refreshing)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 3) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttls'] = dict(self.ttls)
+        stats['backend'] = type(self.backend).__name__ if self.backend else None
+        return stats
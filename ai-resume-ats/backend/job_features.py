@@ -0,0 +1,116 @@
+"""Per-job feature store.
+
+The same internships come back from providers on request after request.
+Instead of re-running clean_text, keyword extraction and TF-IDF counting on
+them every time, ResumeATSEngine.job_features computes them once per job and
+keeps them here under a stable job ID: a hash of the provider dedupe key
+(title, company, location) plus the description.
+
+An entry is a dict with
+    'text'          clean_text of "title company location description"
+    'lower_text'    the same string lowercased (for substring boosts)
+    'keywords'      {keyword backend: keyword list}, filled per backend on demand
+    'counts'        1 x V sparse term counts under the corpus model (or None)
+    'embedding'     float32 LSA vector under the corpus model (or None)
+    'model_version' corpus model version 'counts' and 'embedding' belong to
+
+Entries expire after the TTL of the provider results they came from (see
+JobSearchCache.ttl_for) and the store is a bounded LRU.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def dedupe_key(title, company, location):
+    """Key under which provider results are considered the same job"""
+    return (str(title or '').strip().lower(), str(company or '').strip().lower(),
+            str(location or '').strip().lower())
+
+
+def merge_provider_jobs(job_lists):
+    """Concatenate raw provider job lists, dropping later duplicates by dedupe_key"""
+    merged, seen = [], set()
+    for jobs in job_lists:
+        for job in jobs or []:
+            company, location = job.get('company'), job.get('location')
+            key = dedupe_key(job.get('title'),
+                             company.get('display_name') if isinstance(company, dict) else company,
+                             location.get('display_name') if isinstance(location, dict) else location)
+            if key not in seen:
+                seen.add(key)
+                merged.append(job)
+    return merged
+
+
+def job_id(title, company, location, description):
+    """Stable ID of a job: SHA-1 of its dedupe key plus description"""
+    raw = '\x1f'.join(dedupe_key(title, company, location) + (str(description or ''),))
+    return hashlib.sha1(raw.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def stacked_counts(features, model):
+    """Term count matrix of features under model, or None if any entry lacks current counts"""
+    if model is None or not features or any(f['model_version'] != model.version for f in features):
+        return None
+    return sp.vstack([f['counts'] for f in features]).tocsr()
+
+
+def stacked_embeddings(features, model):
+    """Contiguous n x d float32 LSA matrix of features under model, or None if unavailable"""
+    if model is None or not model.has_lsa or not features or \
+            any(f['model_version'] != model.version or f.get('embedding') is None for f in features):
+        return None
+    return np.ascontiguousarray(np.vstack([f['embedding'] for f in features]), dtype=np.float32)
+
+
+class JobFeatureStore:
+    """Bounded LRU of job feature entries with per-entry expiry"""
+
+    def __init__(self, max_entries=20000, default_ttl=3600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # job id -> (entry, expires_at)
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[1] <= now:
+                del self._entries[key]
+                self.counters['expired'] += 1
+                item = None
+            if item is None:
+                self.counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return item[0]
+
+    def put(self, key, entry, ttl=None):
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            self._entries[key] = (entry, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        return stats
@@ -0,0 +1,320 @@
+"""Local searchable job index behind /search_jobs.
+
+Every job the service sees is added here: provider pulls (request-time
+fetches, background retries and the optional periodic refresh), uploaded
+jobs files and the internships.json snapshot. /search_jobs answers from the
+index and only calls the live providers when it has nothing that matches.
+
+The index is an in-memory inverted index with BM25 scoring over the title,
+company, location and description fields (title weighted highest), plus
+
+  * a location field index: location tokens of the job, of configured
+    aliases (city -> region) and of the provider query that returned it (a
+    job Adzuna returned for "india" is in India even when its location
+    reads "Pune, Maharashtra")
+  * a posting time per job for the time_filter values (24h / week / month).
+    Provider dates are used when present. Otherwise a job's age is only
+    known to be at most the window of the pull that returned it (a week-old
+    pull never satisfies a 24h filter) and at least the time since it was
+    first seen. Undated uploads and snapshot jobs have no known age and
+    match no time filter (until a provider pull returns them).
+
+Beyond max_docs the oldest documents are dropped, but uploads and snapshot
+jobs only ever push out other uploads and snapshot jobs: a large jobs file
+cannot evict the provider-pulled jobs.
+
+Scores are reported as a percentage of the best BM25 score the query could
+reach (every query term saturated in the title).
+"""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from job_features import job_id
+
+TIME_FILTER_SECONDS = {
+    '24h': 24 * 3600,
+    'day': 24 * 3600,
+    'week': 7 * 24 * 3600,
+    'month': 30 * 24 * 3600,
+}
+FIELD_WEIGHTS = {'title': 3.0, 'company': 1.5, 'location': 1.0, 'description': 1.0, 'query': 0.5}
+STOP_WORDS = frozenset('a an and at for from in of on or the to with'.split())
+POSTED_AT_FIELDS = ('posted_at', 'created', 'date_posted', 'created_at', 'datePosted', 'date')
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def tokenize(text):
+    """Lowercase word tokens (keeps 'c++', 'c#', 'node.js'), stop words dropped"""
+    tokens = (t.rstrip('.') for t in _TOKEN_RE.findall(str(text or '').lower()))
+    return [t for t in tokens if t and t not in STOP_WORDS]
+
+
+def parse_posted_at(value):
+    """Epoch seconds from an ISO-8601 string or a number (seconds or ms), else None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) / 1000.0 if value > 1e11 else float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class JobIndex:
+    """Thread-safe BM25 inverted index over flattened jobs.
+
+    Jobs are dicts with title, company, location, description and apply_link
+    (format_provider_job's shape) and optionally a posting date under one of
+    POSTED_AT_FIELDS. Documents are deduplicated by job_features.job_id; the
+    oldest documents are dropped beyond max_docs (for a non-provider add, the
+    oldest non-provider documents).
+    """
+
+    def __init__(self, max_docs=100000, k1=1.2, b=0.75, location_aliases=None):
+        self.max_docs = max_docs
+        self.location_aliases = location_aliases or {}
+        self.k1 = k1
+        self.b = b
+        self._docs = OrderedDict()  # doc id -> document, oldest first
+        self._unpulled = OrderedDict()  # doc ids of non-provider documents, oldest first
+        self._postings = {}  # term -> {doc id: weighted term frequency}
+        self._locations = {}  # location token -> set of doc ids
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+        self.counters = {'added': 0, 'updated': 0, 'evicted': 0, 'searches': 0, 'misses': 0}
+
+    def add(self, jobs, source='provider', query=None, location=None, time_filter=None, now=None):
+        """Index jobs; returns how many were new.
+
+        query / location are the provider query that returned the jobs (the
+        query terms are indexed with a low weight, the location as a location
+        field value). time_filter is the window the pull was restricted to.
+        """
+        now = time.time() if now is None else now
+        window = TIME_FILTER_SECONDS.get(time_filter, 0) if source == 'provider' else 0
+        query_tokens = tokenize(query)
+        hint_locations = set(tokenize(location))
+        added = 0
+        with self._lock:
+            for job in jobs:
+                key = job_id(job.get('title'), job.get('company'), job.get('location'), job.get('description'))
+                doc = self._docs.get(key)
+                if doc is not None:
+                    self._refresh(key, doc, job, source, window, hint_locations, now)
+                    continue
+                self._insert(key, job, source, window, query_tokens, hint_locations, now)
+                added += 1
+            # Uploads and snapshot jobs make room among themselves (this batch's included), never among provider jobs
+            evictable = self._docs if source == 'provider' else self._unpulled
+            while len(self._docs) > self.max_docs and evictable:
+                self._remove(next(iter(evictable)))
+                self.counters['evicted'] += 1
+        return added
+
+    def _posted_at(self, job):
+        for field in POSTED_AT_FIELDS:
+            posted_at = parse_posted_at(job.get(field))
+            if posted_at is not None:
+                return posted_at
+        return None
+
+    def _insert(self, key, job, source, window, query_tokens, hint_locations, now):
+        weights = {}
+        for field in ('title', 'company', 'location', 'description'):
+            for token in tokenize(job.get(field)):
+                weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS[field]
+        for token in query_tokens:
+            weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS['query']
+        locations = set(tokenize(job.get('location')))
+        for token in list(locations):
+            locations.update(self.location_aliases.get(token, ()))
+        locations |= hint_locations
+        doc = {
+            'job': {field: job.get(field) or '' for field in ('title', 'company', 'location', 'description', 'apply_link')},
+            'terms': weights,
+            'length': sum(weights.values()),
+            'locations': locations,
+            'posted_at': self._posted_at(job),
+            'window': window,
+            'first_seen': now,
+            'source': source,
+        }
+        self._docs[key] = doc
+        if source != 'provider':
+            self._unpulled[key] = None
+        self._total_length += doc['length']
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[key] = weight
+        for token in locations:
+            self._locations.setdefault(token, set()).add(key)
+        self.counters['added'] += 1
+
+    def _refresh(self, key, doc, job, source, window, hint_locations, now):
+        """A job seen again: tighten what is known about its age and locations"""
+        if doc['posted_at'] is None:
+            doc['posted_at'] = self._posted_at(job)
+        if source == 'provider' and doc['source'] != 'provider':
+            # An undated upload/snapshot job returned by a provider pull: its age is now bounded
+            doc.update(source='provider', window=window, first_seen=now)
+            self._unpulled.pop(key, None)
+        else:
+            doc['window'] = min(doc['window'], window) if doc['window'] and window else 0
+        for token in hint_locations - doc['locations']:
+            doc['locations'].add(token)
+            self._locations.setdefault(token, set()).add(key)
+        self._docs.move_to_end(key)
+        if key in self._unpulled:
+            self._unpulled.move_to_end(key)
+        self.counters['updated'] += 1
+
+    def _remove(self, key):
+        doc = self._docs.pop(key)
+        self._unpulled.pop(key, None)
+        self._total_length -= doc['length']
+        for term in doc['terms']:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        for token in doc['locations']:
+            keys = self._locations[token]
+            keys.discard(key)
+            if not keys:
+                del self._locations[token]
+
+    def _within(self, doc, max_age, now):
+        if doc['posted_at'] is not None:
+            return now - doc['posted_at'] <= max_age
+        if doc['source'] != 'provider':
+            return False  # undated upload or snapshot job: its age is unknown
+        return doc['window'] <= max_age and now - doc['first_seen'] <= max_age
+
+    def _candidates(self, terms, location):
+        """Doc ids matching any query term (all docs for an empty query) and every location token"""
+        if terms:
+            candidates = set()
+            for term in terms:
+                candidates.update(self._postings.get(term, ()))
+        else:
+            candidates = set(self._docs)
+        for token in tokenize(location):
+            candidates &= self._locations.get(token, set())
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query='', location=None, time_filter=None, page=1, page_size=10, now=None):
+        """(hits, total): one page of matches, best first, and the number of matches.
+
+        Each hit is the stored job plus 'score' (BM25), 'relevance' (0-100) and
+        'source' (where the job was indexed from).
+        Ties, and queries without terms, are ordered newest first.
+        """
+        now = time.time() if now is None else now
+        terms = list(dict.fromkeys(tokenize(query)))
+        max_age = TIME_FILTER_SECONDS.get(time_filter)
+        with self._lock:
+            self.counters['searches'] += 1
+            candidates = self._candidates(terms, location)
+            if max_age is not None:
+                candidates = [key for key in candidates if self._within(self._docs[key], max_age, now)]
+            n = len(self._docs)
+            avg_length = self._total_length / n if n else 0.0
+            idf = {term: math.log(1 + (n - len(self._postings.get(term, ())) + 0.5)
+                                  / (len(self._postings.get(term, ())) + 0.5)) for term in terms}
+            # Score of a document that has every query term in its title, at average length
+            saturated = FIELD_WEIGHTS['title'] * (self.k1 + 1) / (FIELD_WEIGHTS['title'] + self.k1)
+            best_possible = sum(idf.values()) * saturated
+            scored = []
+            for key in candidates:
+                doc = self._docs[key]
+                norm = self.k1 * (1 - self.b + self.b * doc['length'] / avg_length) if avg_length else self.k1
+                score = 0.0
+                for term in terms:
+                    tf = doc['terms'].get(term)
+                    if tf:
+                        score += idf[term] * tf * (self.k1 + 1) / (tf + norm)
+                scored.append((score, doc['posted_at'] or doc['first_seen'], key))
+            scored.sort(reverse=True)
+            total = len(scored)
+            if not total:
+                self.counters['misses'] += 1
+            start = max(page - 1, 0) * page_size
+            hits = []
+            for score, _, key in scored[start:start + page_size]:
+                relevance = min(100.0, 100.0 * score / best_possible) if best_possible else 0.0
+                doc = self._docs[key]
+                hits.append(dict(doc['job'], score=round(score, 4), relevance=round(relevance, 1), source=doc['source']))
+        return hits, total
+
+    def __len__(self):
+        return len(self._docs)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats.update(documents=len(self._docs), terms=len(self._postings),
+                         locations=len(self._locations), max_docs=self.max_docs)
+            sources = {}
+            for doc in self._docs.values():
+                sources[doc['source']] = sources.get(doc['source'], 0) + 1
+        stats['sources'] = sources
+        return stats
+
+
+class JobIndexRefresher:
+    """Background thread that re-runs a fixed list of provider queries every interval seconds.
+
+    fetch(location, keyword, time_filter) is expected to index what it gets
+    (ResumeATSEngine.fetch_internships does).
+    """
+
+    def __init__(self, fetch, queries, interval):
+        self.fetch = fetch
+        self.queries = list(queries)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.counters = {'runs': 0, 'failures': 0}
+
+    def start(self):
+        if self._thread is None and self.queries and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name='job-index-refresh', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            for keyword, location, time_filter in self.queries:
+                try:
+                    self.fetch(location=location, keyword=keyword, time_filter=time_filter)
+                    self.counters['runs'] += 1
+                except Exception as e:
+                    self.counters['failures'] += 1
+                    print(f"[JobIndex] refresh of '{keyword}' in '{location}' failed: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+def parse_refresh_queries(spec):
+    """'keyword@location[@time_filter]; ...' -> [(keyword, location, time_filter)]"""
+    queries = []
+    for item in (spec or '').split(';'):
+        parts = [p.strip() for p in item.split('@')]
+        if not parts[0]:
+            continue
+        location = parts[1] if len(parts) > 1 else ''
+        time_filter = parts[2] if len(parts) > 2 and parts[2] else 'week'
+        queries.append((parts[0], location, time_filter))
+    return queries
@@ -0,0 +1,307 @@
+"""Memory-mapped job corpus snapshots shared by every worker process.
+
+Each gunicorn worker (Procfile: gunicorn app:app) is its own process, so a
+job matrix built in memory is held once per worker. A snapshot instead
+stores the vectorized job corpus as flat files that every worker maps
+read-only; the OS keeps one copy of the pages in its page cache for all of
+them.
+
+A snapshot is a directory <snapshot_dir>/<version>/ holding
+    meta.json                 version, corpus model version, counts, shape,
+                              required skills per keyword backend
+    data/indices/indptr.npy   CSR arrays of the L2-normalized TF-IDF rows
+    term_totals.npy           summed term counts (the combined job text)
+    embeddings.npy            float32 LSA vectors, when the model has LSA
+    centroids.npy,
+    ivf_offsets.npy           IVF quantizer, when built for a large corpus;
+                              the jobs are then stored grouped by cluster
+    <field>.bin/.offsets.npy  UTF-8 text of each job field, concatenated,
+                              with an int64 offsets table (n + 1 entries)
+
+Builds write the new version next to the old ones and then replace the
+CURRENT pointer with os.replace, so workers pick the new snapshot up on
+their next check without a reload, and requests still holding the old one
+keep reading its (unchanged) files.
+
+Build a snapshot (uses the active corpus TF-IDF model):
+    python job_snapshot.py build --jobs ../frontend/public/internships.json --jobs corpus/
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import scipy.sparse as sp
+
+from ann_index import IVFIndex
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+CURRENT_POINTER = 'CURRENT'
+SNAPSHOT_FORMAT = 1
+TEXT_FIELDS = ('title', 'company', 'location', 'description', 'apply_link')
+
+
+def _save(directory, name, array):
+    with open(os.path.join(directory, name), 'wb') as f:
+        np.save(f, array)
+
+
+def _write_field(directory, field, values):
+    encoded = [str(v or '').encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    with open(os.path.join(directory, f"{field}.bin"), 'wb') as f:
+        for b in encoded:
+            f.write(b)
+    _save(directory, f"{field}.offsets.npy", offsets)
+
+
+def write_snapshot(snapshot_dir, jobs, texts, model, version=None, required_skills=None, ivf_min_jobs=None,
+                   make_current=True):
+    """Vectorize jobs (flattened dicts, cleaned texts) under model and save them as a new snapshot version.
+
+    required_skills: {keyword backend: skills of the whole corpus}. With
+    ivf_min_jobs, corpora at least that large also get an IVF quantizer.
+    Returns the snapshot path.
+    """
+    now = datetime.now(timezone.utc)
+    version = version or now.strftime('%Y%m%d%H%M%S')
+    counts = model.count(texts)
+    matrix = model.transform_counts(counts).astype(np.float32)
+    order = None
+    ivf = None
+    if ivf_min_jobs and len(texts) >= ivf_min_jobs:
+        ivf = IVFIndex().build(matrix)
+        order = ivf.ids
+        matrix = ivf.matrix
+        jobs = [jobs[i] for i in order]
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, version)
+    tmp = path + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    # indices and indptr share one dtype, so scipy can wrap the mapped arrays without copying
+    index_dtype = np.int32 if matrix.nnz < 2 ** 31 else np.int64
+    _save(tmp, 'data.npy', matrix.data.astype(np.float32))
+    _save(tmp, 'indices.npy', matrix.indices.astype(index_dtype))
+    _save(tmp, 'indptr.npy', matrix.indptr.astype(index_dtype))
+    _save(tmp, 'term_totals.npy', np.asarray(counts.sum(axis=0), dtype=np.float64).ravel())
+    if model.has_lsa:
+        embeddings = model.embed_counts(counts)
+        _save(tmp, 'embeddings.npy', embeddings[order] if order is not None else embeddings)
+    if ivf is not None:
+        _save(tmp, 'centroids.npy', ivf.centroids.astype(np.float32))
+        _save(tmp, 'ivf_offsets.npy', ivf.offsets.astype(np.int64))
+    for field in TEXT_FIELDS:
+        _write_field(tmp, field, (job.get(field) for job in jobs))
+    meta = {
+        'format': SNAPSHOT_FORMAT,
+        'version': version,
+        'created_at': now.isoformat(),
+        'model_version': model.version,
+        'n_jobs': len(jobs),
+        'shape': list(matrix.shape),
+        'lsa': model.has_lsa,
+        'ivf': ivf is not None,
+        'required_skills': {backend: sorted(skills) for backend, skills in (required_skills or {}).items()},
+    }
+    with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    if make_current:
+        set_current_snapshot(snapshot_dir, version)
+    return path
+
+
+def set_current_snapshot(snapshot_dir, version):
+    """Atomically point CURRENT at an existing snapshot version"""
+    if not os.path.exists(os.path.join(snapshot_dir, version, 'meta.json')):
+        raise FileNotFoundError(f"No job snapshot {version} in {snapshot_dir}")
+    tmp = os.path.join(snapshot_dir, CURRENT_POINTER + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(snapshot_dir, CURRENT_POINTER))
+
+
+def prune_snapshots(snapshot_dir, keep=3):
+    """Delete all but the newest keep versions (never the current one)"""
+    try:
+        with open(os.path.join(snapshot_dir, CURRENT_POINTER), encoding='utf-8') as f:
+            current = f.read().strip()
+    except FileNotFoundError:
+        current = None
+    versions = sorted((name for name in os.listdir(snapshot_dir)
+                       if os.path.exists(os.path.join(snapshot_dir, name, 'meta.json'))),
+                      key=lambda name: os.path.getmtime(os.path.join(snapshot_dir, name)), reverse=True)
+    for name in versions[keep:]:
+        if name != current:
+            # Workers still mapping it keep their pages until they switch
+            shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
+
+
+class JobSnapshot:
+    """Read-only, memory-mapped view of one snapshot version"""
+
+    def __init__(self, path, model):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported job snapshot format: {self.meta.get('format')}")
+        self.version = self.meta['version']
+        self.model = model
+        load = lambda name: np.load(os.path.join(path, name), mmap_mode='r')
+        self.matrix = sp.csr_matrix((load('data.npy'), load('indices.npy'), load('indptr.npy')),
+                                    shape=tuple(self.meta['shape']), copy=False)
+        self.term_totals = load('term_totals.npy')
+        self.embeddings = load('embeddings.npy') if self.meta.get('lsa') else None
+        self.ivf = None
+        if self.meta.get('ivf'):
+            self.ivf = IVFIndex.from_arrays(load('centroids.npy'), load('ivf_offsets.npy'), self.matrix)
+        self._fields = {}
+        for field in TEXT_FIELDS:
+            blob_path = os.path.join(path, f"{field}.bin")
+            # np.memmap cannot map an empty file
+            blob = np.memmap(blob_path, dtype=np.uint8, mode='r') if os.path.getsize(blob_path) else np.zeros(0, np.uint8)
+            self._fields[field] = (blob, load(f"{field}.offsets.npy"))
+
+    def __len__(self):
+        return self.meta['n_jobs']
+
+    def field(self, name, i):
+        blob, offsets = self._fields[name]
+        return bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8')
+
+    def __getitem__(self, i):
+        """Flattened job i (title, company, location, description, apply_link)"""
+        return {field: self.field(field, i) for field in TEXT_FIELDS}
+
+    def required_skills(self, keyword_backend):
+        """Skills of the whole corpus under keyword_backend, or None if not stored"""
+        skills = self.meta['required_skills'].get(keyword_backend)
+        return set(skills) if skills is not None else None
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'model_version': self.meta['model_version'],
+            'jobs': len(self),
+            'nnz': int(self.matrix.nnz),
+            'lsa': self.embeddings is not None,
+            'ivf': self.ivf is not None,
+            'created_at': self.meta['created_at'],
+        }
+
+
+class JobSnapshotRegistry:
+    """Holds the mapped current snapshot and swaps it when CURRENT changes on disk.
+
+    The corpus model version a snapshot was built with is loaded from
+    model_dir alongside it, so resumes are vectorized in the same space.
+    """
+
+    def __init__(self, snapshot_dir=DEFAULT_SNAPSHOT_DIR, model_dir=None, check_interval=30.0):
+        self.snapshot_dir = snapshot_dir
+        self.model_dir = model_dir
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._pointer_mtime = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.swaps = 0
+        self.reload()
+
+    def reload(self):
+        """Map the snapshot CURRENT points to; keep the old one on failure"""
+        from tfidf_model import DEFAULT_MODEL_DIR, load_model
+
+        with self._lock:
+            self._last_check = time.monotonic()
+            pointer = os.path.join(self.snapshot_dir, CURRENT_POINTER)
+            try:
+                mtime = os.stat(pointer).st_mtime_ns
+            except FileNotFoundError:
+                self._snapshot, self._pointer_mtime = None, None
+                return None
+            if mtime == self._pointer_mtime:
+                return self._snapshot
+            try:
+                with open(pointer, encoding='utf-8') as f:
+                    version = f.read().strip()
+                path = os.path.join(self.snapshot_dir, version)
+                with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                    model_version = json.load(f)['model_version']
+                model = load_model(self.model_dir or DEFAULT_MODEL_DIR, version=model_version)
+                snapshot = JobSnapshot(path, model)
+            except Exception as e:
+                print(f"[JobSnapshot] failed to load snapshot from {self.snapshot_dir}: {e}")
+                return self._snapshot
+            if not self._snapshot or snapshot.version != self._snapshot.version:
+                print(f"[JobSnapshot] mapped job snapshot {snapshot.version} ({len(snapshot)} jobs)")
+                self.swaps += 1
+            self._snapshot, self._pointer_mtime = snapshot, mtime
+            return snapshot
+
+    def current(self):
+        if time.monotonic() - self._last_check >= self.check_interval:
+            return self.reload()
+        return self._snapshot
+
+    def stats(self):
+        snapshot = self._snapshot
+        stats = {'loaded': snapshot is not None, 'snapshot_dir': self.snapshot_dir, 'swaps': self.swaps}
+        if snapshot is not None:
+            stats.update(snapshot.stats())
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or activate memory-mapped job snapshots')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='vectorize job files with the corpus model and save a new snapshot')
+    build.add_argument('--jobs', action='append', required=True, help='JSON/NDJSON/CSV file or directory (repeatable)')
+    build.add_argument('--snapshot-dir', default=os.getenv('JOB_SNAPSHOT_DIR', DEFAULT_SNAPSHOT_DIR))
+    build.add_argument('--version', default=None)
+    build.add_argument('--keep', type=int, default=3, help='snapshot versions to keep on disk')
+    build.add_argument('--no-activate', action='store_true', help='save without pointing CURRENT at it')
+
+    activate = sub.add_parser('activate', help='point CURRENT at an existing snapshot')
+    activate.add_argument('version')
+    activate.add_argument('--snapshot-dir', default=os.getenv('JOB_SNAPSHOT_DIR', DEFAULT_SNAPSHOT_DIR))
+
+    args = parser.parse_args()
+    if args.command == 'activate':
+        set_current_snapshot(args.snapshot_dir, args.version)
+        print(f"CURRENT -> {args.version}")
+        return
+
+    from app import ResumeATSEngine, format_provider_job
+    from tfidf_model import iter_corpus_jobs
+
+    engine = ResumeATSEngine()
+    model = engine.tfidf_models.current()
+    if model is None:
+        raise SystemExit('No corpus TF-IDF model; build one with tfidf_model.py build first')
+    jobs = [format_provider_job(job) for path in args.jobs for job in iter_corpus_jobs(path)]
+    if not jobs:
+        raise SystemExit('No jobs found')
+    texts = [engine.clean_text(f"{j['title']} {j['company']} {j['location']} {j['description']}") for j in jobs]
+    required_skills = {backend: set().union(*engine.extract_keywords_batch(texts, backend))
+                       for backend in engine.keyword_extractors}
+    path = write_snapshot(args.snapshot_dir, jobs, texts, model, version=args.version,
+                          required_skills=required_skills, ivf_min_jobs=engine.ann_min_jobs,
+                          make_current=not args.no_activate)
+    prune_snapshots(args.snapshot_dir, keep=args.keep)
+    print(f"Saved job snapshot of {len(jobs)} jobs (model {model.version}) -> {path}")
+
+
+if __name__ == '__main__':
+    main()
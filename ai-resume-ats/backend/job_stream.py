@@ -0,0 +1,229 @@
+"""Streaming ingestion of uploaded jobs files.
+
+/recommend_from_jobs accepts CSV, JSON (an array, a single object or
+concatenated objects) and NDJSON exports with hundreds of thousands of
+rows. iter_uploaded_jobs reads the upload stream in fixed-size byte blocks
+and yields normalized jobs one at a time, so the file is never held in
+memory as a whole; the route scores them in chunks (see chunked) and keeps
+only the best K results in a TopK heap. ATSScoreAccumulator computes the
+overall ATS score from the same chunks without keeping their text.
+"""
+
+import codecs
+import csv
+import heapq
+import json
+from collections import Counter
+from itertools import islice
+
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from job_index import POSTED_AT_FIELDS
+from tfidf_model import pair_tfidf_cosine
+
+READ_BLOCK_SIZE = 64 * 1024
+# A single JSON element larger than this is treated as malformed input
+MAX_JSON_ELEMENT_CHARS = 16 * 1024 * 1024
+
+
+def normalize_uploaded_job(item):
+    """Map a CSV row / JSON object onto the job shape the scoring code expects (posting date as 'created')"""
+    return {
+        'title': item.get('title') or item.get('job_title') or item.get('name') or 'Internship',
+        'company': {'display_name': item.get('company') or item.get('company_name') or ''},
+        'location': {'display_name': item.get('location') or item.get('city') or ''},
+        'description': item.get('description') or item.get('job_description') or item.get('summary') or '',
+        'redirect_url': item.get('apply_link') or item.get('apply_url') or item.get('link') or '',
+        'created': next((item[field] for field in POSTED_AT_FIELDS if item.get(field) not in (None, '')), None),
+    }
+
+
+def iter_text_blocks(stream, block_size=READ_BLOCK_SIZE, first=b''):
+    """Decoded UTF-8 text of a binary stream, block by block (BOM and undecodable bytes dropped)"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='ignore')
+    if first:
+        yield decoder.decode(first)
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        yield decoder.decode(block)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_lines(blocks):
+    """Lines (with their line endings) from an iterable of text blocks"""
+    pending = ''
+    for block in blocks:
+        pending += block
+        lines = pending.splitlines(keepends=True)
+        # The last piece may be an incomplete line (or a lone '\r' before '\n')
+        pending = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_json_values(blocks):
+    """Objects from a JSON array, a single JSON value or concatenated/NDJSON values.
+
+    Elements are decoded one at a time with raw_decode, so the buffer only
+    ever holds the element being decoded plus one read block.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = '', 0
+    in_array = None
+    blocks = iter(blocks)
+    exhausted = False
+    while True:
+        # Skip separators between values
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ','):
+            pos += 1
+        if pos < len(buffer) and in_array is None:
+            in_array = buffer[pos] == '['
+            if in_array:
+                pos += 1
+                continue
+        if in_array and pos < len(buffer) and buffer[pos] == ']':
+            return
+        if pos < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted or len(buffer) - pos > MAX_JSON_ELEMENT_CHARS:
+                    raise
+                value, end = None, None
+            # A value that ends exactly at the buffer edge might continue in the next block
+            if end is not None and (end < len(buffer) or exhausted):
+                pos = end
+                if isinstance(value, list):
+                    yield from (v for v in value if isinstance(v, dict))
+                elif isinstance(value, dict):
+                    yield value
+                continue
+        elif exhausted:
+            return
+        try:
+            buffer = buffer[pos:] + next(blocks)
+            pos = 0
+        except StopIteration:
+            exhausted = True
+
+
+def iter_uploaded_jobs(file_storage, block_size=READ_BLOCK_SIZE):
+    """Yield normalized jobs from an uploaded CSV / JSON / NDJSON file without reading it whole"""
+    filename = (file_storage.filename or '').lower()
+    stream = file_storage.stream
+    first = stream.read(block_size)
+    head = first.lstrip()
+    if head.startswith(b'\xef\xbb\xbf'):
+        head = head[3:].lstrip()
+    blocks = iter_text_blocks(stream, block_size, first)
+    if filename.endswith(('.json', '.ndjson', '.jsonl')) or head[:1] in (b'[', b'{'):
+        try:
+            for item in iter_json_values(blocks):
+                yield normalize_uploaded_job(item)
+        except ValueError as e:
+            print(f"Failed to parse JSON jobs file: {e}")
+    else:
+        for row in csv.DictReader(iter_lines(blocks)):
+            yield normalize_uploaded_job(row)
+
+
+def chunked(iterable, size):
+    """Lists of up to size consecutive items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class TopK:
+    """Keeps the k items with the largest keys; ties go to the item pushed first"""
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._seq = 0
+
+    def push(self, key, item):
+        self._seq += 1
+        entry = (key, -self._seq, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def items(self):
+        """Items, best first"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class ATSScoreAccumulator:
+    """ResumeATSEngine.calculate_ats_score over job texts that arrive in chunks.
+
+    Keeps the union of job keywords and the term counts of the combined job
+    text (bounded by the vocabulary, not by the number of jobs).
+    """
+
+    def __init__(self, engine, resume_text, keyword_backend=None, resume_keywords=None, similarity=None):
+        self.engine = engine
+        self.resume_text = resume_text
+        self.keyword_backend = keyword_backend
+        self.resume_skills = set(resume_keywords) if resume_keywords is not None else \
+            set(engine.extract_keywords(resume_text, keyword_backend))
+        self.required_skills = set()
+        self.job_count = 0
+        # Pin the model so a hot swap mid-upload cannot mix vocabularies
+        self.model = engine.tfidf_models.current()
+        self.similarity = engine.resolve_similarity(similarity, self.model)
+        if self.model is not None:
+            self._job_counts = None
+        else:
+            self._analyze = TfidfVectorizer(stop_words='english').build_analyzer()
+            self._job_counts = Counter()
+
+    def add(self, job_texts, job_keywords=None, job_counts=None):
+        """Add a chunk; keywords and term counts (under self.model) may be passed in precomputed"""
+        if not job_texts:
+            return
+        self.job_count += len(job_texts)
+        if job_keywords is None:
+            job_keywords = self.engine.extract_keywords_batch(list(job_texts), self.keyword_backend)
+        self.required_skills.update(*job_keywords)
+        if self.model is not None:
+            counts = (job_counts if job_counts is not None else self.model.count(job_texts)).sum(axis=0)
+            self._job_counts = counts if self._job_counts is None else self._job_counts + counts
+        else:
+            for text in job_texts:
+                self._job_counts.update(self._analyze(text))
+
+    def _semantic_similarity(self):
+        if self.similarity == 'lsa':
+            resume_vector = self.model.embed([self.resume_text])[0]
+            return float(self.model.embed_counts(sp.csr_matrix(self._job_counts))[0] @ resume_vector)
+        if self.model is not None:
+            resume_vector = self.model.transform([self.resume_text])
+            jobs_vector = self.model.transform_counts(sp.csr_matrix(self._job_counts))
+            return (jobs_vector @ resume_vector.T).toarray()[0][0]
+        resume_counts = Counter(self._analyze(self.resume_text))
+        return pair_tfidf_cosine(resume_counts, self._job_counts, max_features=1000)
+
+    def result(self):
+        """(score_percent, missing_keywords_list), as calculate_ats_score returns"""
+        if not self.job_count:
+            return 0, []
+        try:
+            semantic_sim = self._semantic_similarity() * 100
+        except Exception as e:
+            print(f"Error computing semantic similarity: {e}")
+            semantic_sim = 0
+        return self.engine.combine_ats_score(self.resume_skills, self.required_skills, semantic_sim)
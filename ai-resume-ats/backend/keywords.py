@@ -0,0 +1,146 @@
+"""Keyword extraction engine used by ResumeATSEngine.
+
+Loads en_core_web_sm with only the components keyword extraction needs
+(tok2vec, tagger, attribute_ruler, lemmatizer, ner); the dependency parser
+and sentence segmenter are excluded. Many texts are processed together
+through nlp.pipe, and results are cached per text under a content hash so
+job descriptions that come back from providers again are not re-parsed.
+
+The same extractor can instead be backed by a SkillGazetteer (see
+skill_gazetteer.py), which matches known skill phrases without any model
+inference. KEYWORD_BACKENDS lists the selectable backend names.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+KEYWORD_BACKENDS = ('spacy', 'gazetteer')
+# Components not needed for POS + lemma + entity based keywords
+EXCLUDED_COMPONENTS = ['parser', 'senter']
+KEYWORD_POS = {'NOUN', 'PROPN', 'ADJ'}
+KEYWORD_ENTITY_LABELS = {'ORG', 'PRODUCT', 'GPE'}
+FALLBACK_STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are',
+    'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'
+}
+
+
+def load_keyword_pipeline(model_name='en_core_web_sm'):
+    """Load the trimmed spaCy pipeline; returns None when spaCy or the model is missing"""
+    try:
+        import spacy
+        nlp = spacy.load(model_name, exclude=EXCLUDED_COMPONENTS)
+        print(f"✅ spaCy model loaded successfully (components: {', '.join(nlp.pipe_names)})")
+        return nlp
+    except Exception as e:
+        print(f"Warning: spaCy issue ({e}). Using fallback NLP processing.")
+        return None
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def fallback_keywords(text):
+    """Stop-word filtered tokens, used when spaCy is unavailable"""
+    words = text.lower().split()
+    return list(set(word for word in words if len(word) > 2 and word not in FALLBACK_STOP_WORDS))
+
+
+def doc_keywords(doc):
+    """Nouns / proper nouns / adjectives (lemmatized) plus ORG/PRODUCT/GPE entities"""
+    keywords = set()
+    for token in doc:
+        if (token.pos_ in KEYWORD_POS and
+                not token.is_stop and
+                not token.is_punct and
+                len(token.text) > 2):
+            keywords.add(token.lemma_.lower())
+    for ent in doc.ents:
+        if ent.label_ in KEYWORD_ENTITY_LABELS:
+            keywords.add(ent.text.lower())
+    return list(keywords)
+
+
+class KeywordExtractor:
+    """Batched, cached keyword extraction over a (trimmed) spaCy pipeline or a gazetteer"""
+
+    def __init__(self, nlp=None, batch_size=64, n_process=1, cache_size=4096, gazetteer=None):
+        self.nlp = nlp
+        self.gazetteer = gazetteer
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # text hash -> keyword list
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'docs_processed': 0}
+
+    def _cache_get(self, key):
+        with self._lock:
+            keywords = self._cache.get(key)
+            if keywords is not None:
+                self._cache.move_to_end(key)
+                self.counters['hits'] += 1
+            else:
+                self.counters['misses'] += 1
+            return keywords
+
+    def _cache_put(self, key, keywords):
+        with self._lock:
+            self._cache[key] = keywords
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _process(self, texts):
+        if self.gazetteer is not None:
+            return [self.gazetteer.match(t) for t in texts]
+        if not self.nlp:
+            return [fallback_keywords(t) for t in texts]
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        return [doc_keywords(doc) for doc in docs]
+
+    def extract(self, text):
+        return self.extract_many([text])[0]
+
+    def extract_many(self, texts):
+        """Keyword lists aligned with texts; only uncached texts go through the pipeline"""
+        results = [None] * len(texts)
+        pending = OrderedDict()  # hash -> (text, [indices])
+        for i, text in enumerate(texts):
+            key = text_hash(text)
+            if key in pending:
+                pending[key][1].append(i)
+                continue
+            cached = self._cache_get(key) if self.cache_size else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[key] = (text, [i])
+        if pending:
+            keys = list(pending)
+            extracted = self._process([pending[k][0] for k in keys])
+            with self._lock:
+                self.counters['docs_processed'] += len(keys)
+            for key, keywords in zip(keys, extracted):
+                if self.cache_size:
+                    self._cache_put(key, keywords)
+                for i in pending[key][1]:
+                    results[i] = keywords
+        # Callers may mutate the lists they get back
+        return [list(r) for r in results]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['cached_texts'] = len(self._cache)
+        if self.gazetteer is not None:
+            stats['backend'] = 'gazetteer'
+            stats['phrases'] = len(self.gazetteer)
+            return stats
+        stats['backend'] = 'spacy' if self.nlp else 'fallback'
+        stats['pipeline'] = list(self.nlp.pipe_names) if self.nlp else []
+        stats['batch_size'] = self.batch_size
+        stats['n_process'] = self.n_process
+        return stats
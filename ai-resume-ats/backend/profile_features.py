@@ -0,0 +1,71 @@
+"""Stored resume representation of a saved profile.
+
+/recommend with a profile_id scores the profile instead of an upload. Its
+representation is kept in the profile store next to the profile, so a
+repeat "refresh my recommendations" is a lookup plus ranking:
+
+    'sections'      {section: {'digest', 'text', 'keywords'}}: per section
+                    ('resume' when an upload was attached, then the profile
+                    fields in SECTIONS), a SHA-1 of its source text, its
+                    clean_text and {keyword backend: keyword list}
+    'text'          the section texts joined in SECTIONS order (scored text)
+    'counts'        term counts of 'text' under the corpus model, see
+                    counts_to_json (or None without a corpus model)
+    'model_version' corpus model version 'counts' belong to
+
+When the profile changes, only sections whose digest changed are cleaned
+and run through keyword extraction again; the term counts are recounted
+when the joined text or the corpus model changed (counting needs no NLP).
+See ResumeATSEngine.profile_resume.
+"""
+
+import hashlib
+
+import numpy as np
+import scipy.sparse as sp
+
+# Scored text order: an attached upload first, then the profile fields
+SECTIONS = ('resume', 'skills', 'education', 'experience', 'projects', 'bio')
+PROFILE_FIELDS = SECTIONS[1:]
+
+
+def flatten_text(value):
+    """Text of a profile field: strings as is, lists and dicts (e.g. experience entries) joined"""
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return ' '.join(flatten_text(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(flatten_text(v) for v in value)
+    return str(value)
+
+
+def profile_sections(profile):
+    """{field: source text} of the non-empty scored fields of a profile"""
+    texts = {field: flatten_text(profile.get(field)).strip() for field in PROFILE_FIELDS}
+    return {field: text for field, text in texts.items() if text}
+
+
+def section_digest(text):
+    return hashlib.sha1(text.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def counts_to_json(counts):
+    """JSON-serializable form of a 1 x V term count row"""
+    counts = sp.csr_matrix(counts)
+    return {'size': int(counts.shape[1]), 'indices': counts.indices.tolist(), 'data': counts.data.tolist()}
+
+
+def counts_from_json(data):
+    """1 x V CSR term count row from counts_to_json"""
+    indices = np.asarray(data['indices'], dtype=np.int32)
+    return sp.csr_matrix((np.asarray(data['data'], dtype=np.int64), indices, [0, len(indices)]),
+                         shape=(1, data['size']))
+
+
+def skills_text(profile):
+    """Comma-separated skills of a profile (saved as a list or a string)"""
+    skills = profile.get('skills') or ''
+    if isinstance(skills, (list, tuple)):
+        return ', '.join(flatten_text(s).strip() for s in skills if flatten_text(s).strip())
+    return str(skills)
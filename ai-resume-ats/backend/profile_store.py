@@ -0,0 +1,234 @@
+"""Persistent user profiles shared by every worker process.
+
+/profile used to keep profiles in a module-level dict, so each gunicorn
+worker had its own copy and everything was lost on restart. ProfileStore
+keeps them in a SQLite database (WAL mode, so readers never wait for the
+writer) with an index on email, and answers repeated reads from an
+in-process LRU of the stored JSON.
+
+The read cache is invalidated with PRAGMA data_version, which changes on a
+connection whenever another connection (another worker, or another thread
+of this one) commits to the database. Every read checks it first, a few
+microseconds, and drops the cache when it moved; writes made through this
+store drop it directly. Writes are rare next to reads, so the whole cache
+is dropped rather than tracking which entries a write touched.
+
+Alongside each profile the store keeps its processed resume representation
+(see profile_features.py), read through the same cache.
+
+Bulk export and import use NDJSON, one {"profile_id": ..., "profile": {...}}
+object per line:
+    python profile_store.py export --out profiles.ndjson
+    python profile_store.py import profiles.ndjson
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_PROFILE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles.db')
+
+
+class ProfileStore:
+    """Profiles keyed by profile_id, looked up by id or (case-insensitive) email.
+
+    Each thread gets its own connection; the database is opened and its
+    schema created on first use.
+    """
+
+    def __init__(self, path=DEFAULT_PROFILE_DB, cache_size=10000):
+        self.path = path
+        self.cache_size = cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # ('id' | 'email' | 'representation', value) -> stored JSON, or None
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                "profile_id TEXT PRIMARY KEY, email TEXT NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_email ON profiles(email COLLATE NOCASE)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS profile_representations ("
+                "profile_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+            self._local.data_version = None
+        return conn
+
+    def _invalidate(self):
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def _sync(self):
+        """Drop the cache if the database changed since this thread last looked; returns (conn, generation)"""
+        conn = self._conn()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._local.data_version:
+            # Also on a thread's first read: its connection has no earlier version to compare with
+            self._invalidate()
+            self._local.data_version = version
+        return conn, self._generation
+
+    def _lookup(self, key, sql, params):
+        conn, generation = self._sync()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                data = self._cache[key]
+                return json.loads(data) if data is not None else None
+            self.misses += 1
+        row = conn.execute(sql, params).fetchone()
+        data = row[0] if row else None
+        with self._lock:
+            # Skip if a write invalidated the cache while this row was being read
+            if generation == self._generation and self.cache_size > 0:
+                self._cache[key] = data
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return json.loads(data) if data is not None else None
+
+    def get(self, profile_id):
+        """Profile dict stored under profile_id, or None"""
+        return self._lookup(('id', profile_id), "SELECT data FROM profiles WHERE profile_id = ?", (profile_id,))
+
+    def get_by_email(self, email):
+        """Most recently saved profile with this email (case-insensitive), or None"""
+        email = (email or '').strip()
+        return self._lookup(
+            ('email', email.lower()),
+            "SELECT data FROM profiles WHERE email = ? COLLATE NOCASE ORDER BY updated_at DESC LIMIT 1",
+            (email,)
+        )
+
+    def put(self, profile_id, profile):
+        """Insert or replace the profile stored under profile_id"""
+        self.import_profiles([(profile_id, profile)])
+
+    def get_representation(self, profile_id):
+        """Stored resume representation of a profile (see profile_features.py), or None"""
+        return self._lookup(('representation', profile_id),
+                            "SELECT data FROM profile_representations WHERE profile_id = ?", (profile_id,))
+
+    def put_representation(self, profile_id, representation):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO profile_representations (profile_id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(profile_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (profile_id, json.dumps(representation), time.time())
+            )
+        self._invalidate()
+
+    def delete(self, profile_id):
+        conn = self._conn()
+        with conn:
+            deleted = conn.execute("DELETE FROM profiles WHERE profile_id = ?", (profile_id,)).rowcount
+            conn.execute("DELETE FROM profile_representations WHERE profile_id = ?", (profile_id,))
+        self._invalidate()
+        return deleted > 0
+
+    def import_profiles(self, items):
+        """Insert or replace (profile_id, profile) pairs in one transaction; returns how many"""
+        now = time.time()
+        rows = [(str(pid), str(profile.get('email') or '').strip(), json.dumps(profile), now) for pid, profile in items]
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO profiles (profile_id, email, data, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(profile_id) DO UPDATE SET "
+                "email = excluded.email, data = excluded.data, updated_at = excluded.updated_at",
+                rows
+            )
+        self._invalidate()
+        return len(rows)
+
+    def export_profiles(self):
+        """(profile_id, profile) pairs ordered by profile_id"""
+        cursor = self._conn().execute("SELECT profile_id, data FROM profiles ORDER BY profile_id")
+        for profile_id, data in cursor:
+            yield profile_id, json.loads(data)
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'path': self.path,
+                'cache_entries': len(self._cache),
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+def read_profile_file(path):
+    """(profile_id, profile) pairs from an NDJSON export or a JSON list; bare profiles are keyed by email"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith('['):
+        records = json.loads(stripped)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for record in records:
+        if 'profile' in record and isinstance(record['profile'], dict):
+            yield record.get('profile_id') or record['profile'].get('email', 'default'), record['profile']
+        else:
+            yield record.get('email', 'default'), record
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export or import user profiles')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help='write every profile as NDJSON')
+    export.add_argument('--db', default=os.getenv('PROFILE_DB_PATH', DEFAULT_PROFILE_DB))
+    export.add_argument('--out', default=None, help='output file (default: stdout)')
+
+    load = sub.add_parser('import', help='insert or replace profiles from an NDJSON export or a JSON list')
+    load.add_argument('file')
+    load.add_argument('--db', default=os.getenv('PROFILE_DB_PATH', DEFAULT_PROFILE_DB))
+
+    args = parser.parse_args()
+    store = ProfileStore(args.db)
+    if args.command == 'import':
+        count = store.import_profiles(read_profile_file(args.file))
+        print(f"Imported {count} profiles into {args.db}")
+        return
+
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    count = 0
+    try:
+        for profile_id, profile in store.export_profiles():
+            out.write(json.dumps({'profile_id': profile_id, 'profile': profile}) + '\n')
+            count += 1
+    finally:
+        if args.out:
+            out.close()
+    print(f"Exported {count} profiles from {args.db}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
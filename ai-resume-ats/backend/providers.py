@@ -0,0 +1,493 @@
+"""Provider client layer: per-provider circuit breakers and background retries.
+
+Every outbound job-provider call goes through a ProviderClient. Its
+CircuitBreaker opens after repeated failures (or immediately on a 429 with
+Retry-After), and while open every call fails fast with ProviderUnavailable
+instead of tying up a request thread. After reset_timeout the breaker goes
+half-open and lets a single probe through; the probe's outcome closes or
+re-opens it.
+
+Retries never sleep on the serving thread. Callers hand them to the shared
+RetryScheduler, which runs them on one background thread when they are due
+(typically to warm the provider response cache for the next request).
+
+Each client owns a long-lived requests.Session with a pooled keep-alive
+HTTPAdapter, so repeated calls to the same provider host reuse TCP+TLS
+connections. The session keeps no cookies and is shared by all request
+threads of a worker.
+
+Identical concurrent GETs (same provider, URL and params) are coalesced by
+a Singleflight: the first caller makes the request and the others wait for
+its response. With a shared directory, the leader also holds a file lock
+for the key and publishes the response there, so concurrent callers in
+other gunicorn workers reuse it instead of calling the provider again.
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so coalescing stays within one process
+    fcntl = None
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class ProviderUnavailable(Exception):
+    """Raised when a provider's circuit breaker rejects a call"""
+
+    def __init__(self, provider, retry_in=None):
+        self.provider = provider
+        self.retry_in = retry_in
+        detail = f", retry in {retry_in:.0f}s" if retry_in else ''
+        super().__init__(f"{provider} circuit open{detail}")
+
+
+def parse_retry_after(value):
+    """Seconds from a numeric Retry-After header, else None"""
+    if value and str(value).strip().isdigit():
+        return int(str(value).strip())
+    return None
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one provider"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            'calls': 0, 'successes': 0, 'failures': 0, 'rejected': 0,
+            'throttled': 0, 'opened': 0,
+        }
+        self.last_failure = None
+        self.last_state_change = time.time()
+
+    def _set_state(self, state):
+        if state != self.state:
+            print(f"[Breaker:{self.name}] {self.state} -> {state}")
+            self.state = state
+            self.last_state_change = time.time()
+            if state == OPEN:
+                self.counters['opened'] += 1
+
+    def allow_request(self):
+        """Reserve a call slot; raises ProviderUnavailable when the breaker is open"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now < self._open_until:
+                    self.counters['rejected'] += 1
+                    raise ProviderUnavailable(self.name, self._open_until - now)
+                self._set_state(HALF_OPEN)
+                self._half_open_calls = 0
+            if self.state == HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self.counters['rejected'] += 1
+                    raise ProviderUnavailable(self.name)
+                self._half_open_calls += 1
+            self.counters['calls'] += 1
+
+    def record_success(self):
+        with self._lock:
+            self.counters['successes'] += 1
+            self._consecutive_failures = 0
+            self._set_state(CLOSED)
+
+    def record_failure(self, reason='', retry_after=None):
+        """Count a failure; open on threshold, on a failed half-open probe, or on Retry-After"""
+        with self._lock:
+            self.counters['failures'] += 1
+            self._consecutive_failures += 1
+            self.last_failure = {'reason': str(reason)[:200], 'at': time.time()}
+            if retry_after is not None:
+                self.counters['throttled'] += 1
+            if (self.state == HALF_OPEN or retry_after is not None
+                    or self._consecutive_failures >= self.failure_threshold):
+                self._open_until = time.monotonic() + max(self.reset_timeout, retry_after or 0)
+                self._set_state(OPEN)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['state'] = self.state
+            stats['consecutive_failures'] = self._consecutive_failures
+            stats['open_for_seconds'] = round(max(0.0, self._open_until - time.monotonic()), 1) if self.state == OPEN else 0
+            stats['last_failure'] = self.last_failure
+            stats['last_state_change'] = self.last_state_change
+        return stats
+
+
+def flight_key(provider, url, params=None):
+    """Coalescing key for a GET: provider, URL and sorted query params"""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return json.dumps([provider, url, items])
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Singleflight:
+    """Runs one call per key at a time; concurrent callers with the key share its result.
+
+    do(key, fn) calls fn in the first caller and hands its return value (or
+    exception) to every caller that arrives while it runs. With shared_dir,
+    the leader of a key also takes an flock on one of lock_buckets lock files
+    and writes encode(result) to <shared_dir>/<key hash>.json; a leader in
+    another worker that finds the lock taken waits for it (at most
+    wait_timeout seconds) and returns decode() of that file when it was
+    written less than result_ttl seconds ago, else makes the call itself.
+    encode may return None for results that should not be shared.
+    """
+
+    def __init__(self, shared_dir=None, result_ttl=5.0, wait_timeout=30.0, encode=None, decode=None,
+                 lock_buckets=256):
+        self.shared_dir = shared_dir if fcntl is not None else None
+        if shared_dir and fcntl is None:
+            print("[Singleflight] fcntl unavailable; coalescing within this process only")
+        if self.shared_dir:
+            os.makedirs(self.shared_dir, exist_ok=True)
+        self.result_ttl = result_ttl
+        self.wait_timeout = wait_timeout
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+        self.lock_buckets = lock_buckets
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.counters = {
+            'leaders': 0, 'coalesced': 0, 'shared_hits': 0, 'shared_waits': 0,
+            'shared_timeouts': 0, 'shared_errors': 0,
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self.counters['leaders' if leader else 'coalesced'] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = self._shared_do(key, fn) if self.shared_dir else fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _shared_do(self, key, fn):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        result_path = os.path.join(self.shared_dir, f"{digest}.json")
+        # Lock files are bucketed so they can never pile up, one per query
+        lock_path = os.path.join(self.shared_dir, f"bucket-{int(digest, 16) % self.lock_buckets}.lock")
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            if not self._try_lock(fd):
+                self._count('shared_waits')
+                deadline = time.monotonic() + self.wait_timeout
+                while not self._try_lock(fd):
+                    if time.monotonic() >= deadline:
+                        self._count('shared_timeouts')
+                        return fn()
+                    time.sleep(0.02)
+            try:
+                shared = self._read_result(result_path)
+                if shared is not None:
+                    self._count('shared_hits')
+                    return self.decode(shared)
+                value = fn()
+                self._write_result(result_path, value)
+                return value
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _try_lock(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _read_result(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[Singleflight] unreadable shared result {path}: {e}")
+            self._count('shared_errors')
+            return None
+        if time.time() - entry.get('written_at', 0) > self.result_ttl:
+            return None
+        return entry.get('value')
+
+    def _write_result(self, path, value):
+        try:
+            data = self.encode(value)
+            if data is None:
+                return
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'written_at': time.time(), 'value': data}, f)
+            os.replace(tmp, path)
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune()
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[Singleflight] could not share result: {e}")
+            self._count('shared_errors')
+
+    def _prune(self):
+        cutoff = time.time() - max(60.0, 10 * self.result_ttl)
+        for name in os.listdir(self.shared_dir):
+            path = os.path.join(self.shared_dir, name)
+            try:
+                if name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['in_flight'] = len(self._calls)
+        stats['shared_dir'] = self.shared_dir
+        return stats
+
+
+def response_to_dict(response):
+    """JSON-safe copy of a requests.Response for sharing between workers"""
+    return {
+        'status_code': response.status_code,
+        'headers': dict(response.headers),
+        'url': response.url,
+        'encoding': response.encoding,
+        # latin-1 maps every byte to one code point, so the body round-trips exactly
+        'content': response.content.decode('latin-1'),
+    }
+
+
+def response_from_dict(data):
+    response = requests.Response()
+    response.status_code = data['status_code']
+    response.headers = CaseInsensitiveDict(data['headers'])
+    response.url = data['url']
+    response.encoding = data['encoding']
+    response._content = data['content'].encode('latin-1')
+    return response
+
+
+def build_session(pool_size=10, transport_retries=2):
+    """Thread-shareable keep-alive session with a bounded connection pool.
+
+    Transport retries only cover connection setup / read errors on idempotent
+    requests; HTTP status retries are left to the breaker and RetryScheduler.
+    """
+    session = requests.Session()
+    # No cookie state, so concurrent threads cannot interfere through the jar
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    retries = Retry(total=transport_retries, connect=transport_retries, read=transport_retries,
+                    status=0, backoff_factor=0.2, allowed_methods=frozenset(['GET']),
+                    raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retries, pool_block=False)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class ProviderClient:
+    """HTTP GET wrapper that reports every outcome to the provider's breaker.
+
+    429 and 5xx responses and transport errors count as failures; other
+    responses (including 4xx client errors) count as the provider being up.
+    The response is returned to the caller either way.
+
+    With a singleflight, identical concurrent GETs share one provider call;
+    responses shared by another worker are reported to this worker's breaker
+    too, so a 429 opens it everywhere.
+    """
+
+    def __init__(self, name, breaker=None, pool_size=10, connect_timeout=3.05, read_timeout=20.0,
+                 transport_retries=2, singleflight=None):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = build_session(pool_size, transport_retries)
+        self.singleflight = singleflight
+        if singleflight is not None:
+            singleflight.encode = response_to_dict
+            singleflight.decode = self._shared_response
+
+    def get(self, url, timeout=None, **kwargs):
+        """GET through the pooled session; a scalar timeout overrides the read timeout only"""
+        if self.singleflight is None:
+            return self._get(url, timeout, **kwargs)
+        key = flight_key(self.name, url, kwargs.get('params'))
+        return self.singleflight.do(key, lambda: self._get(url, timeout, **kwargs))
+
+    def _shared_response(self, data):
+        response = response_from_dict(data)
+        self._record_outcome(response)
+        return response
+
+    def _get(self, url, timeout=None, **kwargs):
+        self.breaker.allow_request()
+        if timeout is None:
+            timeout = (self.connect_timeout, self.read_timeout)
+        elif not isinstance(timeout, tuple):
+            timeout = (self.connect_timeout, timeout)
+        try:
+            response = self.session.get(url, timeout=timeout, **kwargs)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self._record_outcome(response)
+        return response
+
+    def _record_outcome(self, response):
+        if response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.breaker.record_failure('429 rate limited', retry_after=retry_after or 0)
+        elif response.status_code >= 500:
+            self.breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            self.breaker.record_success()
+
+    def pool_stats(self):
+        """Connection reuse counters summed over the session's urllib3 pools"""
+        requests_sent = connections = 0
+        hosts = []
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                hosts.append(pool.host)
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+        return {
+            'hosts': sorted(set(hosts)),
+            'requests': requests_sent,
+            'connections_opened': connections,
+            'reused': max(0, requests_sent - connections),
+            'reuse_ratio': round(1 - connections / requests_sent, 3) if requests_sent else 0.0,
+        }
+
+    def stats(self):
+        stats = self.breaker.stats()
+        stats['pool'] = self.pool_stats()
+        if self.singleflight is not None:
+            stats['singleflight'] = self.singleflight.stats()
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+class RetryScheduler:
+    """Runs delayed retry callbacks on a single background thread.
+
+    schedule() returns immediately; a callback with the same key that is
+    already queued is not queued twice.
+    """
+
+    def __init__(self, max_pending=256):
+        self.max_pending = max_pending
+        self._heap = []
+        self._keys = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.counters = {'scheduled': 0, 'executed': 0, 'failed': 0, 'dropped': 0}
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='provider-retry', daemon=True)
+            self._thread.start()
+
+    def schedule(self, delay, fn, key=None):
+        """Queue fn to run after delay seconds; returns False if deduped or full"""
+        with self._cond:
+            if key is not None and key in self._keys:
+                self.counters['dropped'] += 1
+                return False
+            if len(self._heap) >= self.max_pending:
+                self.counters['dropped'] += 1
+                return False
+            heapq.heappush(self._heap, (time.monotonic() + max(0.0, delay), next(self._seq), key, fn))
+            if key is not None:
+                self._keys.add(key)
+            self.counters['scheduled'] += 1
+            self._ensure_thread()
+            self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                due, _, key, fn = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                self._keys.discard(key)
+            try:
+                fn()
+                outcome = 'executed'
+            except Exception as e:
+                print(f"[RetryScheduler] retry {key!r} failed: {e}")
+                outcome = 'failed'
+            with self._cond:
+                self.counters[outcome] += 1
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self.counters)
+            stats['pending'] = len(self._heap)
+        return stats
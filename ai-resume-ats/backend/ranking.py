@@ -0,0 +1,114 @@
+"""Top-K ranking over per-job feature columns.
+
+/recommend orders jobs by several integer features (location hits, match
+percent, final score) with earlier jobs winning ties. Instead of sorting the
+full list once per feature, the columns are packed into one int64 composite
+key (mixed radix, most significant column first, original position last)
+and only the requested top K are selected with np.argpartition.
+
+The boost features behind those columns (how many domain, location and
+skill tokens a job mentions) come from a TokenMatcher: all token groups of
+a request are compiled into one regex, and each job's text fields are
+scanned once for all of them.
+"""
+
+import re
+from bisect import bisect_right
+from collections import Counter
+
+import numpy as np
+
+FIELD_SEPARATOR = '\x00'
+
+
+def composite_keys(columns):
+    """One int64 key per row that orders rows like the tuple of columns (descending),
+    ties broken by the lower row index. Returns None if the key would overflow.
+    """
+    columns = [np.asarray(c, dtype=np.int64) for c in columns]
+    n = len(columns[0]) if columns else 0
+    keys = np.zeros(n, dtype=np.int64)
+    capacity = 1
+    for column in columns + [n - 1 - np.arange(n, dtype=np.int64)]:
+        low = int(column.min()) if n else 0
+        radix = (int(column.max()) - low + 1) if n else 1
+        capacity *= radix
+        if capacity >= 2 ** 63:
+            return None
+        keys = keys * radix + (column - low)
+    return keys
+
+
+def top_k(columns, k, mask=None):
+    """Indices of the k best rows (descending by columns, then ascending index), best first"""
+    columns = [np.asarray(c) for c in columns]
+    candidates = np.arange(len(columns[0])) if columns else np.arange(0)
+    if mask is not None:
+        candidates = candidates[np.asarray(mask, dtype=bool)]
+    if k <= 0 or not len(candidates):
+        return np.arange(0)
+    selected = [c[candidates] for c in columns]
+    keys = composite_keys(selected)
+    if keys is None:
+        # np.lexsort sorts by the last key first, ascending
+        order = np.lexsort([np.arange(len(candidates))] + [-c for c in reversed(selected)])
+        return candidates[order[:k]]
+    if k < len(keys):
+        part = np.argpartition(-keys, k - 1)[:k]
+    else:
+        part = np.arange(len(keys))
+    return candidates[part[np.argsort(-keys[part])]]
+
+
+class TokenMatcher:
+    """Substring hit counts for several token groups, in one regex pass per job.
+
+    groups maps a feature name to (field, tokens): per job, the feature is how
+    many of tokens occur as substrings of the job's field-th text field (a
+    token listed twice counts twice, as in count_hits). The zero-width
+    lookahead alternation, longest token first, finds the longest token
+    starting at every position; any shorter token starting there is a prefix
+    of it, so the tokens contained in each match account for every token
+    present.
+    """
+
+    def __init__(self, groups):
+        self.groups = {name: (field, Counter(t for t in tokens if t)) for name, (field, tokens) in groups.items()}
+        self.tokens = sorted({t for _, members in self.groups.values() for t in members}, key=lambda t: (-len(t), t))
+        self._contains = {u: [t for t in self.tokens if t in u] for u in self.tokens}
+        self._regex = None
+        self._joinable = not any(FIELD_SEPARATOR in t for t in self.tokens)
+        if self.tokens:
+            self._regex = re.compile('(?=(' + '|'.join(re.escape(t) for t in self.tokens) + '))')
+
+    def match(self, fields):
+        """Per field, the set of tokens occurring in it"""
+        found = [set() for _ in fields]
+        if self._regex is None:
+            return found
+        if not self._joinable or any(FIELD_SEPARATOR in f for f in fields):
+            for i, f in enumerate(fields):
+                for m in self._regex.finditer(f):
+                    found[i].update(self._contains[m.group(1)])
+            return found
+        starts = np.cumsum([0] + [len(f) + 1 for f in fields[:-1]]).tolist()
+        # Neither tokens nor fields contain the separator, so no match spans two fields
+        for m in self._regex.finditer(FIELD_SEPARATOR.join(fields)):
+            found[bisect_right(starts, m.start()) - 1].update(self._contains[m.group(1)])
+        return found
+
+    def count(self, rows):
+        """{feature name: int64 array of hit counts}; rows holds per job a tuple of text fields"""
+        counts = {name: np.zeros(len(rows), dtype=np.int64) for name in self.groups}
+        if self._regex is None:
+            return counts
+        for i, fields in enumerate(rows):
+            found = self.match(fields)
+            for name, (field, members) in self.groups.items():
+                counts[name][i] = sum(n for t, n in members.items() if t in found[field])
+        return counts
+
+
+def count_hits(texts, tokens):
+    """Per text, how many of tokens occur in it as substrings"""
+    return TokenMatcher({'hits': (0, tokens)}).count([(text,) for text in texts])['hits']
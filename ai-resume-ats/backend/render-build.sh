@@ -3,5 +3,8 @@
 # Install spaCy model for NLP processing
 python -m spacy download en_core_web_sm
 
+# Build the corpus TF-IDF model used for transform-only scoring
+python tfidf_model.py build --corpus ../frontend/public/internships.json
+
 # Any other post-deployment setup can go here
 echo "Post-deployment setup completed"
\ No newline at end of file
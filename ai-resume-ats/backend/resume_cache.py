@@ -0,0 +1,135 @@
+"""Content-addressed cache for processed resume uploads.
+
+Users re-submit the same PDF/DOCX many times while tweaking skills,
+location or domain. Entries are keyed by a SHA-256 of the uploaded bytes
+(plus the file kind) and hold the extracted text, the cleaned text and the
+extracted keywords per keyword backend, so a repeat submission skips
+parsing and NLP.
+
+The in-memory tier is an LRU bounded by the approximate size of its entries
+in bytes. An optional on-disk tier (one JSON file per entry) survives
+restarts and is shared by every worker on the host.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def resume_cache_key(content, filename=''):
+    """SHA-256 of the uploaded bytes, qualified by how the file will be parsed"""
+    name = (filename or '').lower()
+    kind = 'pdf' if name.endswith('.pdf') else 'docx' if name.endswith('.docx') else 'text'
+    return f"{hashlib.sha256(content).hexdigest()}:{kind}"
+
+
+def _entry_size(entry):
+    return len(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+
+class ResumeCache:
+    """Size-bounded LRU of resume entries with an optional on-disk tier"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, disk_max_entries=10000):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self._entries = OrderedDict()  # key -> (entry, size)
+        self._bytes = 0
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_errors': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        digest = key.replace(':', '-')
+        return os.path.join(self.disk_dir, digest[:2], digest + '.json')
+
+    def _store_memory(self, key, entry):
+        size = _entry_size(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (entry, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.counters['evictions'] += 1
+
+    def get(self, key):
+        """Cached entry dict for key, or None. Callers must not mutate it; use put()."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries.move_to_end(key)
+                self.counters['hits'] += 1
+                return item[0]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), encoding='utf-8') as f:
+                    entry = json.load(f)
+                self._store_memory(key, entry)
+                with self._lock:
+                    self.counters['disk_hits'] += 1
+                return entry
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[ResumeCache] disk read failed: {e}")
+                with self._lock:
+                    self.counters['disk_errors'] += 1
+        with self._lock:
+            self.counters['misses'] += 1
+        return None
+
+    def put(self, key, entry):
+        self._store_memory(key, entry)
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._disk_writes += 1
+            if self._disk_writes % 200 == 0:
+                self._prune_disk()
+        except Exception as e:
+            print(f"[ResumeCache] disk write failed: {e}")
+            with self._lock:
+                self.counters['disk_errors'] += 1
+
+    def _prune_disk(self):
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.path.getatime(path), path))
+                    except OSError:
+                        continue
+        files.sort(reverse=True)
+        for _, path in files[self.disk_max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats['max_bytes'] = self.max_bytes
+        stats['disk_dir'] = self.disk_dir
+        return stats
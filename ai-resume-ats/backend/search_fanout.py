@@ -0,0 +1,138 @@
+"""Run the /recommend search_trace queries, sequentially or concurrently.
+
+Queries are listed in priority order. The sequential mode tries them one by
+one until a query returns jobs. The concurrent mode runs up to
+max_concurrency queries at once and keeps the highest-priority query that
+returned jobs: as soon as it succeeds and every higher-priority query has
+finished, queued lower-priority queries are cancelled and still-running
+ones are discarded (their results still land in the provider cache).
+
+Both modes return (jobs, effective_query, trace) where trace holds one dict
+per query with its latency and outcome. With a request Deadline (see
+deadline.py), no query starts once it has expired, and the concurrent mode
+stops waiting at it; the queries left out get the outcome 'deadline'.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _dedupe(queries):
+    seen = set()
+    unique = []
+    for q in queries:
+        q = (q or '').strip()
+        if q and q.lower() not in seen:
+            seen.add(q.lower())
+            unique.append(q)
+    return unique
+
+
+def _timed_call(fetch_fn, query):
+    start = time.perf_counter()
+    try:
+        jobs = fetch_fn(query)
+        error = None
+    except Exception as e:
+        jobs, error = [], str(e)
+    return jobs or [], error, round((time.perf_counter() - start) * 1000, 1)
+
+
+def _trace_entry(priority, query, outcome, latency_ms=None, jobs=None, error=None):
+    entry = {
+        'query': query,
+        'priority': priority,
+        'outcome': outcome,
+        'latency_ms': latency_ms,
+        'job_count': len(jobs) if jobs else 0,
+    }
+    if error:
+        entry['error'] = error
+    return entry
+
+
+def run_sequential(queries, fetch_fn, deadline=None):
+    """Try queries in order until one returns jobs"""
+    queries = _dedupe(queries)
+    trace = []
+    jobs, effective = [], ''
+    for i, q in enumerate(queries):
+        if jobs:
+            trace.append(_trace_entry(i, q, 'skipped'))
+            continue
+        if deadline is not None and deadline.expired():
+            trace.extend(_trace_entry(j, queries[j], 'deadline') for j in range(i, len(queries)))
+            deadline.degrade('search', f"{len(queries) - i} of {len(queries)} search queries not run")
+            break
+        print(f"Attempting RapidAPI search with: '{q}'")
+        result, error, latency = _timed_call(fetch_fn, q)
+        effective = q
+        outcome = 'error' if error else ('success' if result else 'empty')
+        trace.append(_trace_entry(i, q, outcome, latency, result, error))
+        jobs = result
+    return jobs, effective, trace
+
+
+def run_concurrent(queries, fetch_fn, max_concurrency=4, deadline=None):
+    """Run queries concurrently and keep the highest-priority one that returned jobs"""
+    queries = _dedupe(queries)
+    if not queries:
+        return [], '', []
+    results = {}  # priority -> (jobs, error, latency)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(queries))),
+                                  thread_name_prefix='search-fanout')
+    futures = {executor.submit(_timed_call, fetch_fn, q): i for i, q in enumerate(queries)}
+    pending = set(futures)
+    winner = None
+    cancelled = set()
+    timed_out = False
+    try:
+        while pending:
+            timeout = deadline.remaining() if deadline is not None else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                timed_out = True
+                break
+            for fut in done:
+                results[futures[fut]] = fut.result()
+            # The winner is the first priority with jobs, once all higher priorities have finished
+            for i in range(len(queries)):
+                if i not in results:
+                    break
+                if results[i][0]:
+                    winner = i
+                    break
+            if winner is not None:
+                break
+    finally:
+        for fut in pending:
+            if fut.cancel():
+                cancelled.add(futures[fut])
+        executor.shutdown(wait=False, cancel_futures=True)
+    if timed_out:
+        # Out of time: settle for the highest-priority query that has returned jobs
+        winner = next((i for i in sorted(results) if results[i][0]), None)
+
+    trace = []
+    for i, q in enumerate(queries):
+        if i in results:
+            result, error, latency = results[i]
+            if error:
+                outcome = 'error'
+            elif not result:
+                outcome = 'empty'
+            else:
+                outcome = 'success' if i == winner else 'discarded'
+            trace.append(_trace_entry(i, q, outcome, latency, result, error))
+        elif timed_out:
+            trace.append(_trace_entry(i, q, 'deadline'))
+        else:
+            # Cancelled before it started, or still running and ignored
+            trace.append(_trace_entry(i, q, 'cancelled' if i in cancelled else 'discarded'))
+    if timed_out:
+        unfinished = len(queries) - len(results)
+        deadline.degrade('search', f"stopped waiting for {unfinished} of {len(queries)} search queries")
+
+    if winner is None:
+        return [], queries[-1], trace
+    return results[winner][0], queries[winner], trace
@@ -0,0 +1,201 @@
+"""Skill / technology gazetteer with an Aho-Corasick matcher.
+
+An alternative keyword backend to the spaCy POS + NER path. Known skill
+phrases ("product management", "google analytics", "lean six sigma", ...)
+are compiled once into an Aho-Corasick automaton, so extracting the skills
+of a text is a single linear scan whose cost does not depend on model
+inference, and only real skills (never city names or stray adjectives)
+can end up in missing_keywords.
+
+Phrases come from the built-in seed list, the engine's domain_synonyms,
+optional phrases mined from a job corpus and an optional one-phrase-per-line
+file (SKILL_GAZETTEER_FILE). Mining reads job titles and descriptions only,
+and skips any phrase containing a company or location word of the corpus,
+so 'bangalore karnataka' or 'karnataka product' never become skills.
+"""
+
+import re
+from collections import Counter, deque
+
+SKILL_SEEDS = [
+    # Product / business
+    'product management', 'product strategy', 'product roadmap', 'roadmap planning', 'product design',
+    'product development', 'product launch', 'user research', 'market research', 'market analysis',
+    'competitive analysis', 'business analysis', 'business intelligence', 'requirements gathering',
+    'stakeholder management', 'stakeholder communication', 'go-to-market', 'gtm', 'product-market fit',
+    'customer development', 'customer research', 'user stories', 'user story writing', 'a/b testing',
+    'feature prioritization', 'strategic planning', 'process improvement', 'process optimization',
+    'project management', 'program management', 'operations management', 'supply chain',
+    'vendor management', 'quality assurance', 'lean six sigma', 'six sigma', 'design thinking',
+    'growth hacking', 'business development', 'partnership development', 'financial modeling',
+    'consulting', 'presentation development', 'documentation',
+    # Marketing
+    'digital marketing', 'content strategy', 'content marketing', 'social media marketing',
+    'social media management', 'seo', 'sem', 'email marketing', 'campaign planning',
+    'performance marketing', 'marketing automation', 'performance analytics', 'brand management',
+    # Methodologies / tools
+    'agile', 'scrum', 'kanban', 'jira', 'confluence', 'trello', 'asana', 'notion', 'figma', 'sketch',
+    'adobe xd', 'balsamiq', 'miro', 'excel', 'advanced excel', 'powerpoint', 'google analytics',
+    'mixpanel', 'amplitude', 'tableau', 'power bi', 'looker', 'salesforce', 'hubspot',
+    # Data / engineering
+    'sql', 'mysql', 'postgresql', 'mongodb', 'python', 'java', 'javascript', 'typescript',
+    'c++', 'golang', 'html', 'css', 'react', 'node.js', 'django', 'flask', 'rest api', 'git', 'docker',
+    'kubernetes', 'aws', 'azure', 'gcp', 'linux', 'data analysis', 'data analytics', 'data science',
+    'data engineering', 'data visualization', 'dashboard creation', 'statistics', 'machine learning',
+    'deep learning', 'nlp', 'natural language processing', 'computer vision', 'pandas', 'numpy',
+    'scikit-learn', 'tensorflow', 'pytorch', 'spark', 'hadoop', 'etl', 'analytics',
+    # Design
+    'ux', 'ui', 'ux design', 'ui design', 'ux research', 'wireframing', 'prototyping', 'usability testing',
+]
+
+# Generic job-posting words that should never become skills when mining a corpus
+GENERIC_TERMS = {
+    'intern', 'interns', 'internship', 'internships', 'experience', 'work', 'working', 'opportunity',
+    'role', 'team', 'teams', 'skills', 'strong', 'knowledge', 'required', 'preferred', 'months', 'month',
+    'program', 'summer', 'full', 'time', 'stipend', 'provided', 'available', 'candidate', 'candidates',
+    'company', 'responsibilities', 'include', 'including', 'involving', 'focusing', 'based', 'hands',
+    'graduate', 'students', 'student', 'remote', 'options', 'duration', 'ppo', 'conversion',
+    'the', 'a', 'an', 'and', 'or', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'be',
+    'as', 'from', 'our', 'you', 'your', 'will', 'we', 'this', 'that', 'on', 'into', 'across', 'directly',
+}
+
+
+def normalize_text(text):
+    """Lowercase and turn every non-skill character into a single space.
+
+    '+', '#', '.', '/' and '-' are kept inside tokens so c++, node.js, a/b
+    and go-to-market survive; they are stripped at token edges.
+    """
+    text = re.sub(r'[^a-z0-9+#./\-]+', ' ', str(text or '').lower())
+    tokens = [t.strip('./-') if not t.endswith('++') else t for t in text.split()]
+    return ' '.join(t for t in tokens if t)
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher; find_all is linear in len(text) + matches"""
+
+    def __init__(self, patterns=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self.size = 0
+        for pattern in patterns:
+            self.add(pattern)
+        self.build()
+
+    def add(self, pattern, value=None):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((pattern, value if value is not None else pattern))
+        self.size += 1
+
+    def build(self):
+        """Compute failure links (BFS); call after the last add()"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """Yield (end_index, pattern, value) for every (possibly overlapping) match"""
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern, value in out[node]:
+                yield i, pattern, value
+
+
+class SkillGazetteer:
+    """Compiled set of skill phrases matched on token boundaries"""
+
+    def __init__(self, phrases, aliases=None):
+        self.phrases = set()
+        automaton = AhoCorasick()
+        for phrase in phrases:
+            norm = normalize_text(phrase)
+            if not norm or norm in self.phrases:
+                continue
+            self.phrases.add(norm)
+            # Surrounding spaces anchor matches to whole tokens
+            automaton.add(f" {norm} ", norm)
+            # Also match text that went through clean_text ('node.js' -> 'node js')
+            spaced = ' '.join(re.sub(r'[+#./\-]', ' ', norm).split())
+            if spaced != norm and (' ' in spaced or len(spaced) > 2):
+                automaton.add(f" {spaced} ", norm)
+        for alias, canonical in (aliases or {}).items():
+            norm_alias, norm_canonical = normalize_text(alias), normalize_text(canonical)
+            if norm_alias and norm_canonical:
+                automaton.add(f" {norm_alias} ", norm_canonical)
+        automaton.build()
+        self._automaton = automaton
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def match(self, text):
+        """Skills present in text (list of canonical phrases)"""
+        padded = f" {normalize_text(text)} "
+        return list({value for _, _, value in self._automaton.find_all(padded)})
+
+
+def exclusion_terms(values):
+    """Normalized tokens of company / location values, minus words that occur in a seed skill"""
+    seed_words = {w for phrase in SKILL_SEEDS for w in normalize_text(phrase).split()}
+    return {t for value in values for t in normalize_text(value).split()} - seed_words
+
+
+def mine_corpus_phrases(texts, min_docs=2, max_phrases=500, ngram_range=(2, 3), exclude_terms=()):
+    """Frequent multi-word phrases from job texts, excluding generic posting words and exclude_terms"""
+    excluded = GENERIC_TERMS | set(exclude_terms)
+    doc_counts = Counter()
+    for text in texts:
+        tokens = normalize_text(text).split()
+        seen = set()
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = tokens[i:i + n]
+                if any(t in excluded or t.isdigit() or len(t) < 2 for t in gram):
+                    continue
+                seen.add(' '.join(gram))
+        doc_counts.update(seen)
+    frequent = [(count, phrase) for phrase, count in doc_counts.items() if count >= min_docs]
+    frequent.sort(key=lambda x: (-x[0], x[1]))
+    return [phrase for _, phrase in frequent[:max_phrases]]
+
+
+def load_phrase_file(path):
+    """One phrase per line; blank lines and #-comments ignored"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def build_gazetteer(domain_synonyms=None, corpus_texts=None, extra_phrases=None, min_docs=2, exclude_terms=()):
+    """Gazetteer from the seed list, domain synonyms, mined corpus phrases and extras"""
+    phrases = list(SKILL_SEEDS)
+    for synonyms in (domain_synonyms or {}).values():
+        # Single generic words like 'data' or 'growth' are too broad to count as skills
+        phrases.extend(s for s in synonyms if ' ' in s.strip())
+    if corpus_texts:
+        phrases.extend(mine_corpus_phrases(corpus_texts, min_docs=min_docs, exclude_terms=exclude_terms))
+    phrases.extend(extra_phrases or [])
+    return SkillGazetteer(phrases)
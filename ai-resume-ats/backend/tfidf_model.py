@@ -0,0 +1,364 @@
+"""Corpus-level TF-IDF model for transform-only scoring.
+
+The offline build step fits a TfidfVectorizer on a real job corpus (the
+frontend internships.json snapshot, provider dumps, uploaded job files) and
+saves the vocabulary + IDF weights to a versioned JSON artifact. At request
+time ResumeATSEngine only transforms text with the saved model.
+
+Build a model:
+    python tfidf_model.py build --corpus ../frontend/public/internships.json --corpus dumps/
+
+Optionally (--lsa-components) the build also fits a TruncatedSVD / LSA
+projection of the TF-IDF space, saved next to the JSON as a float32 .npy
+file. model.embed() then maps text to compact dense vectors in which terms
+that co-occur in the corpus (synonyms, related skills) point the same way.
+
+The model directory holds one file per version plus a CURRENT pointer file.
+Writing a new version and flipping CURRENT hot-swaps it into every running
+worker on their next check, without a restart.
+"""
+
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+MODEL_FORMAT = 1
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+CURRENT_POINTER = 'CURRENT'
+# Semantic similarity backends: sparse TF-IDF cosine, or cosine of the dense LSA vectors
+SIMILARITY_BACKENDS = ('tfidf', 'lsa')
+
+
+class CorpusTfidfModel:
+    """Fitted vocabulary + IDF weights that can transform text without refitting"""
+
+    def __init__(self, vocabulary, idf, version, params=None, created_at='', n_docs=0, lsa_components=None):
+        self.vocabulary = list(vocabulary)
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.version = version
+        self.params = params or {}
+        self.created_at = created_at
+        self.n_docs = n_docs
+        ngram_range = tuple(self.params.get('ngram_range', (1, 1)))
+        # A CountVectorizer with a fixed vocabulary needs no fit
+        self._counter = CountVectorizer(
+            vocabulary={term: i for i, term in enumerate(self.vocabulary)},
+            stop_words=self.params.get('stop_words', 'english'),
+            ngram_range=ngram_range,
+        )
+        self._idf_diag = sp.diags(self.idf, format='csr')
+        # n_components x n_terms float32 LSA projection, or None
+        self.lsa_components = lsa_components
+
+    @property
+    def has_lsa(self):
+        return self.lsa_components is not None
+
+    def count(self, texts):
+        """Raw term counts (CSR) of texts over the model vocabulary"""
+        return self._counter.transform(texts)
+
+    def transform_counts(self, counts):
+        """L2-normalized TF-IDF rows for a term count matrix from count()"""
+        counts = counts.astype(np.float64)
+        if self.params.get('sublinear_tf'):
+            counts.data = np.log(counts.data) + 1
+        return normalize(counts @ self._idf_diag, norm='l2', copy=False).tocsr()
+
+    def transform(self, texts):
+        """Return L2-normalized TF-IDF rows (CSR) for texts"""
+        return self.transform_counts(self.count(texts))
+
+    def embed_counts(self, counts):
+        """L2-normalized float32 LSA vectors (n x n_components) for a term count matrix"""
+        dense = np.asarray(self.transform_counts(counts) @ self.lsa_components.T, dtype=np.float32)
+        return normalize(dense, norm='l2', copy=False)
+
+    def embed(self, texts):
+        """L2-normalized float32 LSA vectors for texts (requires has_lsa)"""
+        return self.embed_counts(self.count(texts))
+
+    def to_dict(self):
+        return {
+            'format': MODEL_FORMAT,
+            'version': self.version,
+            'created_at': self.created_at,
+            'n_docs': self.n_docs,
+            'params': self.params,
+            'vocabulary': self.vocabulary,
+            'idf': self.idf.tolist(),
+            'lsa_file': self.lsa_file() if self.has_lsa else None,
+        }
+
+    def lsa_file(self):
+        return f"tfidf-{self.version}.lsa.npy"
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != MODEL_FORMAT:
+            raise ValueError(f"Unsupported TF-IDF model format: {data.get('format')}")
+        return cls(
+            data['vocabulary'], data['idf'], data['version'],
+            params=data.get('params'), created_at=data.get('created_at', ''), n_docs=data.get('n_docs', 0),
+        )
+
+
+def fit_corpus_model(texts, max_features=20000, min_df=1, ngram_range=(1, 2), sublinear_tf=True, version=None,
+                     lsa_components=None):
+    """Fit a CorpusTfidfModel on a list of job texts (plus an LSA projection with lsa_components dimensions)"""
+    params = {
+        'stop_words': 'english',
+        'ngram_range': list(ngram_range),
+        'sublinear_tf': sublinear_tf,
+        'max_features': max_features,
+        'min_df': min_df,
+    }
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=max_features, min_df=min_df,
+                                 ngram_range=tuple(ngram_range), sublinear_tf=sublinear_tf)
+    vectorizer.fit(texts)
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    now = datetime.now(timezone.utc)
+    model = CorpusTfidfModel(
+        terms, vectorizer.idf_, version or now.strftime('%Y%m%d%H%M%S'),
+        params=params, created_at=now.isoformat(), n_docs=len(texts),
+    )
+    if lsa_components:
+        matrix = model.transform(texts)
+        n_components = max(1, min(lsa_components, matrix.shape[1] - 1, matrix.shape[0]))
+        svd = TruncatedSVD(n_components=n_components, random_state=0).fit(matrix)
+        model.lsa_components = svd.components_.astype(np.float32)
+        params['lsa_components'] = n_components
+    return model
+
+
+def pair_tfidf_cosine(counts_a, counts_b, max_features=None):
+    """Cosine similarity of two term Counters, weighted like
+    TfidfVectorizer(max_features=max_features).fit_transform([a, b]) would.
+
+    Lets a document that is only available as accumulated term counts (e.g.
+    the concatenation of a streamed jobs file) be compared without building
+    its text.
+    """
+    totals = counts_a + counts_b
+    terms = sorted(totals, key=lambda t: (-totals[t], t))
+    if max_features:
+        terms = terms[:max_features]
+    vec_a, vec_b = [], []
+    for term in terms:
+        a, b = counts_a.get(term, 0), counts_b.get(term, 0)
+        # Smoothed IDF over the two documents
+        idf = np.log(3 / (1 + (a > 0) + (b > 0))) + 1
+        vec_a.append(a * idf)
+        vec_b.append(b * idf)
+    vec_a, vec_b = np.asarray(vec_a), np.asarray(vec_b)
+    norm = np.linalg.norm(vec_a) * np.linalg.norm(vec_b)
+    return float(vec_a @ vec_b / norm) if norm else 0.0
+
+
+def save_model(model, model_dir=DEFAULT_MODEL_DIR, make_current=True):
+    """Write model as tfidf-<version>.json and optionally point CURRENT at it"""
+    os.makedirs(model_dir, exist_ok=True)
+    filename = f"tfidf-{model.version}.json"
+    path = os.path.join(model_dir, filename)
+    if model.has_lsa:
+        # Written first: a model JSON never points at a missing projection
+        lsa_path = os.path.join(model_dir, model.lsa_file())
+        with open(lsa_path + '.tmp', 'wb') as f:
+            np.save(f, np.asarray(model.lsa_components, dtype=np.float32))
+        os.replace(lsa_path + '.tmp', lsa_path)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(model.to_dict(), f)
+    os.replace(tmp, path)
+    if make_current:
+        set_current_version(model_dir, model.version)
+    return path
+
+
+def set_current_version(model_dir, version):
+    """Atomically point CURRENT at an existing model version"""
+    if not os.path.exists(os.path.join(model_dir, f"tfidf-{version}.json")):
+        raise FileNotFoundError(f"No TF-IDF model version {version} in {model_dir}")
+    tmp = os.path.join(model_dir, CURRENT_POINTER + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(model_dir, CURRENT_POINTER))
+
+
+def load_model(model_dir=DEFAULT_MODEL_DIR, version=None):
+    """Load a specific version, or the one CURRENT points to. Returns None if absent."""
+    if version is None:
+        try:
+            with open(os.path.join(model_dir, CURRENT_POINTER), encoding='utf-8') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+    with open(os.path.join(model_dir, f"tfidf-{version}.json"), encoding='utf-8') as f:
+        data = json.load(f)
+    model = CorpusTfidfModel.from_dict(data)
+    if data.get('lsa_file'):
+        # Memory-mapped: workers share the pages instead of each holding a copy
+        model.lsa_components = np.load(os.path.join(model_dir, data['lsa_file']), mmap_mode='r')
+    return model
+
+
+class TfidfModelRegistry:
+    """Holds the active model and hot-swaps it when CURRENT changes on disk.
+
+    current() re-checks the pointer file at most every check_interval seconds,
+    so a new build becomes active in every worker without restarting them.
+    """
+
+    def __init__(self, model_dir=DEFAULT_MODEL_DIR, check_interval=30.0):
+        self.model_dir = model_dir
+        self.check_interval = check_interval
+        self._model = None
+        self._pointer_mtime = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _pointer_path(self):
+        return os.path.join(self.model_dir, CURRENT_POINTER)
+
+    def reload(self):
+        """Reload the model CURRENT points to; keep the old one on failure"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                mtime = os.stat(self._pointer_path()).st_mtime_ns
+            except FileNotFoundError:
+                self._model, self._pointer_mtime = None, None
+                return None
+            if mtime == self._pointer_mtime:
+                return self._model
+            try:
+                model = load_model(self.model_dir)
+            except Exception as e:
+                print(f"[TF-IDF] failed to load model from {self.model_dir}: {e}")
+                return self._model
+            if model and (not self._model or model.version != self._model.version):
+                print(f"[TF-IDF] loaded corpus model version {model.version} ({len(model.vocabulary)} terms)")
+            self._model, self._pointer_mtime = model, mtime
+            return model
+
+    def current(self):
+        if time.monotonic() - self._last_check >= self.check_interval:
+            return self.reload()
+        return self._model
+
+    def stats(self):
+        model = self._model
+        if not model:
+            return {'loaded': False, 'model_dir': self.model_dir}
+        return {
+            'loaded': True,
+            'version': model.version,
+            'created_at': model.created_at,
+            'n_docs': model.n_docs,
+            'n_terms': len(model.vocabulary),
+            'lsa_components': model.lsa_components.shape[0] if model.has_lsa else None,
+        }
+
+
+def job_text(job, fields=('title', 'company', 'location', 'description')):
+    """Concatenate the title/company/location/description fields (or the given fields) of a raw job dict"""
+    parts = []
+    for field in fields:
+        value = job.get(field)
+        if isinstance(value, dict):
+            value = value.get('display_name') or value.get('name')
+        if value:
+            parts.append(str(value))
+    return ' '.join(parts)
+
+
+def iter_corpus_jobs(path):
+    """Yield raw job dicts from a JSON / NDJSON / CSV file or a directory of them"""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            yield from iter_corpus_jobs(os.path.join(path, name))
+        return
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8', errors='ignore') as f:
+            yield from csv.DictReader(f)
+    elif lower.endswith(('.ndjson', '.jsonl')):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    elif lower.endswith('.json'):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('jobs') or data.get('results') or data.get('data') or [data]
+        for job in data:
+            if isinstance(job, dict):
+                yield job
+
+
+def append_corpus_dump(jobs, source, dump_dir=None):
+    """Append jobs to <dump_dir>/<source>.ndjson for the next offline build.
+
+    Does nothing unless JOB_CORPUS_DIR (or dump_dir) is set.
+    """
+    dump_dir = dump_dir or os.getenv('JOB_CORPUS_DIR')
+    if not dump_dir or not jobs:
+        return
+    try:
+        os.makedirs(dump_dir, exist_ok=True)
+        with open(os.path.join(dump_dir, f"{source}.ndjson"), 'a', encoding='utf-8') as f:
+            for job in jobs:
+                f.write(json.dumps(job) + '\n')
+    except Exception as e:
+        print(f"[TF-IDF] failed to dump corpus jobs: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or activate corpus TF-IDF models')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='fit a model on job corpus files and save a new version')
+    build.add_argument('--corpus', action='append', required=True, help='JSON/NDJSON/CSV file or directory (repeatable)')
+    build.add_argument('--model-dir', default=os.getenv('TFIDF_MODEL_DIR', DEFAULT_MODEL_DIR))
+    build.add_argument('--max-features', type=int, default=20000)
+    build.add_argument('--min-df', type=int, default=1)
+    build.add_argument('--version', default=None)
+    build.add_argument('--lsa-components', type=int, default=0, help='also fit an LSA projection (e.g. 192)')
+    build.add_argument('--no-activate', action='store_true', help='save without pointing CURRENT at it')
+
+    activate = sub.add_parser('activate', help='point CURRENT at an existing version')
+    activate.add_argument('version')
+    activate.add_argument('--model-dir', default=os.getenv('TFIDF_MODEL_DIR', DEFAULT_MODEL_DIR))
+
+    args = parser.parse_args()
+    if args.command == 'activate':
+        set_current_version(args.model_dir, args.version)
+        print(f"CURRENT -> {args.version}")
+        return
+
+    texts = []
+    for path in args.corpus:
+        texts.extend(t for t in (job_text(job) for job in iter_corpus_jobs(path)) if t.strip())
+    if not texts:
+        raise SystemExit('No job texts found in corpus')
+    model = fit_corpus_model(texts, max_features=args.max_features, min_df=args.min_df, version=args.version,
+                             lsa_components=args.lsa_components)
+    path = save_model(model, args.model_dir, make_current=not args.no_activate)
+    print(f"Saved TF-IDF model {model.version}: {len(model.vocabulary)} terms from {len(texts)} jobs -> {path}")
+
+
+if __name__ == '__main__':
+    main()
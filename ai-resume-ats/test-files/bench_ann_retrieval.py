@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: IVF candidate retrieval vs brute force over job TF-IDF vectors
+Synthetic jobs and resumes are L2-normalized sparse TF-IDF rows over a
+20k-term vocabulary, drawn from a topic model (each document mixes one of
+200 topics with background terms), so they cluster like real postings.
+For each corpus size it reports index build time, per-query latency of the
+IVF search and of a brute-force sparse product, and recall@K of the IVF
+candidates against the brute-force top K.
+
+Usage: python bench_ann_retrieval.py [--sizes 100000,1000000,5000000] [--queries 200] [--nprobe 8,16,32]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from ann_index import IVFIndex, exact_top_k, recall_at_k  # noqa: E402
+
+VOCABULARY = 20000
+TOPICS = 200
+TOPIC_TERMS = 300
+TERMS_PER_DOC = 40
+TOPIC_SHARE = 0.5
+
+
+def _topic_model():
+    rng = np.random.default_rng(0)
+    topic_terms = np.stack([rng.choice(VOCABULARY, TOPIC_TERMS, replace=False) for _ in range(TOPICS)])
+    zipf = 1.0 / np.arange(1, TOPIC_TERMS + 1)
+    background = 1.0 / np.arange(1, VOCABULARY + 1)
+    idf = np.log(VOCABULARY / (1 + np.arange(VOCABULARY))) + 1
+    return topic_terms, zipf / zipf.sum(), rng.permutation(VOCABULARY), background / background.sum(), idf
+
+
+def make_vectors(n, seed=0, block_rows=100000):
+    """n synthetic TF-IDF rows (CSR float32, L2-normalized)"""
+    topic_terms, topic_p, background_terms, background_p, idf = _topic_model()
+    rng = np.random.default_rng(seed + 1)
+    blocks = []
+    for start in range(0, n, block_rows):
+        rows = min(block_rows, n - start)
+        topics = rng.integers(0, TOPICS, rows)
+        from_topic = rng.random((rows, TERMS_PER_DOC)) < TOPIC_SHARE
+        topical = topic_terms[topics[:, None], rng.choice(TOPIC_TERMS, (rows, TERMS_PER_DOC), p=topic_p)]
+        general = background_terms[rng.choice(VOCABULARY, (rows, TERMS_PER_DOC), p=background_p)]
+        terms = np.where(from_topic, topical, general)
+        counts = sp.csr_matrix((np.ones(terms.size, dtype=np.float32),
+                                (np.repeat(np.arange(rows), TERMS_PER_DOC), terms.ravel())),
+                               shape=(rows, VOCABULARY))
+        counts.sum_duplicates()
+        weighted = counts.multiply(idf.astype(np.float32)).tocsr()
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        blocks.append(sp.diags(1.0 / np.maximum(norms, 1e-12)).astype(np.float32) @ weighted)
+    return sp.vstack(blocks).tocsr().astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100000,1000000,5000000')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--candidates', type=int, default=300)
+    parser.add_argument('--nprobe', default='8,16,32')
+    args = parser.parse_args()
+
+    queries = make_vectors(args.queries, seed=12345)
+    print(f"{'jobs':>9} {'build s':>8} {'nlist':>6} {'nprobe':>6} {'ivf ms/q':>9} {'exact ms/q':>10} "
+          f"{'speedup':>8} {'recall@' + str(args.k):>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        jobs = make_vectors(size)
+        index = IVFIndex().build(jobs)
+
+        start = time.perf_counter()
+        exact = []
+        for row in range(queries.shape[0]):
+            exact.extend(exact_top_k(jobs, queries[row], args.k))
+        exact_ms = (time.perf_counter() - start) * 1000 / queries.shape[0]
+
+        for nprobe in (int(p) for p in args.nprobe.split(',')):
+            start = time.perf_counter()
+            approx = index.search(queries, args.candidates, nprobe=nprobe)
+            ivf_ms = (time.perf_counter() - start) * 1000 / queries.shape[0]
+            print(f"{size:>9} {index.build_seconds:>8.1f} {index.nlist:>6} {nprobe:>6} {ivf_ms:>9.2f} "
+                  f"{exact_ms:>10.2f} {exact_ms / ivf_ms:>7.1f}x {recall_at_k(approx, exact, args.k):>9.3f}")
+        del jobs, index
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scoring many resumes against one job set
+Compares a loop of per-resume calculate_ats_score + calculate_job_matches
+(what N /recommend_from_jobs requests cost) with one score_resumes call
+(one vectorization of each set + a blocked sparse resume x job product).
+
+Usage: python bench_batch_scoring.py [--resumes 100,1000,5000] [--jobs 500] [--loop-max 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import ResumeATSEngine  # noqa: E402
+from bench_job_matching import make_jobs  # noqa: E402
+
+
+def make_resumes(engine, n):
+    """n synthetic resumes: sample_resume.txt with a random subset of its words"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_resume.txt'), encoding='utf-8') as f:
+        words = engine.clean_text(f.read()).split()
+    rng = random.Random(7)
+    return [' '.join(rng.sample(words, k=max(1, len(words) // 2))) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', default='100,1000,5000')
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--loop-max', type=int, default=200, help='only time the per-resume loop up to this many')
+    args = parser.parse_args()
+
+    engine = ResumeATSEngine()
+    job_texts = make_jobs(engine, args.jobs)
+    print(f"{args.jobs} jobs")
+    print(f"{'resumes':>8} {'loop resumes/s':>15} {'batch resumes/s':>16} {'speedup':>9}")
+    for n in [int(s) for s in args.resumes.split(',') if s.strip()]:
+        resumes = make_resumes(engine, n)
+        loop_rate = None
+        if n <= args.loop_max:
+            start = time.perf_counter()
+            for resume in resumes:
+                engine.calculate_ats_score(resume, job_texts)
+                engine.calculate_job_matches(resume, job_texts)
+            loop_rate = n / (time.perf_counter() - start)
+        _, stats = engine.score_resumes(resumes, job_texts, top_k=args.top_k)
+        batch_rate = stats['resumes_per_second']
+        loop_col = f"{loop_rate:>15.1f}" if loop_rate else f"{'-':>15}"
+        speedup = f"{batch_rate / loop_rate:>8.1f}x" if loop_rate else f"{'-':>9}"
+        print(f"{n:>8} {loop_col} {batch_rate:>16.1f} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyword backends, latency and skill recall
+Compares the spaCy keyword path (POS + NER; the stop-word fallback when
+en_core_web_sm is not installed) with the skill gazetteer backend on a
+held-out set of postings, hand-labelled below. They are not the built-in
+dummy jobs the seed list was written from, and some of their labelled skills
+are in no seed list, so the gazetteer is not scored on its own vocabulary.
+
+recall    = labelled skills found / labelled skills (a multi-word skill counts
+            for the spaCy path when every one of its words was extracted)
+noise     = extracted keywords that are not part of any labelled skill
+latency   = per-document extraction time with the keyword cache disabled
+
+Usage: python bench_keyword_backends.py [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import ResumeATSEngine, nlp  # noqa: E402
+from keywords import KeywordExtractor  # noqa: E402
+
+# Held-out postings and the skills each one names
+POSTINGS = [
+    ("Data Analyst Intern",
+     "Clean and join sales data with SQL and pandas, build weekly reports in Power BI and run cohort "
+     "analysis and A/B testing for the growth team. Familiarity with Looker and regression analysis is a plus."),
+    ("Backend Engineering Intern",
+     "Build REST API services in Django and Flask, write unit tests, containerize them with Docker and deploy "
+     "to AWS. Exposure to Redis caching, PostgreSQL query tuning and CI/CD pipelines is helpful."),
+    ("UX Research Intern",
+     "Plan and run usability testing sessions, synthesize interviews into personas and journey maps, and turn "
+     "findings into wireframes and prototypes in Figma alongside product designers."),
+    ("Finance Intern",
+     "Support budgeting and variance analysis, maintain the financial modeling workbooks in Advanced Excel and "
+     "prepare PowerPoint decks for monthly business reviews."),
+    ("Machine Learning Intern",
+     "Train text classification models with scikit-learn and PyTorch, run feature engineering and "
+     "hyperparameter tuning experiments, and track them for the NLP team."),
+    ("Customer Success Intern",
+     "Own onboarding for new accounts in Salesforce and HubSpot, track churn analysis dashboards and write "
+     "help-center documentation from support tickets."),
+    ("Supply Chain Intern",
+     "Analyse inventory planning and demand forecasting data, support vendor management and map processes for "
+     "process optimization using lean six sigma tools."),
+    ("Content Marketing Intern",
+     "Write blog posts and newsletters for email marketing, do keyword research for SEO, and report on campaigns "
+     "with Google Analytics and Mixpanel."),
+]
+
+LABELS = [
+    ['sql', 'pandas', 'power bi', 'cohort analysis', 'a/b testing', 'looker', 'regression analysis'],
+    ['rest api', 'django', 'flask', 'unit tests', 'docker', 'aws', 'redis', 'postgresql', 'ci/cd'],
+    ['usability testing', 'personas', 'journey maps', 'wireframes', 'prototypes', 'figma'],
+    ['budgeting', 'variance analysis', 'financial modeling', 'advanced excel', 'powerpoint'],
+    ['text classification', 'scikit-learn', 'pytorch', 'feature engineering', 'hyperparameter tuning', 'nlp'],
+    ['onboarding', 'salesforce', 'hubspot', 'churn analysis', 'documentation'],
+    ['inventory planning', 'demand forecasting', 'vendor management', 'process optimization', 'lean six sigma'],
+    ['email marketing', 'keyword research', 'seo', 'google analytics', 'mixpanel'],
+]
+
+def evaluate(extractor, texts, repeat):
+    found = total = noise = 0
+    for keywords, labels in zip(extractor.extract_many(texts), LABELS):
+        keywords = set(keywords)
+        label_words = {w for label in labels for w in label.split()}
+        for label in labels:
+            total += 1
+            if label in keywords or all(w in keywords for w in label.split()):
+                found += 1
+        noise += len([k for k in keywords if k not in labels and k not in label_words])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        extractor.extract_many(texts)
+    per_doc_ms = (time.perf_counter() - start) / (repeat * len(texts)) * 1000
+    return found / total, noise / len(texts), per_doc_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    engine = ResumeATSEngine()
+    texts = [engine.clean_text(f"{title} {description}") for title, description in POSTINGS]
+    backends = {
+        'spacy' if nlp else 'spacy (fallback, no model)': KeywordExtractor(nlp, cache_size=0),
+        'gazetteer': KeywordExtractor(gazetteer=engine.keyword_extractors['gazetteer'].gazetteer, cache_size=0),
+    }
+    print(f"{'backend':<28} {'recall':>7} {'noise/doc':>10} {'ms/doc':>8}")
+    for name, extractor in backends.items():
+        recall, noise, ms = evaluate(extractor, texts, args.repeat)
+        print(f"{name:<28} {recall:>7.2f} {noise:>10.1f} {ms:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
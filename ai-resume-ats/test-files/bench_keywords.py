@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyword extraction throughput (docs/second)
+Compares the previous path (full en_core_web_sm pipeline, one nlp(text) call
+per document) with KeywordExtractor (parser excluded, batched nlp.pipe) and
+with KeywordExtractor on a warm per-text cache.
+
+Usage: python bench_keywords.py [--docs 500] [--batch-size 64] [--n-process 1]
+Requires: python -m spacy download en_core_web_sm
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from keywords import KeywordExtractor, doc_keywords, load_keyword_pipeline  # noqa: E402
+from tfidf_model import iter_corpus_jobs, job_text  # noqa: E402
+
+SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'public', 'internships.json')
+
+
+def make_docs(n):
+    """n distinct job descriptions built by shuffling the snapshot descriptions"""
+    base = [job_text(job) for job in iter_corpus_jobs(SNAPSHOT)]
+    rng = random.Random(7)
+    docs = []
+    for i in range(n):
+        words = base[i % len(base)].split()
+        rng.shuffle(words)
+        docs.append(' '.join(words))
+    return docs
+
+
+def rate(n, seconds):
+    return f"{n / seconds:10.1f} docs/s ({seconds:.2f}s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        import spacy
+        full_nlp = spacy.load('en_core_web_sm')
+    except Exception as e:
+        raise SystemExit(f"en_core_web_sm is required for this benchmark: {e}")
+    trimmed_nlp = load_keyword_pipeline('en_core_web_sm')
+    docs = make_docs(args.docs)
+
+    start = time.perf_counter()
+    for text in docs:
+        doc_keywords(full_nlp(text))
+    print(f"full pipeline, nlp(text) per doc : {rate(len(docs), time.perf_counter() - start)}")
+
+    extractor = KeywordExtractor(trimmed_nlp, batch_size=args.batch_size, n_process=args.n_process)
+    start = time.perf_counter()
+    extractor.extract_many(docs)
+    print(f"trimmed pipeline, nlp.pipe       : {rate(len(docs), time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    extractor.extract_many(docs)
+    print(f"trimmed pipeline, warm cache     : {rate(len(docs), time.perf_counter() - start)}")
+
+
+if __name__ == '__main__':
+    main()
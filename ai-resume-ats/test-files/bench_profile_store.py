@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: profile read latency (microseconds per read)
+Compares ProfileStore reads by email that hit the in-process cache with
+reads that go to SQLite (cache disabled), over a database of --profiles rows.
+
+Usage: python bench_profile_store.py [--profiles 50000] [--reads 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from profile_store import ProfileStore  # noqa: E402
+
+
+def profile(i):
+    return {'name': f'User {i}', 'email': f'user{i}@example.com', 'skills': ['python', 'sql', 'excel'],
+            'education': 'B.Tech Computer Science', 'location': 'Bangalore', 'bio': 'x' * 200}
+
+
+def time_reads(store, emails):
+    start = time.perf_counter()
+    for email in emails:
+        store.get_by_email(email)
+    return (time.perf_counter() - start) / len(emails) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profiles', type=int, default=50000)
+    parser.add_argument('--reads', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'profiles.db')
+        start = time.perf_counter()
+        ProfileStore(path).import_profiles((f'user{i}@example.com', profile(i)) for i in range(args.profiles))
+        print(f"Imported {args.profiles} profiles in {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(7)
+        hot = [f'user{rng.randrange(1000)}@example.com' for _ in range(args.reads)]
+        cold = [f'user{rng.randrange(args.profiles)}@example.com' for _ in range(args.reads)]
+
+        cached = ProfileStore(path, cache_size=10000)
+        time_reads(cached, hot)  # warm
+        print(f"cached reads:   {time_reads(cached, hot):8.1f} us/read")
+        print(f"uncached reads: {time_reads(ProfileStore(path, cache_size=0), cold):8.1f} us/read")
+
+
+if __name__ == '__main__':
+    main()
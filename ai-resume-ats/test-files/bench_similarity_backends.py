@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TF-IDF vs LSA similarity, ranking quality and latency
+Quality: synthetic postings per dummy-job category are drawn from that
+category's vocabulary, split into two disjoint halves. The model (with an
+LSA projection) is fitted on postings using the whole vocabulary, so it can
+learn which words co-occur. Test jobs use only the first half of their
+category's words, and test resumes either the second half ("disjoint":
+same field, different wording) or all of it ("shared"). precision@5 is the
+share of a resume's top 5 jobs that come from its own category.
+
+The synthetic vocabulary has only ~120 terms, so the default projection is
+16-dimensional; on a real corpus (20k terms) use 128-256 as the build does.
+
+Latency: per-resume time to score one resume against N jobs, with the job
+side precomputed (sparse TF-IDF matrix vs contiguous float32 LSA matrix).
+
+Usage: python bench_similarity_backends.py [--components 16] [--jobs 1000,10000,100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import ResumeATSEngine  # noqa: E402
+from tfidf_model import fit_corpus_model  # noqa: E402
+
+
+def category_vocabularies(engine):
+    vocabularies = []
+    for job in engine.get_dummy_jobs():
+        words = engine.clean_text(f"{job['title']} {job['description']}").split()
+        vocabularies.append(sorted({w for w in words if w not in ENGLISH_STOP_WORDS and len(w) > 2}))
+    return vocabularies
+
+
+def documents(rng, vocabulary, n, size=12):
+    return [' '.join(rng.sample(vocabulary, k=min(size, len(vocabulary)))) for _ in range(n)]
+
+
+def precision_at_5(sims, job_labels, query_labels):
+    top = np.argsort(-sims, axis=1, kind='stable')[:, :5]
+    return float(np.mean(job_labels[top] == query_labels[:, None]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--components', type=int, default=16)
+    parser.add_argument('--jobs', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    engine = ResumeATSEngine()
+    rng = random.Random(3)
+    vocabularies = category_vocabularies(engine)
+    halves = []
+    for vocabulary in vocabularies:
+        shuffled = vocabulary[:]
+        rng.shuffle(shuffled)
+        halves.append((shuffled[:len(shuffled) // 2], shuffled[len(shuffled) // 2:]))
+
+    corpus = [doc for vocabulary in vocabularies for doc in documents(rng, vocabulary, 300)]
+    start = time.perf_counter()
+    model = fit_corpus_model(corpus, ngram_range=(1, 1), lsa_components=args.components)
+    print(f"Fitted TF-IDF + LSA ({model.lsa_components.shape[0]} dims) on {len(corpus)} postings "
+          f"in {time.perf_counter() - start:.2f}s\n")
+
+    jobs, job_labels = [], []
+    for label, (first, _) in enumerate(halves):
+        jobs.extend(documents(rng, first, 50, size=8))
+        job_labels.extend([label] * 50)
+    job_labels = np.array(job_labels)
+    tfidf_jobs, lsa_jobs = model.transform(jobs), model.embed(jobs)
+
+    print(f"{'resumes':>10} {'tfidf p@5':>10} {'lsa p@5':>8}")
+    for name, pick in (('disjoint', lambda h, v: h[1]), ('shared', lambda h, v: v)):
+        queries, query_labels = [], []
+        for label, (half, vocabulary) in enumerate(zip(halves, vocabularies)):
+            queries.extend(documents(rng, pick(half, vocabulary), 20, size=8))
+            query_labels.extend([label] * 20)
+        query_labels = np.array(query_labels)
+        tfidf_sims = (model.transform(queries) @ tfidf_jobs.T).toarray()
+        lsa_sims = model.embed(queries) @ lsa_jobs.T
+        print(f"{name:>10} {precision_at_5(tfidf_sims, job_labels, query_labels):>10.3f} "
+              f"{precision_at_5(lsa_sims, job_labels, query_labels):>8.3f}")
+
+    resume = ' '.join(vocabularies[0])
+    print(f"\n{'jobs':>8} {'tfidf ms/resume':>16} {'lsa ms/resume':>14} {'tfidf MB':>9} {'lsa MB':>7}")
+    for n in (int(s) for s in args.jobs.split(',')):
+        texts = [corpus[i % len(corpus)] for i in range(n)]
+        counts = model.count(texts)
+        matrix, embeddings = model.transform_counts(counts), model.embed_counts(counts)
+
+        def time_per_call(fn):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                fn()
+            return (time.perf_counter() - start) * 1000 / args.repeat
+
+        tfidf_ms = time_per_call(lambda: (matrix @ model.transform([resume]).T).toarray())
+        lsa_ms = time_per_call(lambda: embeddings @ model.embed([resume])[0])
+        tfidf_mb = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2 ** 20
+        print(f"{n:>8} {tfidf_ms:>16.3f} {lsa_ms:>14.3f} {tfidf_mb:>9.1f} {embeddings.nbytes / 2 ** 20:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for IVF candidate retrieval
+Run with: python -m pytest test-files/test_ann_index.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from ann_index import IVFIndex, exact_top_k, recall_at_k  # noqa: E402
+from bench_ann_retrieval import make_vectors  # noqa: E402
+
+
+def test_full_probe_equals_brute_force():
+    jobs = make_vectors(2000, seed=1)
+    queries = make_vectors(20, seed=2)
+    index = IVFIndex(nlist=16).build(jobs)
+    assert sorted(index.ids.tolist()) == list(range(2000))
+    approx = index.search(queries, 10, nprobe=16)
+    exact = exact_top_k(jobs, queries, 10)
+    for (a_ids, a_sims), (e_ids, e_sims) in zip(approx, exact):
+        assert np.allclose(a_sims[:10], e_sims, atol=1e-5)
+    assert recall_at_k(approx, exact, 10) == 1.0
+
+
+def test_partial_probe_keeps_high_recall():
+    jobs = make_vectors(5000, seed=3)
+    queries = make_vectors(50, seed=4)
+    index = IVFIndex(nlist=64, nprobe=8).build(jobs)
+    approx = index.search(queries, 200)
+    assert all(len(ids) <= 200 for ids, _ in approx)
+    assert recall_at_k(approx, exact_top_k(jobs, queries, 10), 10) >= 0.9
+    assert index.stats()['jobs'] == 5000
+
+
+def test_empty_rows_and_small_sets():
+    jobs = sp.vstack([make_vectors(5, seed=5), sp.csr_matrix((1, make_vectors(1).shape[1]))]).tocsr()
+    index = IVFIndex(nlist=50).build(jobs)
+    assert index.nlist == 6
+    ids, _ = index.search(make_vectors(1, seed=6), 3, nprobe=6)[0]
+    assert len(ids) == 3
+
+
+def test_score_resumes_uses_ann_for_large_job_sets(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    jobs = [f"{topic} intern role number {i} working on {topic} projects"
+            for i, topic in enumerate(['python backend', 'digital marketing', 'data analytics', 'product design'] * 50)]
+    resumes = ['python backend developer', 'marketing and social media', 'sql data analytics dashboards']
+    exact, exact_stats = engine.score_resumes(resumes, jobs, top_k=5)
+    engine.ann_min_jobs, engine.ann_nprobe = 100, 1000
+    approx, stats = engine.score_resumes(resumes, jobs, top_k=5)
+    assert stats['ann'] and not exact_stats['ann']
+    for a, e in zip(approx, exact):
+        assert a['ats_score'] == e['ats_score']
+        # Equal-scoring jobs may come back in another order (float32 vs float64 rounding)
+        assert np.allclose([m for _, m in a['top_jobs']], [m for _, m in e['top_jobs']], atol=1e-3)
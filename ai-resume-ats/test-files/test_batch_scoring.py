@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for scoring many resumes against one job set
+Run with: python -m pytest test-files/test_batch_scoring.py
+"""
+
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from tfidf_model import TfidfModelRegistry, fit_corpus_model, save_model  # noqa: E402
+
+RESUMES = [
+    "Product management intern with market research, SQL, Python and Agile",
+    "Digital marketing, social media campaigns and Google Analytics",
+    "Operations and supply chain, lean six sigma, vendor management",
+]
+
+
+def engine_and_texts():
+    engine = app_module.ResumeATSEngine()
+    jobs = [engine.clean_text(f"{j['title']} {j['company']['display_name']} {j['description']}")
+            for j in engine.get_dummy_jobs()]
+    return engine, jobs, [engine.clean_text(r) for r in RESUMES]
+
+
+def test_batch_equals_single_resume_path_with_corpus_model(tmp_path):
+    engine, jobs, resumes = engine_and_texts()
+    save_model(fit_corpus_model(jobs + resumes, version='v1'), str(tmp_path))
+    engine.tfidf_models = TfidfModelRegistry(str(tmp_path))
+    results, stats = engine.score_resumes(resumes, jobs, top_k=len(jobs))
+    assert stats['resume_count'] == 3 and stats['resumes_per_second'] > 0
+    for resume, result in zip(resumes, results):
+        assert (result['ats_score'], result['missing_keywords']) == engine.calculate_ats_score(resume, jobs)
+        matches = engine.calculate_job_matches(resume, jobs)
+        assert [j for j, _ in result['top_jobs']] == sorted(range(len(jobs)), key=lambda j: -matches[j])
+        assert all(abs(m - matches[j]) < 1e-9 for j, m in result['top_jobs'])
+
+
+def test_top_k_per_resume_without_model():
+    engine, jobs, resumes = engine_and_texts()
+    results, _ = engine.score_resumes(resumes, jobs, top_k=2, block_size=2)
+    assert [r['top_jobs'][0][0] for r in results] == [0, 2, 3]
+    assert all(len(r['top_jobs']) == 2 for r in results)
+
+
+def test_score_batch_endpoint():
+    client = app_module.app.test_client()
+    jobs = [{'title': j['title'], 'company': j['company']['display_name'], 'description': j['description']}
+            for j in app_module.ats_engine.get_dummy_jobs()]
+    resp = client.post('/score_batch', data={
+        'resumes': [(io.BytesIO(r.encode()), f'r{i}.txt') for i, r in enumerate(RESUMES)],
+        'jobs_file': (io.BytesIO(json.dumps(jobs).encode()), 'jobs.json'),
+        'top_k': '3',
+    })
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert [r['filename'] for r in body['results']] == ['r0.txt', 'r1.txt', 'r2.txt']
+    assert all(len(r['top_jobs']) == 3 for r in body['results'])
+    assert body['job_count'] == len(jobs) and body['resumes_per_second'] > 0
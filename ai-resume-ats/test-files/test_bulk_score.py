@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline bulk scoring CLI
+Run with: python -m pytest test-files/test_bulk_score.py
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import bulk_score  # noqa: E402
+from app import ats_engine  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def restore_parser(monkeypatch):
+    # In-process runs (workers=0) swap the shared engine's document parser for an inline one
+    monkeypatch.setattr(ats_engine, 'document_parser', ats_engine.document_parser)
+
+
+def make_inputs(tmp_path, n=6):
+    resume_dir = tmp_path / 'resumes'
+    (resume_dir / 'batch2').mkdir(parents=True)
+    for i in range(n):
+        folder = resume_dir if i % 2 else resume_dir / 'batch2'
+        (folder / f'r{i}.txt').write_text(f"Intern {i}: SQL, Python, market research, Agile")
+    (resume_dir / 'broken.pdf').write_bytes(b'not a pdf')
+    (resume_dir / 'notes.md').write_text('ignored')
+    jobs = [{'title': j['title'], 'company': j['company']['display_name'], 'description': j['description']}
+            for j in ats_engine.get_dummy_jobs()]
+    jobs_path = tmp_path / 'jobs.json'
+    jobs_path.write_text(json.dumps(jobs))
+    return str(resume_dir), str(jobs_path)
+
+
+def read_ndjson(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_scores_every_resume_once_and_resumes_from_checkpoint(tmp_path):
+    resume_dir, jobs_path = make_inputs(tmp_path)
+    output = str(tmp_path / 'out.ndjson')
+    assert bulk_score.run(resume_dir, jobs_path, output, workers=0, chunk_size=2, top_k=3) == 7
+    rows = read_ndjson(output)
+    assert sorted(r['file'] for r in rows) == sorted(bulk_score.find_resumes(resume_dir))
+    assert next(r for r in rows if r['file'] == 'broken.pdf')['error']
+    scored = [r for r in rows if 'error' not in r]
+    assert all(len(r['top_jobs']) == 3 and 0 <= r['ats_score'] <= 100 for r in scored)
+
+    # Simulate an interrupted run: forget the last three results
+    os.truncate(output, 0)
+    with open(output + '.checkpoint', encoding='utf-8') as f:
+        done = f.readlines()
+    with open(output + '.checkpoint', 'w', encoding='utf-8') as f:
+        f.writelines(done[:4])
+    assert bulk_score.run(resume_dir, jobs_path, output, workers=0, chunk_size=2) == 3
+    assert sorted(r['file'] for r in read_ndjson(output)) == sorted(line.strip() for line in done[4:])
+
+
+def test_csv_output(tmp_path):
+    resume_dir, jobs_path = make_inputs(tmp_path, n=2)
+    output = str(tmp_path / 'out.csv')
+    bulk_score.run(resume_dir, jobs_path, output, workers=0)
+    with open(output, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ','.join(bulk_score.CSV_FIELDS)
+    assert len(lines) == 4
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for /recommend request deadlines
+Run with: python -m pytest test-files/test_deadline.py
+"""
+
+import io
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from deadline import Deadline, parse_budget_ms  # noqa: E402
+from document_parser import DocumentParseAbandoned, DocumentParser  # noqa: E402
+from job_cache import make_cache_key  # noqa: E402
+from search_fanout import run_concurrent, run_sequential  # noqa: E402
+
+RESUME = b"product management intern with market research sql python agile and scrum"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadline_budget_and_degrade_log():
+    clock = FakeClock()
+    deadline = Deadline(2.0, clock=clock)
+    clock.now += 1.5
+    assert deadline.allows(0.5) and not deadline.allows(0.6) and deadline.cap(10) == 0.5
+    deadline.degrade('providers', 'served cached results')
+    clock.now += 1.0
+    assert deadline.expired() and deadline.remaining() == 0
+    report = deadline.to_dict()
+    assert report['budget_ms'] == 2000 and report['elapsed_ms'] == 2500
+    assert report['degraded'] == [{'stage': 'providers', 'reason': 'served cached results', 'at_ms': 1500.0}]
+    assert parse_budget_ms('800', 12000, 30000) == 800
+    assert parse_budget_ms('junk', 12000, 30000) == 12000
+    assert parse_budget_ms('90000', 12000, 30000) == 30000
+
+
+def test_search_queries_stop_at_the_deadline():
+    deadline = Deadline(0.1)
+    fetch = lambda q: time.sleep(0.15) or []
+    jobs, _, trace = run_sequential(['a', 'b', 'c'], fetch, deadline)
+    assert jobs == [] and [t['outcome'] for t in trace] == ['empty', 'deadline', 'deadline']
+    assert deadline.degraded[0]['stage'] == 'search'
+
+    # Concurrent: settle for a lower-priority query that already returned jobs
+    delays = {'slow': (1.0, []), 'fast': (0.01, [{'title': 'Intern'}])}
+    fetch = lambda q: time.sleep(delays[q][0]) or delays[q][1]
+    deadline = Deadline(0.2)
+    start = time.perf_counter()
+    jobs, effective, trace = run_concurrent(['slow', 'fast'], fetch, 2, deadline)
+    assert time.perf_counter() - start < 0.6
+    assert effective == 'fast' and jobs == [{'title': 'Intern'}]
+    assert [t['outcome'] for t in trace] == ['deadline', 'success']
+
+
+def test_short_budget_serves_cached_or_indexed_jobs_without_provider_calls(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setattr(engine, '_fetch_internships_live', lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    cached = [{'title': 'Cached Intern', 'company': {'display_name': 'Acme'}, 'location': {'display_name': 'Pune'},
+               'description': 'product', 'redirect_url': ''}]
+    key = make_cache_key('pune', 'product', 'week')
+    engine.job_cache.put(key, cached, 'week')
+    engine.job_cache._entries[key] = (cached, time.time() - 10 ** 6, 60)  # long expired
+    deadline = Deadline(0.5)
+    assert engine.fetch_internships('pune', 'product', 'week', deadline=deadline) == cached
+    # Nothing cached: ranked from the local job index (seeded with the bundled snapshot)
+    jobs = engine.fetch_internships('india', 'product management', 'month', deadline=deadline)
+    assert jobs and all(isinstance(job['company'], dict) for job in jobs)
+    assert [d['stage'] for d in deadline.degraded] == ['providers', 'providers']
+
+
+def test_live_fetch_is_cut_to_the_request_budget(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setenv('ADZUNA_APP_ID', 'id')
+    monkeypatch.setenv('ADZUNA_APP_KEY', 'key')
+    engine.rapidapi_key = 'key'
+    engine.deadline_scoring_reserve = 0.1
+    slow = lambda *args: time.sleep(2) or []
+    monkeypatch.setattr(engine, '_fetch_adzuna', slow)
+    monkeypatch.setattr(engine, '_fetch_rapidapi', slow)
+    deadline = Deadline(0.4)
+    start = time.perf_counter()
+    engine._fetch_internships_live('pune', 'product', 'week', deadline=deadline)
+    assert time.perf_counter() - start < 1.0
+    assert {d['stage'] for d in deadline.degraded} == {'providers'} and len(deadline.degraded) == 2
+
+
+def test_parse_out_of_budget_falls_back_to_form_fields(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+
+    def slow(content, filename, timeout=None):
+        time.sleep(timeout)
+        raise DocumentParseAbandoned(f"document parsing ran out of the caller's {timeout:g}s budget")
+
+    monkeypatch.setattr(engine, 'extract_resume_text', slow)
+    engine.deadline_parse_min = 0.05
+    deadline = Deadline(0.1)
+    text, keywords = engine.prepare_resume(b'%PDF-1.4', 'cv.pdf', skills='python, sql', deadline=deadline)
+    assert text.split() == ['python', 'sql'] and deadline.degraded[0]['stage'] == 'parse'
+
+
+def test_short_budget_never_resets_the_shared_parser_pool(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setattr(engine, 'extract_resume_text', lambda *a: (_ for _ in ()).throw(AssertionError('submitted')))
+    deadline = Deadline(0.001)
+    text, _ = engine.prepare_resume(b'%PDF-1.4 x', 'cv.pdf', skills='python', deadline=deadline)
+    assert text == 'python' and deadline.degraded[0]['stage'] == 'parse'
+
+    parser = DocumentParser(workers=1, timeout=30)
+    try:
+        start = time.perf_counter()
+        with pytest.raises(DocumentParseAbandoned):
+            parser.run(time.sleep, 1, timeout=0.1)
+        assert time.perf_counter() - start < 0.9
+        stats = parser.stats()
+        assert stats['abandoned'] == 1 and stats['pool_restarts'] == 0 and stats['timeouts'] == 0
+        assert parser.run(sum, [1, 2]) == 3
+    finally:
+        parser.close()
+
+
+def test_recommend_reports_degraded_stages(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setattr(app_module, 'ats_engine', engine)
+    monkeypatch.setattr(engine, '_fetch_internships_live', lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    client = app_module.app.test_client()
+    resp = client.post('/recommend', data={
+        'resume': (io.BytesIO(RESUME), 'resume.txt'),
+        'skills': 'product management',
+        'location': 'india',
+        'budget_ms': '500',
+    })
+    body = resp.get_json()
+    assert resp.status_code == 200 and body['recommendations']
+    assert body['deadline']['budget_ms'] == 500
+    assert {d['stage'] for d in body['deadline']['degraded']} >= {'providers'}
+
+
+def test_background_refresh_does_not_inherit_the_request_deadline(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    calls = []
+    monkeypatch.setattr(engine, '_fetch_internships_live',
+                        lambda *args, timings=None, deadline=None, **kwargs: calls.append((timings, deadline)) or [])
+    stale = [{'title': 'Stale Intern', 'company': {'display_name': 'Acme'}, 'location': {'display_name': 'Pune'},
+              'description': 'product', 'redirect_url': ''}]
+    key = make_cache_key('pune', 'product', 'week')
+    engine.job_cache.put(key, stale, 'week')
+    engine.job_cache._entries[key] = (stale, time.time() - engine.job_cache.ttl_for('week') - 1, engine.job_cache.ttl_for('week'))
+    timings, deadline = [], Deadline(5.0)
+    assert engine.fetch_internships('pune', 'product', 'week', timings=timings, deadline=deadline) == stale
+    wait_until = time.time() + 2
+    while not calls and time.time() < wait_until:
+        time.sleep(0.01)
+    assert calls and calls[0][1] is None and calls[0][0] is not timings
+
+
+def test_fetch_cut_short_is_not_cached(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setenv('ADZUNA_APP_ID', 'id')
+    monkeypatch.setenv('ADZUNA_APP_KEY', 'key')
+    engine.rapidapi_key = 'key'
+    engine.deadline_scoring_reserve = 0.1
+    engine.deadline_provider_min = 0.1
+    job = {'title': 'PM Intern', 'company': {'display_name': 'Acme'}, 'location': {'display_name': 'Pune'},
+           'description': 'product', 'redirect_url': 'https://example.com/pm'}
+    slow = lambda *args: time.sleep(0.5) or [job]
+    monkeypatch.setattr(engine, '_fetch_adzuna', slow)
+    monkeypatch.setattr(engine, '_fetch_rapidapi', slow)
+    assert engine.fetch_internships('pune', 'product', 'week', deadline=Deadline(0.3)) == []
+    assert engine.job_cache.peek(make_cache_key('pune', 'product', 'week')) is None
+    # The next request, with its full budget, goes to the providers rather than the short one's result
+    jobs = engine.fetch_internships('pune', 'product', 'week', deadline=Deadline(5.0))
+    assert [j['title'] for j in jobs] == ['PM Intern']
+    assert engine.job_cache.stats()['uncached'] == 1
+
+    # Cut off by provider_deadline (no request deadline): the partial result is not cached either
+    engine.provider_deadline = 0.2
+    monkeypatch.setattr(engine, '_fetch_adzuna', lambda *args: [dict(job, title='Fast Intern')])
+    assert [j['title'] for j in engine.fetch_internships('pune', 'data', 'week')] == ['Fast Intern']
+    assert engine.job_cache.peek(make_cache_key('pune', 'data', 'week')) is None
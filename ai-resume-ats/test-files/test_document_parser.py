@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for out-of-process resume parsing
+Run with: python -m pytest test-files/test_document_parser.py
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+
+import pytest
+from docx import Document
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+import document_parser  # noqa: E402
+from document_parser import DocumentParser, DocumentParseTimeout  # noqa: E402
+
+
+def docx_bytes(lines):
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_docx_parsed_in_pool():
+    parser = DocumentParser(workers=1, timeout=30)
+    try:
+        assert parser.parse(docx_bytes(['Jane Doe', 'SQL, Python']), 'docx') == 'Jane Doe\nSQL, Python'
+        assert parser.parse(b'not a docx', 'docx') == ''
+    finally:
+        parser.close()
+
+
+def test_timeout_raises_and_pool_recovers():
+    parser = DocumentParser(workers=1, timeout=0.5)
+    try:
+        start = time.perf_counter()
+        with pytest.raises(DocumentParseTimeout):
+            parser.run(time.sleep, 10)
+        assert time.perf_counter() - start < 5
+        assert parser.run(sum, [1, 2]) == 3
+        assert parser.stats()['timeouts'] == 1
+    finally:
+        parser.close()
+
+
+def test_parse_timeout_is_a_client_error(monkeypatch):
+    def slow(*args):
+        raise DocumentParseTimeout('document parsing exceeded 15s')
+    monkeypatch.setattr(app_module.ats_engine, 'extract_resume_text', slow)
+    client = app_module.app.test_client()
+    resp = client.post('/recommend', data={'resume': (io.BytesIO(b'%PDF-1.4 slow'), 'slow.pdf')})
+    assert resp.status_code == 422
+    assert 'exceeded' in resp.get_json()['error']
+
+
+def test_inline_timeout_in_main_thread():
+    parser = DocumentParser(workers=0, timeout=0.3)
+    with pytest.raises(DocumentParseTimeout):
+        parser.run(time.sleep, 5)
+    assert parser.run(sum, [1, 2]) == 3
+
+
+def test_inline_timeout_inside_an_extractor_is_not_swallowed(monkeypatch):
+    # The extractors turn unreadable documents into ''; a timeout raised inside them must still surface
+    monkeypatch.setattr(document_parser.PyPDF2, 'PdfReader', lambda stream: time.sleep(5))
+    parser = DocumentParser(workers=0, timeout=0.3)
+    start = time.perf_counter()
+    with pytest.raises(DocumentParseTimeout):
+        parser.parse(b'%PDF-1.4 slow', 'pdf')
+    assert time.perf_counter() - start < 2 and parser.stats()['timeouts'] == 1
+
+
+def test_queue_wait_does_not_count_towards_the_timeout():
+    # One worker, three 0.4s parses at once: the last waits 0.8s in the queue but runs well within 0.6s
+    parser = DocumentParser(workers=1, timeout=0.6)
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(parser.run(time.sleep, 0.4) is None))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [True] * 3
+        assert parser.stats()['timeouts'] == 0 and parser.stats()['pool_restarts'] == 0
+    finally:
+        parser.close()
+
+
+def test_parses_queued_behind_a_timeout_are_resubmitted():
+    parser = DocumentParser(workers=1, timeout=0.5)
+    try:
+        results, errors = [], []
+
+        def parse(seconds):
+            try:
+                results.append(parser.run(time.sleep, seconds))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=parse, args=(seconds,)) for seconds in (10, 0.01, 0.01, 0.01, 0.01)]
+        threads[0].start()
+        time.sleep(0.2)  # the slow parse is running; the quick ones queue behind it
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [None] * 4
+        assert len(errors) == 1 and isinstance(errors[0], DocumentParseTimeout)
+        assert parser.stats()['timeouts'] == 1
+    finally:
+        parser.close()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+In-process tests for ResumeATSEngine scoring helpers
+Run with: python -m pytest test-files/test_engine.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import ResumeATSEngine  # noqa: E402
+
+engine = ResumeATSEngine()
+RESUME = engine.clean_text("Product management intern with market research, SQL, Python, Agile and Scrum experience")
+
+
+def job_texts():
+    texts = []
+    for job in engine.get_dummy_jobs():
+        texts.append(engine.clean_text(f"{job['title']} {job['company']['display_name']} {job['location']['display_name']} {job['description']}"))
+    return texts
+
+
+def test_batch_matches_align_with_jobs():
+    texts = job_texts()
+    matches = engine.calculate_job_matches(RESUME, texts)
+    assert len(matches) == len(texts)
+    assert all(0 <= m <= 100 for m in matches)
+    # The product management posting should outrank the operations trainee one
+    assert matches[0] > matches[3]
+
+
+def test_batch_matches_empty():
+    assert engine.calculate_job_matches(RESUME, []) == []
+
+
+def test_keyword_batch_matches_single_extraction():
+    texts = job_texts()
+    batch = engine.extract_keywords_batch(texts + [texts[0]])
+    assert sorted(batch[0]) == sorted(engine.extract_keywords(texts[0]))
+    assert sorted(batch[-1]) == sorted(batch[0])
+    stats = engine.keyword_extractor.stats()
+    assert stats['hits'] >= 1
+
+
+def test_gazetteer_keyword_backend_limits_missing_keywords_to_skills():
+    texts = job_texts()
+    _, missing = engine.calculate_ats_score(RESUME, texts, keyword_backend='gazetteer')
+    assert missing
+    assert all(k in engine.keyword_extractors['gazetteer'].gazetteer.phrases for k in missing)
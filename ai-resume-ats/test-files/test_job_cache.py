@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the provider response cache (TTL, LRU, stale refresh, shared tier)
+Run with: python -m pytest test-files/test_job_cache.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from job_cache import JobSearchCache, SQLiteCacheBackend, Uncached, make_cache_key  # noqa: E402
+
+
+class Counter:
+    def __init__(self, value):
+        self.calls = 0
+        self.value = value
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_fresh_hit_skips_fetch():
+    cache = JobSearchCache()
+    fetch = Counter([{'title': 'PM Intern'}])
+    key = make_cache_key('Bangalore', 'Product ', 'week')
+    assert cache.get_or_fetch(key, fetch, 'week') == fetch.value
+    assert cache.get_or_fetch(make_cache_key('bangalore', 'product', 'week'), fetch, 'week') == fetch.value
+    assert fetch.calls == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_lru_bound_evicts_oldest():
+    cache = JobSearchCache(max_entries=2)
+    for name in ('a', 'b', 'c'):
+        cache.put(name, [name], 'week')
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_stale_entry_served_while_refreshing():
+    cache = JobSearchCache(ttls={'week': 0}, stale_ttl=60)
+    cache.put('k', ['old'], 'week')
+    fetch = Counter(['new'])
+    assert cache.get_or_fetch('k', fetch, 'week') == ['old']
+    deadline = time.time() + 2
+    while cache.stats()['refreshes'] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert fetch.calls == 1
+    assert cache.stats()['stale_hits'] == 1
+
+
+def test_empty_refresh_keeps_stale_entry():
+    cache = JobSearchCache(ttls={'week': 0}, stale_ttl=60, negative_ttl=60)
+    cache.put('k', ['old'], 'week')
+    assert cache.get_or_fetch('k', Counter([]), 'week') == ['old']
+    deadline = time.time() + 2
+    while cache.stats()['refresh_empty'] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()['refresh_empty'] == 1 and cache.stats()['refreshes'] == 0
+    assert cache._entries['k'][0] == ['old'] and cache._entries['k'][2] == 0
+    assert cache.get_or_fetch('k', Counter(['new']), 'week') == ['old']
+
+
+def test_uncached_results_are_returned_but_not_stored():
+    cache = JobSearchCache(ttls={'week': 0}, stale_ttl=60)
+    assert cache.get_or_fetch('k', Counter(Uncached(['partial'])), 'week') == ['partial']
+    assert 'k' not in cache._entries and cache.stats()['uncached'] == 1
+    # A refresh cut short keeps the stale entry
+    cache.put('k', ['old'], 'week')
+    assert cache.get_or_fetch('k', Counter(Uncached(['partial'])), 'week') == ['old']
+    deadline = time.time() + 2
+    while cache.stats()['uncached'] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache._entries['k'][0] == ['old'] and cache.stats()['refreshes'] == 0
+
+
+def test_empty_results_use_negative_ttl():
+    cache = JobSearchCache(negative_ttl=0)
+    fetch = Counter([])
+    cache.get_or_fetch('k', fetch, 'week')
+    cache.get_or_fetch('k', fetch, 'week')
+    assert fetch.calls == 2
+
+
+def test_shared_sqlite_backend_between_instances(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    worker_a = JobSearchCache(backend=SQLiteCacheBackend(path))
+    worker_b = JobSearchCache(backend=SQLiteCacheBackend(path))
+    worker_a.put('k', ['job'], 'week')
+    fetch = Counter(['other'])
+    assert worker_b.get_or_fetch('k', fetch, 'week') == ['job']
+    assert fetch.calls == 0
+    assert worker_b.stats()['shared_hits'] == 1
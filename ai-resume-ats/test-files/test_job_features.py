@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-job feature store
+Run with: python -m pytest test-files/test_job_features.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from job_features import JobFeatureStore, job_id  # noqa: E402
+from tfidf_model import TfidfModelRegistry, fit_corpus_model, save_model  # noqa: E402
+
+RESUME = "product management intern with market research sql python agile and scrum"
+
+
+def engine_and_recs():
+    engine = app_module.ResumeATSEngine()
+    return engine, [app_module.format_provider_job(job) for job in engine.get_dummy_jobs()]
+
+
+def test_store_expires_and_evicts():
+    store = JobFeatureStore(max_entries=2)
+    store.put('a', {'text': 'a'}, ttl=0)
+    assert store.get('a') is None and store.stats()['expired'] == 1
+    for key in 'bcd':
+        store.put(key, {'text': key})
+    assert store.get('b') is None and store.get('d') == {'text': 'd'}
+    assert store.stats()['evictions'] == 1
+
+
+def test_job_id_follows_dedupe_key():
+    assert job_id(' PM Intern', 'Acme', 'Pune', 'desc') == job_id('pm intern', 'ACME ', 'pune', 'desc')
+    assert job_id('PM Intern', 'Acme', 'Pune', 'desc') != job_id('PM Intern', 'Acme', 'Pune', 'other')
+
+
+def test_features_are_computed_once(monkeypatch):
+    engine, recs = engine_and_recs()
+    first = engine.job_features(recs, keyword_backend='gazetteer')
+    monkeypatch.setattr(engine, 'extract_keywords_batch', lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    monkeypatch.setattr(engine, 'clean_text', lambda *a: (_ for _ in ()).throw(AssertionError))
+    again = engine.job_features(recs, keyword_backend='gazetteer')
+    assert all(a is b for a, b in zip(first, again))
+    assert first[0]['text'] == app_module.ResumeATSEngine().clean_text(
+        f"{recs[0]['title']} {recs[0]['company']} {recs[0]['location']} {recs[0]['description']}")
+
+
+def test_scores_match_text_path_without_model():
+    engine, recs = engine_and_recs()
+    features = engine.job_features(recs)
+    texts = [f['text'] for f in features]
+    ats, missing, matches = engine.score_job_features(RESUME, features)
+    assert (ats, missing) == engine.calculate_ats_score(RESUME, texts)
+    assert matches == engine.calculate_job_matches(RESUME, texts)
+
+
+def test_scores_use_stored_counts_with_corpus_model(tmp_path):
+    engine, recs = engine_and_recs()
+    texts = [f['text'] for f in engine.job_features(recs)]
+    save_model(fit_corpus_model(texts, ngram_range=(1, 1), version='v1'), str(tmp_path))
+    engine.tfidf_models = TfidfModelRegistry(str(tmp_path))
+    features = engine.job_features(recs)
+    assert all(f['model_version'] == 'v1' for f in features)
+    ats, missing, matches = engine.score_job_features(RESUME, features)
+    assert (ats, missing) == engine.calculate_ats_score(RESUME, texts)
+    assert all(abs(a - b) < 1e-9 for a, b in zip(matches, engine.calculate_job_matches(RESUME, texts)))
+
+
+def test_fetched_jobs_are_ingested_with_provider_ttl(monkeypatch):
+    engine, recs = engine_and_recs()
+    jobs = engine.get_dummy_jobs()[:3]
+    for job in jobs:
+        job['title'] += ' (live)'
+    monkeypatch.setattr(engine, '_fetch_internships_live', lambda *a, **k: jobs)
+    engine.fetch_internships(keyword='ingest-test', time_filter='24h')
+    rec = app_module.format_provider_job(jobs[0])
+    key = job_id(rec['title'], rec['company'], rec['location'], rec['description'])
+    _, expires_at = engine.job_feature_store._entries[key]
+    assert abs(expires_at - time.monotonic() - engine.job_cache.ttl_for('24h')) < 5
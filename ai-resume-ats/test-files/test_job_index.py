@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the local job index behind /search_jobs
+Run with: python -m pytest test-files/test_job_index.py
+"""
+
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from job_index import JobIndex, parse_posted_at, parse_refresh_queries, tokenize  # noqa: E402
+
+NOW = 1_700_000_000.0
+DAY = 24 * 3600
+
+
+def job(title, company='Acme', location='Pune, Maharashtra', description='', **extra):
+    return dict(title=title, company=company, location=location, description=description, apply_link='#', **extra)
+
+
+def test_tokenize_keeps_tech_tokens():
+    assert tokenize('C++ and Node.js, for the Data-Science team.') == ['c++', 'node.js', 'data', 'science', 'team']
+
+
+def test_parse_posted_at():
+    assert parse_posted_at('2023-11-14T22:13:20Z') == NOW
+    assert parse_posted_at(NOW * 1000) == NOW
+    assert parse_posted_at('yesterday') is None and parse_posted_at('') is None
+
+
+def test_bm25_ranks_title_matches_first_and_paginates():
+    index = JobIndex()
+    index.add([
+        job('Marketing Intern', description='python scripts for campaigns'),
+        job('Python Developer Intern', description='python backend services'),
+        job('Sales Intern', description='no match here'),
+    ], source='upload', now=NOW)
+    hits, total = index.search('python', now=NOW)
+    assert total == 2
+    assert [h['title'] for h in hits] == ['Python Developer Intern', 'Marketing Intern']
+    assert hits[0]['relevance'] > hits[1]['relevance'] > 0
+    page2, total = index.search('python', page=2, page_size=1, now=NOW)
+    assert total == 2 and [h['title'] for h in page2] == ['Marketing Intern']
+
+
+def test_location_filter_uses_field_aliases_and_query_hints():
+    index = JobIndex(location_aliases={'pune': ('india',)})
+    index.add([job('Data Intern', location='Pune, Maharashtra')], source='upload', now=NOW)
+    index.add([job('Data Intern', location='Remote')], query='data', location='India', time_filter='week', now=NOW)
+    index.add([job('Data Intern', location='London')], source='upload', now=NOW)
+    hits, total = index.search('data', location='india', now=NOW)
+    assert total == 2 and {h['location'] for h in hits} == {'Pune, Maharashtra', 'Remote'}
+    assert index.search('data', location='pune', now=NOW)[1] == 1
+
+
+def test_time_filters():
+    index = JobIndex()
+    index.add([job('Dated Intern', posted_at=NOW - 3 * DAY)], source='upload', now=NOW)
+    index.add([job('Weekly Pull Intern')], query='intern', time_filter='week', now=NOW)
+    index.add([job('Daily Pull Intern')], query='intern', time_filter='24h', now=NOW)
+    index.add([job('Undated Upload Intern'), job('Undated Snapshot Intern')], source='upload', now=NOW)
+
+    def titles(time_filter, now=NOW):
+        return {h['title'] for h in index.search('intern', time_filter=time_filter, now=now)[0]}
+
+    assert titles('24h') == {'Daily Pull Intern'}
+    assert titles('week') == {'Dated Intern', 'Weekly Pull Intern', 'Daily Pull Intern'}
+    assert titles('week', now=NOW + 5 * DAY) == {'Weekly Pull Intern', 'Daily Pull Intern'}
+    assert titles('month', now=NOW + 40 * DAY) == set()
+    assert 'Undated Upload Intern' in titles(None)
+
+    # Once a provider pull returns an undated job, its age is bounded by that pull
+    index.add([job('Undated Upload Intern')], query='intern', time_filter='24h', now=NOW)
+    assert 'Undated Upload Intern' in titles('24h') and 'Undated Snapshot Intern' not in titles('month')
+
+
+def test_dedupes_and_evicts_oldest():
+    index = JobIndex(max_docs=2)
+    assert index.add([job('Alpha Intern'), job('alpha intern ')], source='upload', now=NOW) == 1
+    index.add([job('Beta Intern'), job('Gamma Intern')], source='upload', now=NOW)
+    assert len(index) == 2
+    assert index.search('alpha', now=NOW)[1] == 0
+    stats = index.stats()
+    assert stats['evicted'] == 1 and stats['updated'] == 1 and stats['sources'] == {'upload': 2}
+
+
+def test_uploads_never_evict_provider_jobs():
+    index = JobIndex(max_docs=3)
+    index.add([job('Alpha Intern'), job('Beta Intern')], query='intern', time_filter='week', now=NOW)
+    index.add([job(f'Upload {i} Intern') for i in range(5)], source='upload', now=NOW)
+    assert len(index) == 3 and index.stats()['sources'] == {'provider': 2, 'upload': 1}
+    assert [h['title'] for h in index.search('upload', now=NOW)[0]] == ['Upload 4 Intern']
+    # Provider pulls still push out the oldest documents of any source
+    index.add([job('Gamma Intern'), job('Delta Intern')], query='intern', time_filter='week', now=NOW)
+    assert index.stats()['sources'] == {'provider': 2, 'upload': 1} and index.search('alpha beta', now=NOW)[1] == 0
+
+
+def test_refresh_queries():
+    assert parse_refresh_queries('python@india; data science@pune@24h;') == [
+        ('python', 'india', 'week'), ('data science', 'pune', '24h')]
+
+
+def test_search_route_answers_from_index_then_falls_back(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setattr(app_module, 'ats_engine', engine)
+    live_calls = []
+
+    def fake_live(location='india', keyword='', time_filter='week', attempt=1, timings=None, deadline=None,
+                  outcome=None):
+        live_calls.append(keyword)
+        if keyword != 'quantum':
+            return []
+        return [{'title': 'Quantum Research Intern', 'company': {'display_name': 'Qubit Labs'},
+                 'location': {'display_name': 'Bengaluru'}, 'description': 'quantum computing research',
+                 'redirect_url': 'https://example.com/q'}]
+
+    monkeypatch.setattr(engine, '_fetch_internships_live', fake_live)
+    client = app_module.app.test_client()
+
+    data = client.get('/search_jobs?keyword=quantum&location=india').get_json()
+    assert data['source'] == 'live' and live_calls == ['quantum']
+    assert [j['title'] for j in data['jobs']] == ['Quantum Research Intern']
+
+    data = client.get('/search_jobs?keyword=quantum&location=india').get_json()
+    assert data['source'] == 'index' and live_calls == ['quantum']
+
+    # Static snapshot jobs never answer a time-filtered search on their own: providers are asked first,
+    # and the snapshot is served only when they have nothing matching
+    for time_filter in ('24h', 'week'):
+        data = client.get(f'/search_jobs?keyword=product%20management&location=india&time_filter={time_filter}'
+                          f'&page_size=2').get_json()
+        assert live_calls[-1] == 'product management' and data['source'] == 'snapshot'
+    assert len(live_calls) == 3
+    assert len(data['jobs']) == 2 and data['total_results'] > 2
+    assert data['jobs'][0]['title'] == 'Product Management Intern' and data['jobs'][0]['match_percent'] != '85%'
+
+
+def test_uploaded_dated_jobs_answer_time_filtered_searches(monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setattr(app_module, 'ats_engine', engine)
+    live_calls = []
+    monkeypatch.setattr(engine, '_fetch_internships_live', lambda *a, **k: live_calls.append(a) or [])
+    recent = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() - 3600))
+    jobs = [
+        {'title': 'Robotics Intern', 'company': 'Servo', 'location': 'Pune', 'description': 'robotics ros',
+         'date_posted': recent},
+        {'title': 'Robotics Research Intern', 'company': 'Servo', 'location': 'Pune', 'description': 'robotics'},
+    ]
+    client = app_module.app.test_client()
+    resp = client.post('/recommend_from_jobs', data={
+        'resume': (io.BytesIO(b'robotics ros python'), 'resume.txt'),
+        'jobs_file': (io.BytesIO(json.dumps(jobs).encode()), 'jobs.json'),
+    })
+    assert resp.status_code == 200
+    data = client.get('/search_jobs?keyword=robotics&location=pune&time_filter=24h').get_json()
+    assert data['source'] == 'index' and not live_calls
+    # The undated upload has no known age and matches no time filter
+    assert [j['title'] for j in data['jobs']] == ['Robotics Intern']
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for memory-mapped job snapshots
+Run with: python -m pytest test-files/test_job_snapshot.py
+"""
+
+import io
+import mmap
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from job_snapshot import JobSnapshot, JobSnapshotRegistry, prune_snapshots, write_snapshot  # noqa: E402
+from tfidf_model import fit_corpus_model, save_model  # noqa: E402
+
+RESUMES = [
+    "product management intern with market research sql python agile and scrum",
+    "data science machine learning python pandas statistics deep learning",
+]
+
+
+def is_mapped(array):
+    """True if array is a view of a memory-mapped file"""
+    while array is not None and not isinstance(array, mmap.mmap):
+        array = getattr(array, 'base', None)
+    return array is not None
+
+
+def build(tmp_path, version='v1', ivf_min_jobs=None, lsa_components=None):
+    engine = app_module.ResumeATSEngine()
+    jobs = [app_module.format_provider_job(job) for job in engine.get_dummy_jobs()]
+    texts = [engine.clean_text(f"{j['title']} {j['company']} {j['location']} {j['description']}") for j in jobs]
+    model = fit_corpus_model(texts, ngram_range=(1, 1), version='m1', lsa_components=lsa_components)
+    save_model(model, str(tmp_path / 'models'))
+    required = {b: set().union(*engine.extract_keywords_batch(texts, b)) for b in engine.keyword_extractors}
+    path = write_snapshot(str(tmp_path / 'snapshots'), jobs, texts, model, version=version,
+                          required_skills=required, ivf_min_jobs=ivf_min_jobs)
+    registry = JobSnapshotRegistry(str(tmp_path / 'snapshots'), str(tmp_path / 'models'), check_interval=0)
+    return engine, jobs, texts, model, path, registry
+
+
+def test_snapshot_round_trips_memory_mapped(tmp_path):
+    engine, jobs, texts, model, path, registry = build(tmp_path, lsa_components=4)
+    snapshot = registry.current()
+    assert isinstance(snapshot, JobSnapshot) and snapshot.version == 'v1' and len(snapshot) == len(jobs)
+    # The CSR arrays are views of the mapped files, not private copies
+    for array in (snapshot.matrix.data, snapshot.matrix.indices, snapshot.matrix.indptr, snapshot.embeddings):
+        assert is_mapped(array) and not array.flags.writeable
+    expected = model.transform(texts)
+    assert np.allclose(snapshot.matrix.toarray(), expected.toarray(), atol=1e-6)
+    assert snapshot[0] == {f: jobs[0][f] for f in ('title', 'company', 'location', 'description', 'apply_link')}
+    assert snapshot.required_skills(engine.resolve_keyword_backend(None))
+    assert registry.stats()['loaded'] and registry.stats()['jobs'] == len(jobs)
+
+
+def test_snapshot_scores_like_the_uploaded_jobs(tmp_path):
+    engine, _, texts, model, _, registry = build(tmp_path)
+    engine.tfidf_models.current = lambda: model
+    job_set = engine.snapshot_job_set(registry.current())
+    from_snapshot, stats = engine.score_resumes(RESUMES, None, top_k=3, job_set=job_set)
+    from_texts, _ = engine.score_resumes(RESUMES, texts, top_k=3, model=model)
+    assert stats['job_count'] == len(texts)
+    for a, b in zip(from_snapshot, from_texts):
+        assert a['ats_score'] == b['ats_score'] and a['missing_keywords'] == b['missing_keywords']
+        assert [j for j, _ in a['top_jobs']] == [j for j, _ in b['top_jobs']]
+
+
+def test_ivf_snapshot_returns_jobs_in_stored_order(tmp_path):
+    engine, jobs, texts, model, _, registry = build(tmp_path, ivf_min_jobs=1)
+    snapshot = registry.current()
+    assert snapshot.ivf is not None and registry.stats()['ivf']
+    job_set = engine.snapshot_job_set(snapshot)
+    results, stats = engine.score_resumes(RESUMES[:1], None, top_k=1, job_set=job_set)
+    assert stats['ann']
+    exact, _ = engine.score_resumes(RESUMES[:1], texts, top_k=1, model=model)
+    best_stored, best_original = results[0]['top_jobs'][0][0], exact[0]['top_jobs'][0][0]
+    assert snapshot[best_stored]['title'] == jobs[best_original]['title']
+
+
+def test_new_snapshot_is_swapped_in_and_old_one_stays_readable(tmp_path):
+    engine, jobs, texts, model, _, registry = build(tmp_path)
+    old = registry.current()
+    write_snapshot(str(tmp_path / 'snapshots'), jobs[:2], texts[:2], model, version='v2')
+    new = registry.current()
+    assert new.version == 'v2' and len(new) == 2 and registry.swaps == 2
+    assert old[0]['title'] == jobs[0]['title']
+    prune_snapshots(str(tmp_path / 'snapshots'), keep=1)
+    assert sorted(os.listdir(tmp_path / 'snapshots')) == ['CURRENT', 'v2']
+
+
+def test_score_batch_uses_snapshot_without_jobs_file(tmp_path, monkeypatch):
+    _, jobs, _, _, _, registry = build(tmp_path)
+    monkeypatch.setattr(app_module.ats_engine, 'job_snapshots', registry)
+    client = app_module.app.test_client()
+    resp = client.post('/score_batch', data={
+        'resumes': [(io.BytesIO(r.encode()), f'r{i}.txt') for i, r in enumerate(RESUMES)],
+        'top_k': '2',
+    })
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert body['job_source'] == 'snapshot:v1' and body['job_count'] == len(jobs)
+    assert all(len(r['top_jobs']) == 2 and r['top_jobs'][0]['title'] for r in body['results'])
+    assert client.get('/metrics').get_json()['job_snapshot']['version'] == 'v1'
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming jobs-file ingestion and chunked scoring
+Run with: python -m pytest test-files/test_job_stream.py
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from job_stream import ATSScoreAccumulator, TopK, chunked, iter_uploaded_jobs  # noqa: E402
+from werkzeug.datastructures import FileStorage  # noqa: E402
+
+JOBS = [
+    {'title': 'Product Intern', 'company': 'Acme', 'location': 'Pune', 'description': 'Roadmaps, "SQL" and\nJira'},
+    {'job_title': 'Data Intern', 'company_name': 'Beta', 'city': 'Delhi', 'summary': 'Python, dashboards é'},
+    {'title': 'Ops Intern', 'company': 'Gamma', 'location': 'Remote', 'description': 'Supply chain [ops]'},
+]
+
+
+def upload(data, filename):
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+def parsed(data, filename):
+    # Tiny blocks so values and multi-byte characters straddle block boundaries
+    return list(iter_uploaded_jobs(upload(data, filename), block_size=7))
+
+
+def test_json_array_ndjson_and_single_object_agree():
+    expected = parsed(json.dumps(JOBS).encode(), 'jobs.json')
+    assert [j['title'] for j in expected] == ['Product Intern', 'Data Intern', 'Ops Intern']
+    assert expected[1]['description'] == 'Python, dashboards é'
+    ndjson = '\n'.join(json.dumps(j) for j in JOBS).encode()
+    assert parsed(ndjson, 'jobs.ndjson') == expected
+    assert parsed(b'\xef\xbb\xbf' + json.dumps(JOBS, indent=2).encode(), 'export') == expected
+    assert parsed(json.dumps(JOBS[0]).encode(), 'one.json') == expected[:1]
+
+
+def test_csv_with_quoted_newlines():
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=['title', 'company', 'location', 'description'])
+    writer.writeheader()
+    writer.writerow(JOBS[0])
+    writer.writerow(JOBS[2])
+    jobs = parsed(buf.getvalue().encode(), 'jobs.csv')
+    assert [j['description'] for j in jobs] == [JOBS[0]['description'], JOBS[2]['description']]
+
+
+def test_truncated_json_keeps_complete_jobs():
+    data = json.dumps(JOBS).encode()[:-20]
+    assert [j['title'] for j in parsed(data, 'jobs.json')] == ['Product Intern', 'Data Intern']
+
+
+def test_top_k_matches_stable_sort():
+    keys = [(3, 1), (5, 0), (3, 1), (9, 9), (5, 0), (1, 1)]
+    top = TopK(4)
+    for i, key in enumerate(keys):
+        top.push(key, i)
+    expected = sorted(range(len(keys)), key=lambda i: keys[i], reverse=True)[:4]
+    assert top.items() == expected
+
+
+def test_chunked_ats_score_matches_full_batch():
+    engine = app_module.ResumeATSEngine()
+    resume = engine.clean_text("Product management intern with market research, SQL, Python and Agile")
+    texts = [engine.clean_text(f"{j['title']} {j['description']}") for j in engine.get_dummy_jobs()]
+    keywords = engine.extract_keywords(resume)
+    accumulator = ATSScoreAccumulator(engine, resume, resume_keywords=keywords)
+    for chunk in chunked(texts, 3):
+        accumulator.add(chunk)
+    assert accumulator.result() == engine.calculate_ats_score(resume, texts, resume_keywords=keywords)
+
+
+def test_recommend_from_jobs_streams_in_chunks(monkeypatch):
+    monkeypatch.setenv('JOBS_FILE_CHUNK_SIZE', '2')
+    client = app_module.app.test_client()
+    resp = client.post('/recommend_from_jobs', data={
+        'resume': (io.BytesIO(b'Product intern, SQL, Jira, roadmaps, Python dashboards'), 'resume.txt'),
+        'jobs_file': (io.BytesIO(json.dumps(JOBS * 5).encode()), 'jobs.json'),
+        'top_k': '4',
+    })
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert body['parsed_count'] == 15 and body['top_k'] == 4
+    assert len(body['recommendations']) == 4
+    scores = [int(r['match_percent'].rstrip('%')) for r in body['recommendations']]
+    assert scores == sorted(scores, reverse=True)
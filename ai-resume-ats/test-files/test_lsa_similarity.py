@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the LSA similarity backend
+Run with: python -m pytest test-files/test_lsa_similarity.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from tfidf_model import TfidfModelRegistry, fit_corpus_model, save_model  # noqa: E402
+
+RESUME = "product management intern with market research sql python agile and scrum"
+
+
+def lsa_engine(tmp_path, components=4):
+    engine = app_module.ResumeATSEngine()
+    recs = [app_module.format_provider_job(job) for job in engine.get_dummy_jobs()]
+    texts = [f['text'] for f in engine.job_features(recs)]
+    save_model(fit_corpus_model(texts, ngram_range=(1, 1), version='lsa1', lsa_components=components), str(tmp_path))
+    engine.tfidf_models = TfidfModelRegistry(str(tmp_path))
+    return engine, recs, texts
+
+
+def test_lsa_projection_round_trips_memory_mapped(tmp_path):
+    engine, _, texts = lsa_engine(tmp_path)
+    model = engine.tfidf_models.current()
+    assert model.has_lsa and isinstance(model.lsa_components, np.memmap)
+    assert model.lsa_components.shape[0] == 4 and engine.tfidf_models.stats()['lsa_components'] == 4
+    vectors = model.embed(texts)
+    assert vectors.dtype == np.float32 and vectors.shape == (len(texts), 4)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+
+def test_lsa_matches_terms_that_only_co_occur():
+    corpus = ["python django backend"] * 5 + ["python flask backend"] * 5 + ["excel seo marketing"] * 5
+    model = fit_corpus_model(corpus, ngram_range=(1, 1), lsa_components=2)
+    django, flask, seo = model.embed(["django", "flask", "seo"])
+    # No shared terms, so TF-IDF cosine is 0; in LSA space they are neighbours
+    assert (model.transform(["django"]) @ model.transform(["flask"]).T).toarray()[0][0] == 0
+    assert django @ flask > 0.9 and django @ flask > django @ seo
+
+
+def test_similarity_falls_back_to_tfidf_without_projection(tmp_path):
+    engine = app_module.ResumeATSEngine()
+    assert engine.resolve_similarity('lsa') == 'tfidf'
+    engine, _, _ = lsa_engine(tmp_path)
+    assert engine.resolve_similarity('lsa') == 'lsa'
+    assert engine.resolve_similarity('unknown') == 'tfidf'
+
+
+def test_stored_embeddings_score_like_the_text_path(tmp_path):
+    engine, recs, texts = lsa_engine(tmp_path)
+    features = engine.job_features(recs)
+    assert all(f['embedding'] is not None for f in features)
+    ats, missing, matches = engine.score_job_features(RESUME, features, similarity='lsa')
+    assert (ats, missing) == engine.calculate_ats_score(RESUME, texts, similarity='lsa')
+    assert (ats, missing) != engine.calculate_ats_score(RESUME, texts)
+    matcher = engine.job_matcher(RESUME, texts, similarity='lsa')
+    assert np.allclose(matches, matcher(texts), atol=1e-4)
+
+
+def test_batch_scoring_with_lsa(tmp_path):
+    engine, _, texts = lsa_engine(tmp_path)
+    results, stats = engine.score_resumes([RESUME], texts, top_k=3, similarity='lsa')
+    assert stats['similarity'] == 'lsa'
+    assert results[0]['ats_score'] == engine.calculate_ats_score(RESUME, texts, similarity='lsa')[0]
+    matcher = engine.job_matcher(RESUME, texts, similarity='lsa')
+    expected = sorted(matcher(texts), reverse=True)[:3]
+    assert np.allclose([m for _, m in results[0]['top_jobs']], expected, atol=1e-3)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for profile-driven recommendations and stored resume representations
+Run with: python -m pytest test-files/test_profile_recommend.py
+"""
+
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from profile_store import ProfileStore  # noqa: E402
+from tfidf_model import fit_corpus_model  # noqa: E402
+
+PROFILE = {
+    'name': 'Asha',
+    'email': 'asha@example.com',
+    'skills': ['Python', 'SQL', 'Market Research'],
+    'education': 'B.Tech Computer Science',
+    'experience': [{'role': 'Product Intern', 'summary': 'agile scrum roadmap'}],
+    'location': 'Bangalore',
+}
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setattr(app_module, 'ats_engine', engine)
+    monkeypatch.setattr(app_module, 'profile_store', ProfileStore(str(tmp_path / 'profiles.db')))
+    jobs = [app_module.format_provider_job(job) for job in engine.get_dummy_jobs()]
+    texts = [engine.clean_text(f"{j['title']} {j['company']} {j['location']} {j['description']}") for j in jobs]
+    model = fit_corpus_model(texts + [PROFILE['education'].lower()], ngram_range=(1, 1), version='m1')
+    engine.tfidf_models.current = lambda: model
+    engine.fetch_internships = lambda **kwargs: engine.get_dummy_jobs()
+    return engine
+
+
+def spy_keywords(engine, monkeypatch):
+    """List of the texts sent to keyword extraction from now on"""
+    seen = []
+    extract = engine.extract_keywords_batch
+
+    def batch(texts, backend=None):
+        seen.extend(texts)
+        return extract(texts, backend)
+
+    monkeypatch.setattr(engine, 'extract_keywords_batch', batch)
+    monkeypatch.setattr(engine, 'extract_keywords', lambda text, backend=None: batch([text], backend)[0])
+    return seen
+
+
+def test_only_changed_sections_are_reprocessed(engine, monkeypatch):
+    seen = spy_keywords(engine, monkeypatch)
+    writes = []
+    put = app_module.profile_store.put_representation
+    monkeypatch.setattr(app_module.profile_store, 'put_representation',
+                        lambda *args: writes.append(args) or put(*args))
+    text, keywords, counts = engine.profile_resume('asha', PROFILE)
+    assert len(seen) == 3 and len(writes) == 1 and 'b tech computer science' in text
+    assert (counts != engine.tfidf_models.current().count([text])).nnz == 0
+
+    # Unchanged profile: a lookup, no NLP and no write
+    again = engine.profile_resume('asha', PROFILE)
+    assert again[:2] == (text, keywords) and (again[2] != counts).nnz == 0
+    assert len(seen) == 3 and len(writes) == 1
+
+    changed = dict(PROFILE, skills=['Python', 'Tableau'])
+    new_text, _, new_counts = engine.profile_resume('asha', changed)
+    assert seen[3:] == ['python tableau'] and 'tableau' in new_text and 'market' not in new_text
+    assert (new_counts != engine.tfidf_models.current().count([new_text])).nnz == 0
+    # Removed sections drop out of the scored text
+    text, _, _ = engine.profile_resume('asha', dict(changed, experience=[]))
+    assert 'scrum' not in text and len(seen) == 4
+
+
+def test_stored_counts_score_like_the_text(engine):
+    text, keywords, counts = engine.profile_resume('asha', PROFILE)
+    recs = [app_module.format_provider_job(job) for job in engine.get_dummy_jobs()]
+    features = engine.job_features(recs)
+    direct = engine.score_job_features(text, features, resume_keywords=keywords)
+    stored = engine.score_job_features(text, features, resume_keywords=keywords, resume_counts=counts)
+    assert direct[:2] == stored[:2] and np.allclose(direct[2], stored[2])
+
+
+def test_recommend_by_profile_id_skips_parsing_and_nlp(engine, monkeypatch):
+    client = app_module.app.test_client()
+    assert client.post('/recommend', data={'profile_id': 'nobody@example.com'}).status_code == 404
+    assert client.post('/profile', json=PROFILE).status_code == 200
+    first = client.post('/recommend', data={'profile_id': 'asha@example.com'}).get_json()
+
+    # Refresh: the stored representation and job features are reused as they are
+    fail = lambda *a, **k: (_ for _ in ()).throw(AssertionError('reprocessed'))
+    monkeypatch.setattr(engine, 'extract_keywords_batch', fail)
+    monkeypatch.setattr(engine, 'extract_keywords', fail)
+    monkeypatch.setattr(engine, 'process_resume', fail)
+    body = client.post('/recommend', data={'profile_id': 'asha@example.com'}).get_json()
+    assert body['profile_id'] == 'asha@example.com' and body['recommendations']
+    assert body['ats_score'] == first['ats_score'] and body['recommendations'] == first['recommendations']
+    # The profile's skills drive the job search
+    assert body['search_trace'][0]['query'] == 'Python'
+
+
+def test_upload_is_attached_to_the_profile(engine):
+    client = app_module.app.test_client()
+    client.post('/profile', json=PROFILE)
+    resume = b"data visualization dashboards tableau power bi"
+    first = client.post('/recommend', data={'profile_id': 'asha@example.com',
+                                            'resume': (io.BytesIO(resume), 'cv.txt')}).get_json()
+    assert 'resume' in app_module.profile_store.get_representation('asha@example.com')['sections']
+    again = client.post('/recommend', data={'profile_id': 'asha@example.com'}).get_json()
+    assert again['ats_score'] == first['ats_score']
+    text, _, _ = engine.profile_resume('asha@example.com', app_module.profile_store.get('asha@example.com'))
+    assert text.startswith('data visualization')
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite profile store
+Run with: python -m pytest test-files/test_profile_store.py
+"""
+
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import app as app_module  # noqa: E402
+from profile_store import ProfileStore, read_profile_file  # noqa: E402
+
+PROFILE = {'name': 'Asha', 'email': 'Asha@Example.com', 'skills': ['python', 'sql']}
+
+
+def test_put_get_and_cached_reads(tmp_path):
+    store = ProfileStore(str(tmp_path / 'profiles.db'))
+    assert store.get_by_email('asha@example.com') is None
+    store.put('Asha@Example.com', PROFILE)
+    assert store.get('Asha@Example.com') == PROFILE
+    assert store.get_by_email(' asha@example.com ') == PROFILE
+    hits = store.hits
+    assert store.get_by_email('ASHA@example.com') == PROFILE and store.hits == hits + 1
+    # Returned dicts are copies, not the cached entry
+    store.get('Asha@Example.com')['name'] = 'changed'
+    assert store.get('Asha@Example.com')['name'] == 'Asha'
+    assert store.delete('Asha@Example.com') and store.get('Asha@Example.com') is None and len(store) == 0
+
+
+def test_write_from_another_worker_invalidates_cache(tmp_path):
+    path = str(tmp_path / 'profiles.db')
+    worker_a, worker_b = ProfileStore(path), ProfileStore(path)
+    worker_a.put('a@x.com', {'email': 'a@x.com', 'name': 'A'})
+    assert worker_b.get('a@x.com')['name'] == 'A'
+    assert worker_b.get('b@x.com') is None  # negative result is cached too
+    worker_a.put('a@x.com', {'email': 'a@x.com', 'name': 'A2'})
+    worker_a.put('b@x.com', {'email': 'b@x.com', 'name': 'B'})
+    assert worker_b.get('a@x.com')['name'] == 'A2'
+    assert worker_b.get('b@x.com')['name'] == 'B'
+
+    # A thread of the same worker writing through its own connection
+    thread = threading.Thread(target=lambda: worker_b.put('a@x.com', {'email': 'a@x.com', 'name': 'A3'}))
+    thread.start()
+    thread.join()
+    assert worker_b.get('a@x.com')['name'] == 'A3' and worker_a.get('a@x.com')['name'] == 'A3'
+
+
+def test_export_import_round_trip(tmp_path):
+    source = ProfileStore(str(tmp_path / 'a.db'))
+    source.import_profiles([(f'u{i}@x.com', {'email': f'u{i}@x.com', 'name': f'U{i}'}) for i in range(50)])
+    export = tmp_path / 'profiles.ndjson'
+    export.write_text(''.join(json.dumps({'profile_id': pid, 'profile': p}) + '\n'
+                              for pid, p in source.export_profiles()))
+    target = ProfileStore(str(tmp_path / 'b.db'))
+    assert target.import_profiles(read_profile_file(str(export))) == 50
+    assert list(target.export_profiles()) == list(source.export_profiles())
+
+    # A plain JSON list of profiles is keyed by email
+    listing = tmp_path / 'list.json'
+    listing.write_text(json.dumps([{'email': 'new@x.com', 'name': 'New'}]))
+    target.import_profiles(read_profile_file(str(listing)))
+    assert target.get_by_email('new@x.com')['name'] == 'New' and len(target) == 51
+
+
+def test_profile_routes_use_the_store(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path / 'profiles.db'))
+    monkeypatch.setattr(app_module, 'profile_store', store)
+    client = app_module.app.test_client()
+    assert client.post('/profile', json={'name': 'Asha'}).status_code == 400
+    resp = client.post('/profile', json={'name': 'Asha', 'email': 'asha@example.com', 'skills': ['python']})
+    assert resp.status_code == 200 and resp.get_json()['profile_id'] == 'asha@example.com'
+    # Visible to another worker opening the same database
+    other = ProfileStore(store.path)
+    assert other.get('asha@example.com')['skills'] == ['python']
+    body = client.get('/profile?email=asha@example.com').get_json()
+    assert body['name'] == 'Asha' and body['phone'] == ''
+    assert client.get('/profile?email=nobody@example.com').status_code == 404
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Tests for provider circuit breakers, pooled sessions, the background retry scheduler, request coalescing
+and the parallel provider fetch
+Run with: python -m pytest test-files/test_providers.py
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import requests  # noqa: E402
+
+from providers import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ProviderClient, ProviderUnavailable,  # noqa: E402
+                       RetryScheduler, Singleflight)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        breaker.allow_request()
+        breaker.record_failure('boom')
+    assert breaker.state == OPEN
+    try:
+        breaker.allow_request()
+        assert False, 'expected ProviderUnavailable'
+    except ProviderUnavailable:
+        pass
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_breaker_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+    breaker.allow_request()
+    breaker.record_failure('boom')
+    breaker.allow_request()  # reset timeout elapsed -> probe allowed
+    assert breaker.state == HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_client_opens_on_429_with_retry_after(monkeypatch):
+    client = ProviderClient('rapidapi', CircuitBreaker('rapidapi', failure_threshold=5, reset_timeout=1))
+    monkeypatch.setattr(client.session, 'get', lambda url, **kw: FakeResponse(429, {'Retry-After': '120'}))
+    assert client.get('http://example').status_code == 429
+    stats = client.stats()
+    assert stats['state'] == OPEN and stats['throttled'] == 1
+    assert stats['open_for_seconds'] > 100
+
+
+def test_retry_scheduler_runs_in_background_and_dedupes():
+    scheduler = RetryScheduler()
+    ran = threading.Event()
+    start = time.monotonic()
+    assert scheduler.schedule(0.05, ran.set, key='q')
+    assert not scheduler.schedule(0.05, ran.set, key='q')
+    # schedule() returned without waiting for the delay
+    assert time.monotonic() - start < 0.05
+    assert ran.wait(2)
+    time.sleep(0.05)
+    assert scheduler.stats()['executed'] == 1
+    assert scheduler.stats()['dropped'] == 1
+
+
+class JobsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"jobs": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_session_reuses_connections_across_threads():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JobsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = ProviderClient('local', pool_size=4)
+        url = f"http://127.0.0.1:{server.server_address[1]}/active-jb-7d"
+
+        def worker():
+            for _ in range(10):
+                assert client.get(url).status_code == 200
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        pool = client.stats()['pool']
+        assert pool['requests'] == 40
+        assert pool['connections_opened'] <= 4
+        assert pool['reused'] >= 36
+        client.close()
+    finally:
+        server.shutdown()
+
+
+def slow_get(calls, delay=0.2, status=200):
+    def get(url, **kwargs):
+        calls.append(kwargs.get('params'))
+        time.sleep(delay)
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = b'{"jobs": [{"title": "Intern"}]}'
+        return response
+    return get
+
+
+def run_concurrently(fns):
+    results = [None] * len(fns)
+
+    def run(i):
+        results[i] = fns[i]()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(fns))]
+    for t in threads:
+        t.start()
+        time.sleep(0.01)
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_identical_concurrent_calls_share_one_request(monkeypatch):
+    client = ProviderClient('rapidapi', singleflight=Singleflight())
+    calls = []
+    monkeypatch.setattr(client.session, 'get', slow_get(calls))
+    same = lambda: client.get('http://example/active-jb-7d', params={'keyword': 'product', 'location': 'india'})
+    other = lambda: client.get('http://example/active-jb-7d', params={'keyword': 'data', 'location': 'india'})
+    results = run_concurrently([same] * 6 + [other])
+    assert len(calls) == 2
+    assert all(r.json() == {'jobs': [{'title': 'Intern'}]} for r in results)
+    stats = client.stats()
+    assert stats['singleflight']['leaders'] == 2 and stats['singleflight']['coalesced'] == 5
+    assert stats['calls'] == 2 and stats['singleflight']['in_flight'] == 0
+
+
+def test_leader_error_reaches_waiters_and_is_not_kept(monkeypatch):
+    flight = Singleflight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('boom')
+
+    def call(fn):
+        try:
+            return flight.do('key', fn)
+        except ValueError as e:
+            return str(e)
+
+    results = run_concurrently([lambda: call(fail), lambda: started.wait() and call(fail)])
+    assert results == ['boom', 'boom'] and flight.stats()['coalesced'] == 1
+    assert flight.do('key', lambda: 'ok') == 'ok'
+
+
+def test_workers_share_responses_through_the_flight_directory(tmp_path, monkeypatch):
+    # Separate clients and lock file descriptors behave like separate gunicorn workers
+    workers = [ProviderClient('rapidapi', singleflight=Singleflight(shared_dir=str(tmp_path))) for _ in range(2)]
+    calls = []
+    for client in workers:
+        monkeypatch.setattr(client.session, 'get', slow_get(calls, status=429))
+    fetch = lambda client: lambda: client.get('http://example/active-jb-7d', params={'keyword': 'product'})
+    first, second = run_concurrently([fetch(workers[0]), fetch(workers[1])])
+    assert len(calls) == 1
+    assert first.status_code == second.status_code == 429 and second.json() == first.json()
+    follower = workers[1].stats()
+    assert follower['singleflight']['shared_waits'] == 1 and follower['singleflight']['shared_hits'] == 1
+    # The shared 429 opens the follower's breaker as well
+    assert follower['state'] == OPEN and workers[0].stats()['state'] == OPEN
+
+
+def job(title, company='Acme'):
+    return {'title': title, 'company': {'display_name': company}, 'location': {'display_name': 'Pune'},
+            'description': title, 'redirect_url': ''}
+
+
+def parallel_engine(monkeypatch, adzuna, rapidapi, deadline=1.0, enough=15):
+    import app as app_module
+
+    engine = app_module.ResumeATSEngine()
+    monkeypatch.setenv('ADZUNA_APP_ID', 'id')
+    monkeypatch.setenv('ADZUNA_APP_KEY', 'key')
+    engine.rapidapi_key = 'key'
+    engine.provider_deadline = deadline
+    engine.provider_enough_jobs = enough
+
+    def provider(delay, jobs):
+        def fetch(*args):
+            time.sleep(delay)
+            if isinstance(jobs, Exception):
+                raise jobs
+            return jobs
+        return fetch
+
+    monkeypatch.setattr(engine, '_fetch_adzuna', provider(*adzuna))
+    monkeypatch.setattr(engine, '_fetch_rapidapi', provider(*rapidapi))
+    return engine
+
+
+def test_providers_run_in_parallel_and_merge_without_duplicates(monkeypatch):
+    engine = parallel_engine(monkeypatch, (0.3, [job('Data Intern'), job('PM Intern')]),
+                             (0.3, [job('pm intern '), job('SQL Intern')]))
+    timings = []
+    start = time.perf_counter()
+    jobs = engine._fetch_internships_live('pune', 'data', 'week', timings=timings)
+    assert time.perf_counter() - start < 0.5
+    assert [j['title'] for j in jobs] == ['Data Intern', 'PM Intern', 'SQL Intern']
+    providers = timings[0]['providers']
+    assert providers['adzuna']['status'] == providers['rapidapi']['status'] == 'ok'
+    assert providers['rapidapi']['job_count'] == 2 and timings[0]['job_count'] == 3
+
+
+def test_deadline_returns_what_arrived_in_time(monkeypatch):
+    engine = parallel_engine(monkeypatch, (1.0, [job('Slow Intern')]), (0.05, [job('Fast Intern')]), deadline=0.2)
+    timings = []
+    start = time.perf_counter()
+    jobs = engine._fetch_internships_live('pune', 'data', 'week', timings=timings)
+    assert time.perf_counter() - start < 0.5
+    assert [j['title'] for j in jobs] == ['Fast Intern']
+    assert timings[0]['providers']['adzuna']['status'] == 'timeout'
+
+
+def test_enough_jobs_return_early_and_errors_are_reported(monkeypatch):
+    engine = parallel_engine(monkeypatch, (0.01, [job(f'Intern {i}') for i in range(3)]), (1.0, []), enough=3)
+    timings = []
+    assert len(engine._fetch_internships_live('pune', 'data', 'week', timings=timings)) == 3
+    assert timings[0]['seconds'] < 0.5 and timings[0]['providers']['rapidapi']['status'] == 'not_needed'
+
+    engine = parallel_engine(monkeypatch, (0.01, ProviderUnavailable('adzuna')), (0.01, [job('PM Intern')]))
+    timings = []
+    assert [j['title'] for j in engine._fetch_internships_live('pune', 'pm', 'week', timings=timings)] == ['PM Intern']
+    assert timings[0]['providers']['adzuna']['status'] == 'error'
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for composite-key top-K ranking
+Run with: python -m pytest test-files/test_ranking.py
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from ranking import TokenMatcher, count_hits, top_k  # noqa: E402
+
+
+def reference(columns, k, mask):
+    rows = [i for i in range(len(columns[0])) if mask[i]]
+    # Stable descending sort, like the chained list.sort(reverse=True) calls it replaces
+    rows.sort(key=lambda i: tuple(c[i] for c in columns), reverse=True)
+    return rows[:k]
+
+
+def test_top_k_matches_stable_sort():
+    rng = random.Random(7)
+    for _ in range(50):
+        n = rng.randint(1, 60)
+        columns = [[rng.randint(0, 3) for _ in range(n)], [rng.randint(0, 100) for _ in range(n)],
+                   [rng.randint(-5, 150) for _ in range(n)]]
+        mask = [rng.random() > 0.2 for _ in range(n)]
+        k = rng.randint(1, n + 3)
+        assert top_k(columns, k, mask=mask).tolist() == reference(columns, k, mask)
+
+
+def test_top_k_falls_back_when_key_overflows():
+    columns = [[0, 2 ** 40, 5], [2 ** 40, 0, 2 ** 40]]
+    assert top_k(columns, 3).tolist() == reference(columns, 3, [True] * 3)
+
+
+def test_count_hits():
+    hits = count_hits(['pune product intern', 'remote'], ['pune', 'intern', '', 'delhi'])
+    assert hits.tolist() == [2, 0]
+    assert np.asarray(top_k([hits], 1)).tolist() == [0]
+
+
+def test_token_matcher_counts_like_substring_checks():
+    rng = random.Random(11)
+    alphabet = 'abc '
+    for _ in range(200):
+        groups = {f'g{g}': (rng.randint(0, 1), [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+                                               for _ in range(rng.randint(0, 5))])
+                  for g in range(3)}
+        rows = [tuple(''.join(rng.choice(alphabet + '\x00') for _ in range(rng.randint(0, 20))) for _ in range(2))
+                for _ in range(rng.randint(0, 6))]
+        counts = TokenMatcher(groups).count(rows)
+        for name, (field, tokens) in groups.items():
+            expected = [sum(1 for t in tokens if t and t in row[field]) for row in rows]
+            assert counts[name].tolist() == expected, (groups, rows)
+
+
+def test_token_matcher_nested_and_repeated_tokens():
+    matcher = TokenMatcher({
+        'domain': (1, ['data', 'data science', 'science', 'data']),
+        'location': (0, ['pune', 'une']),
+    })
+    counts = matcher.count([('Pune, India'.lower(), 'data science intern'), ('remote', 'science')])
+    assert counts['domain'].tolist() == [4, 1]
+    assert counts['location'].tolist() == [2, 0]
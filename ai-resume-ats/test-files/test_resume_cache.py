@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed resume cache
+Run with: python -m pytest test-files/test_resume_cache.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import ResumeATSEngine  # noqa: E402
+from resume_cache import ResumeCache, resume_cache_key  # noqa: E402
+
+RESUME_BYTES = b"Jane Doe\nProduct Manager\nSkills: SQL, Python, Google Analytics, Agile"
+
+
+def test_repeat_upload_skips_extraction(monkeypatch):
+    engine = ResumeATSEngine()
+    first = engine.process_resume(RESUME_BYTES, 'resume.txt', 'gazetteer')
+    monkeypatch.setattr(engine, 'extract_resume_text', lambda *a: (_ for _ in ()).throw(AssertionError('re-parsed')))
+    monkeypatch.setattr(engine, 'extract_keywords', lambda *a: (_ for _ in ()).throw(AssertionError('re-extracted')))
+    again = engine.process_resume(RESUME_BYTES, 'resume.txt', 'gazetteer')
+    assert again == first
+    assert 'google analytics' in again['keywords']
+    assert engine.resume_cache.stats()['hits'] == 1
+
+
+def test_key_depends_on_bytes_and_kind():
+    assert resume_cache_key(b'abc', 'a.pdf') == resume_cache_key(b'abc', 'B.PDF')
+    assert resume_cache_key(b'abc', 'a.pdf') != resume_cache_key(b'abc', 'a.docx')
+    assert resume_cache_key(b'abc', 'a.pdf') != resume_cache_key(b'abd', 'a.pdf')
+
+
+def test_memory_tier_is_size_bounded():
+    cache = ResumeCache(max_bytes=300)
+    for i in range(5):
+        cache.put(f"k{i}", {'text': 'x' * 100, 'cleaned': '', 'keywords': {}})
+    stats = cache.stats()
+    assert stats['bytes'] <= 300 and stats['evictions'] >= 3
+    assert cache.get('k4') is not None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    ResumeCache(disk_dir=str(tmp_path)).put('k', {'text': 't', 'cleaned': 't', 'keywords': {}})
+    fresh = ResumeCache(disk_dir=str(tmp_path))
+    assert fresh.get('k')['text'] == 't'
+    assert fresh.stats()['disk_hits'] == 1
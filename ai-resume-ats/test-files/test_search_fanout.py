@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for sequential / concurrent execution of the /recommend search_trace
+Run with: python -m pytest test-files/test_search_fanout.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from search_fanout import run_concurrent, run_sequential  # noqa: E402
+
+# query -> (delay seconds, jobs)
+PROVIDER = {
+    'product sql': (0.2, []),
+    'pm sql': (0.05, [{'title': 'PM Intern'}]),
+    'sql': (0.01, [{'title': 'SQL Intern'}]),
+    'intern': (1.0, [{'title': 'Intern'}]),
+}
+
+
+def fake_fetch(query):
+    delay, jobs = PROVIDER[query]
+    time.sleep(delay)
+    return jobs
+
+
+def test_sequential_stops_at_first_success():
+    jobs, effective, trace = run_sequential(['product sql', 'pm sql', 'sql', 'intern'], fake_fetch)
+    assert effective == 'pm sql'
+    assert jobs == [{'title': 'PM Intern'}]
+    assert [t['outcome'] for t in trace] == ['empty', 'success', 'skipped', 'skipped']
+
+
+def test_concurrent_keeps_highest_priority_success():
+    start = time.perf_counter()
+    jobs, effective, trace = run_concurrent(['product sql', 'pm sql', 'sql', 'intern', 'Intern', ''], fake_fetch, max_concurrency=4)
+    elapsed = time.perf_counter() - start
+    # 'sql' finishes first but 'pm sql' has higher priority
+    assert effective == 'pm sql'
+    assert jobs == [{'title': 'PM Intern'}]
+    outcomes = {t['query']: t['outcome'] for t in trace}
+    assert outcomes == {'product sql': 'empty', 'pm sql': 'success', 'sql': 'discarded', 'intern': 'discarded'}
+    assert all(t['latency_ms'] is not None for t in trace if t['outcome'] in ('empty', 'success'))
+    # Does not wait for the slow low-priority query
+    assert elapsed < 0.8
+
+
+def test_concurrent_all_empty():
+    jobs, effective, trace = run_concurrent(['product sql'], fake_fetch)
+    assert jobs == [] and effective == 'product sql'
+    assert trace[0]['outcome'] == 'empty'
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for the Aho-Corasick skill gazetteer keyword backend
+Run with: python -m pytest test-files/test_skill_gazetteer.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from skill_gazetteer import AhoCorasick, build_gazetteer, exclusion_terms, mine_corpus_phrases  # noqa: E402
+
+
+def test_automaton_reports_overlapping_matches():
+    automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+    assert sorted(p for _, p, _ in automaton.find_all('ushers')) == ['he', 'hers', 'she']
+
+
+def test_gazetteer_matches_multiword_skills_on_token_boundaries():
+    gazetteer = build_gazetteer({'product': ['product', 'product management', 'pm']})
+    skills = set(gazetteer.match('Lean Six Sigma, Google Analytics and product management in Bangalore. Building tools'))
+    assert {'lean six sigma', 'six sigma', 'google analytics', 'product management'} <= skills
+    # No city names, and 'ui' is not matched inside 'building'
+    assert 'bangalore' not in skills and 'ui' not in skills
+
+
+def test_gazetteer_matches_cleaned_punctuation():
+    gazetteer = build_gazetteer()
+    assert set(gazetteer.match('node js and a b testing')) == {'node.js', 'a/b testing'}
+
+
+def test_corpus_mining_skips_generic_terms():
+    texts = ['Growth hacking internship with partner analytics', 'Growth hacking and partner analytics intern']
+    phrases = mine_corpus_phrases(texts, min_docs=2)
+    assert 'growth hacking' in phrases and 'partner analytics' in phrases
+    assert not any('intern' in p.split() for p in phrases)
+
+
+def test_corpus_mining_skips_company_and_location_words():
+    texts = ['Product analytics Bangalore Karnataka', 'Product analytics role Bangalore Karnataka']
+    assert 'bangalore karnataka' in mine_corpus_phrases(texts, min_docs=2)
+    # Seed skill words in a company name ('Analytics') are not excluded
+    excluded = exclusion_terms(['Bangalore, Karnataka', 'Acme Analytics'])
+    assert excluded == {'bangalore', 'karnataka', 'acme'}
+    phrases = mine_corpus_phrases(texts, min_docs=2, exclude_terms=excluded)
+    assert phrases == ['product analytics']
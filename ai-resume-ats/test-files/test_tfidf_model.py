@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the corpus TF-IDF model build / load / hot-swap cycle
+Run with: python -m pytest test-files/test_tfidf_model.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from tfidf_model import TfidfModelRegistry, fit_corpus_model, iter_corpus_jobs, job_text, save_model  # noqa: E402
+
+SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'public', 'internships.json')
+
+
+def corpus_texts():
+    return [job_text(job) for job in iter_corpus_jobs(SNAPSHOT)]
+
+
+def test_transform_matches_sklearn_fit(tmp_path):
+    texts = corpus_texts()
+    model = fit_corpus_model(texts, version='v1')
+    save_model(model, str(tmp_path))
+    loaded = TfidfModelRegistry(str(tmp_path)).current()
+    assert loaded.version == 'v1'
+    matrix = loaded.transform(texts[:2])
+    assert matrix.shape == (2, len(model.vocabulary))
+    # Rows are L2-normalized so self-similarity is 1
+    assert abs((matrix[0] @ matrix[0].T).toarray()[0][0] - 1.0) < 1e-9
+
+
+def test_registry_hot_swaps_new_version(tmp_path):
+    texts = corpus_texts()
+    save_model(fit_corpus_model(texts, version='v1'), str(tmp_path))
+    registry = TfidfModelRegistry(str(tmp_path), check_interval=0)
+    assert registry.current().version == 'v1'
+    save_model(fit_corpus_model(texts[:5], version='v2'), str(tmp_path))
+    assert registry.current().version == 'v2'
+
+
+def test_registry_without_model(tmp_path):
+    registry = TfidfModelRegistry(str(tmp_path / 'missing'))
+    assert registry.current() is None
+    assert registry.stats()['loaded'] is False